@@ -0,0 +1,85 @@
+"""Compare finding instances with one glob per extension versus a single ignoring walk,
+and resolving every discovered file versus skipping files in directories no rule can match.
+
+Run with:
+
+    python -m benchmarks.discovery
+"""
+
+import tempfile
+from pathlib import Path
+
+from benchmarks.helpers import timed
+from jsonschema_lint._cli.discovery import discover
+from jsonschema_lint._cli.rule_loader import RuleStack
+
+
+def generate_tree(root: Path) -> None:
+    """Generate a project with a few instances beside large dependency and build directories."""
+    for index in range(50):
+        directory = root / "src" / f"module{index}"
+        directory.mkdir(parents=True)
+        (directory / "config.json").write_text("{}")
+        (directory / "config.yaml").write_text("a: 1")
+    for index in range(2000):
+        directory = root / "node_modules" / f"package{index}"
+        directory.mkdir(parents=True)
+        (directory / "package.json").write_text("{}")
+        (directory / "index.js").write_text("")
+    for index in range(500):
+        directory = root / "dist" / f"chunk{index}"
+        directory.mkdir(parents=True)
+        (directory / "manifest.json").write_text("{}")
+    (root / ".gitignore").write_text("dist/\n")
+
+
+def generate_fixtures(root: Path) -> None:
+    """Generate a project where only one directory of many has a rule."""
+    for index in range(200):
+        directory = root / "fixtures" / f"case{index}"
+        directory.mkdir(parents=True)
+        for number in range(50):
+            (directory / f"{number}.json").write_text("{}")
+    (root / "config").mkdir()
+    (root / "config" / ".jsonschema-lint").write_text("*.json schema.json\n")
+    (root / "config" / "app.json").write_text("{}")
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        generate_tree(root)
+
+        def globs():
+            return [path for suffix in ["json", "yaml", "yml"] for path in root.glob(f"**/*.{suffix}")]
+
+        def walk():
+            return list(discover(root))
+
+        baseline, globbed = timed(globs)
+        single, walked = timed(walk)
+        print(
+            f"three globs {baseline * 1e3:.0f} ms ({len(globbed)} files), "
+            f"single walk {single * 1e3:.0f} ms ({len(walked)} files, {baseline / single:.0f}x faster)"
+        )
+
+    with tempfile.TemporaryDirectory() as directory:
+        root = Path(directory)
+        generate_fixtures(root)
+
+        def resolve(prune: bool):
+            rule_stack = RuleStack()
+            search = rule_stack.may_match_in if prune else None
+            return [path for path in discover(root, search=search) if rule_stack.rule_for(path)]
+
+        baseline, every = timed(resolve, False)
+        pruned, matched = timed(resolve, True)
+        assert matched == every
+        print(
+            f"resolving every file {baseline * 1e3:.0f} ms, "
+            f"skipping unmatched directories {pruned * 1e3:.0f} ms ({baseline / pruned:.0f}x faster)"
+        )
+
+
+if __name__ == "__main__":
+    main()
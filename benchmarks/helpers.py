@@ -0,0 +1,29 @@
+import json
+import time
+from typing import Callable, Tuple
+
+
+def generate_document(size: int) -> str:
+    """Generate a JSON document of approximately the given size in bytes."""
+    record = {
+        "id": 0,
+        "name": "record",
+        "enabled": True,
+        "score": 0.5,
+        "tags": ["alpha", "beta", "gamma"],
+        "owner": {"name": 'Jane "JD" Doe', "email": "jane@example.com", "manager": None},
+    }
+    record_size = len(json.dumps(record, indent=2))
+    records = [dict(record, id=index) for index in range(size // record_size + 1)]
+    return json.dumps(records, indent=2)
+
+
+def timed(func: Callable, *args, repeat: int = 3) -> Tuple[float, object]:
+    """Return the best wall time of several runs, and the result of the last run."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
@@ -0,0 +1,57 @@
+"""Measure language server latency for a one character edit to a large document.
+
+Run with:
+
+    python -m benchmarks.lsp
+"""
+
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from benchmarks.helpers import generate_document, timed
+from jsonschema_lint._cli.lsp import LanguageServer
+from jsonschema_lint._cli.rule_loader import RuleStack
+
+SCHEMA = {"type": "array", "items": {"type": "object", "properties": {"score": {"type": "number"}}}}
+
+
+def main():
+    document = generate_document(1_000_000)
+    with tempfile.TemporaryDirectory() as directory:
+        (Path(directory) / ".jsonschema-lint").write_text("*.json schema.json\n")
+        (Path(directory) / "schema.json").write_text(json.dumps(SCHEMA))
+        uri = (Path(directory) / "instance.json").as_uri()
+        server = LanguageServer(RuleStack(), io.BytesIO())
+        server.handle({"method": "textDocument/didOpen", "params": {"textDocument": {"uri": uri, "text": document}}})
+        server.publish()
+
+        edits = iter(range(10**6))
+
+        def edit():
+            # Replace the score of the first record
+            start, end = {"line": 5, "character": 13}, {"line": 5, "character": 16}
+            change = {"range": {"start": start, "end": end}, "text": f"{next(edits) % 10:.1f}"}
+            server.handle(
+                {
+                    "method": "textDocument/didChange",
+                    "params": {"textDocument": {"uri": uri}, "contentChanges": [change]},
+                }
+            )
+
+        def edit_and_lint():
+            edit()
+            server.publish()
+
+        apply_time, _ = timed(edit, repeat=20)
+        lint_time, _ = timed(edit_and_lint, repeat=5)
+    print(
+        f"{len(document) / 1e6:.1f}MB document: "
+        f"applying an edit {apply_time * 1000:.2f}ms, "
+        f"applying an edit and publishing diagnostics {lint_time * 1000:.0f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Compare peak memory of linting a large JSON file read as text versus memory-mapped.
+
+Each case runs in a fresh process, so peak RSS is not shared between them.
+
+Run with:
+
+    python -m benchmarks.mmap_input
+"""
+
+import resource
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.helpers import generate_document
+
+SCHEMA = {"type": "array", "items": {"type": "object", "required": ["id", "name"]}}
+
+
+def child(how: str, path: Path) -> None:
+    from jsonschema_lint._cli.main import open_document
+    from jsonschema_lint.linter import lint
+
+    if how == "text":
+        errors = lint(schema=SCHEMA, document=path.read_text(), mode="json")
+    else:
+        with open_document(path, mode="json") as document:
+            errors = lint(schema=SCHEMA, document=document, mode="json")
+    assert not errors
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "large.json"
+        path.write_text(generate_document(16_000_000))
+        size = path.stat().st_size
+        results = {}
+        for how in ("text", "mmap"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.mmap_input", how, str(path)],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+            results[how] = int(output.stdout) * 1024
+        print(
+            f"{size / 1e6:.0f} MB: read as text {results['text'] / 1e6:.0f} MB peak RSS, "
+            f"memory-mapped {results['mmap'] / 1e6:.0f} MB peak RSS "
+            f"({1 - results['mmap'] / results['text']:.0%} less)"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3:
+        child(sys.argv[1], Path(sys.argv[2]))
+    else:
+        main()
@@ -0,0 +1,32 @@
+"""Compare linting an NDJSON stream serially versus across a pool of processes.
+
+Run with:
+
+    python -m benchmarks.ndjson
+"""
+
+import json
+import os
+
+from benchmarks.helpers import generate_document, timed
+from jsonschema_lint.linter import lint
+
+SCHEMA = {"type": "object", "required": ["id", "name"], "properties": {"tags": {"items": {"type": "string"}}}}
+
+
+def main():
+    records = json.loads(generate_document(4_000_000))
+    document = "".join(json.dumps(record) + "\n" for record in records)
+    jobs = os.cpu_count() or 1
+
+    serial, expected = timed(lint, SCHEMA, document, "ndjson", repeat=1)
+    parallel, result = timed(lambda: lint(SCHEMA, document, "ndjson", jobs=jobs), repeat=1)
+    assert result == expected
+    print(
+        f"{len(records)} records ({len(document) / 1e6:.0f} MB): serial {serial:.1f} s, "
+        f"{jobs} jobs {parallel:.1f} s ({serial / parallel:.1f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Compare peak memory of parsing from a token stream versus a materialized token list.
+
+Run with:
+
+    python -m benchmarks.parser_memory
+"""
+
+import gc
+import tracemalloc
+from typing import Callable
+
+from benchmarks.helpers import generate_document
+from jsonschema_lint.json_ast.location import LineIndex
+from jsonschema_lint.json_ast.parser import _parse_tokens
+from jsonschema_lint.json_ast.tokenizer import tokenize, tokenize_iter
+
+
+def peak_memory(func: Callable) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+
+def main():
+    for size in (1_000_000, 4_000_000):
+        document = generate_document(size)
+        lines = LineIndex(document)
+        materialized = peak_memory(lambda: _parse_tokens(document, tokenize(document, lines), lines))
+        streamed = peak_memory(lambda: _parse_tokens(document, tokenize_iter(document, lines), lines))
+        print(
+            f"{len(document) / 1e6:.1f} MB: "
+            f"token list {materialized / 1e6:.1f} MB peak, "
+            f"token stream {streamed / 1e6:.1f} MB peak "
+            f"({1 - streamed / materialized:.0%} less)"
+        )
+
+
+if __name__ == "__main__":
+    main()
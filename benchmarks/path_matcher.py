@@ -0,0 +1,47 @@
+"""Compare matching paths against a catalog-sized set of globs one at a time versus with PathMatcher.
+
+Run with:
+
+    python -m benchmarks.path_matcher
+"""
+
+import random
+from pathlib import Path
+from typing import List
+
+from benchmarks.helpers import timed
+from jsonschema_lint.utils import PathMatcher, path_match
+
+
+def generate_globs(count: int) -> List[str]:
+    """Generate globs in the shapes used by the Schema Store catalog."""
+    shapes = ["{name}.json", "*.{name}.json", ".{name}rc", "**/.{name}/*.yml", "{name}/**/*.yaml", "/{name}.toml"]
+    return [random.choice(shapes).format(name=f"tool{index}") for index in range(count)]
+
+
+def main():
+    random.seed(0)
+    globs = generate_globs(1500)
+    paths = [Path(f"/home/user/project/src/module{index}/file{index}.json") for index in range(200)]
+    paths += [Path("/home/user/project/tool750.json"), Path("/home/user/project/.tool1400rc")]
+
+    def one_at_a_time():
+        return [next((i for i, glob in enumerate(globs) if path_match(path, glob)), None) for path in paths]
+
+    def matcher():
+        path_matcher = PathMatcher(globs)
+        return [path_matcher.match(path) for path in paths]
+
+    baseline, expected = timed(one_at_a_time)
+    indexed, result = timed(matcher)
+    assert result == expected
+    print(
+        f"{len(globs)} globs, {len(paths)} paths: "
+        f"one at a time {baseline / len(paths) * 1e6:.0f} us/path, "
+        f"PathMatcher {indexed / len(paths) * 1e6:.1f} us/path "
+        f"({baseline / indexed:.0f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Compare loading remote schemas one at a time versus prefetching them concurrently.
+
+A local server stands in for a remote host, delaying each response.
+
+Run with:
+
+    python -m benchmarks.prefetch
+"""
+
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from jsonschema_lint._cli import schema_loader
+from jsonschema_lint._cli.http_cache import HTTPCache
+from jsonschema_lint._cli.prefetch import prefetch
+
+DELAY = 0.1
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Serve a schema for any path, which references a shared definitions document."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(DELAY)
+        schema = {"definitions": {}} if self.path == "/common.json" else {"$ref": "common.json#/definitions"}
+        content = json.dumps(schema).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+def timed_load(uris, concurrent: bool) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        schema_loader.configure(HTTPCache(directory=Path(directory)))
+        start = time.perf_counter()
+        if concurrent:
+            prefetch(uris)
+        for uri in uris:
+            schema_loader.load_schema(uri)
+            schema_loader.load_schema(uri.rsplit("/", 1)[0] + "/common.json")
+        return time.perf_counter() - start
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    uris = [f"http://127.0.0.1:{server.server_address[1]}/schema{index}.json" for index in range(8)]
+    try:
+        serial = timed_load(uris, concurrent=False)
+        concurrent = timed_load(uris, concurrent=True)
+    finally:
+        server.shutdown()
+        schema_loader.configure(None)
+    print(
+        f"{len(uris)} schemas and a shared $ref, {DELAY * 1000:.0f}ms per request: "
+        f"one at a time {serial:.2f}s, prefetched {concurrent:.2f}s ({serial / concurrent:.1f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Compare tokenizer throughput against the original alternation-regex tokenizer.
+
+Run with:
+
+    python -m benchmarks.tokenizer
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterator
+
+from benchmarks.helpers import generate_document, timed
+from jsonschema_lint.json_ast.location import Location, Position
+from jsonschema_lint.json_ast.tokenizer import TokenType, tokenize_iter
+
+
+@dataclass
+class _ReferenceToken:
+    type: TokenType
+    value: str
+    location: Location
+
+
+def reference_tokenize_iter(document: str) -> Iterator[_ReferenceToken]:
+    """The original tokenizer, with errors reduced to assertions."""
+    TT = TokenType
+    tokens = {
+        TT.LEFT_BRACE: re.escape("{"),
+        TT.RIGHT_BRACE: re.escape("}"),
+        TT.LEFT_BRACKET: re.escape("["),
+        TT.RIGHT_BRACKET: re.escape("]"),
+        TT.COLON: re.escape(":"),
+        TT.COMMA: re.escape(","),
+        TT.STRING: r'("(\\(["\\\/bfnrt]|u[a-fA-F0-9]{4})|[^"\\\0-\x1F\x7F]+)*")',
+        TT.NUMBER: r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?",
+        TT.TRUE: re.escape("true"),
+        TT.FALSE: re.escape("false"),
+        TT.NULL: re.escape("null"),
+        TT.NEWLINE: r"(\r\n|\r|\n)",
+        TT.WHITESPACE: r"[ \t]+",
+        TT.INVALID_STRING: r'("(\\.|[^"\\\0-\x1F\x7F]+)*")',
+        TT.UNCLOSED_STRING: r'("(\\.|[^"\\\0-\x1F\x7F]+)*)',
+        TT.MISMATCH: r".",
+    }
+    token_regex = "|".join(f"(?P<{token_type.name}>{regex})" for token_type, regex in tokens.items())
+    position = Position(line=1, column=1, index=0)
+    for match in re.finditer(token_regex, document):
+        assert match.lastgroup
+        length = match.end() - match.start()
+        kind = TokenType[match.lastgroup]
+        value = match.group()
+        assert kind.value >= 0
+        if kind is TT.NEWLINE:
+            position.index += length
+            position.column = 1
+            position.line += 1
+            continue
+        elif kind is not TT.WHITESPACE:
+            yield _ReferenceToken(
+                type=kind,
+                value=value,
+                location=Location(start=position, end=position + length),
+            )
+        position += length
+
+
+def count(tokens: Iterator) -> int:
+    return sum(1 for _ in tokens)
+
+
+def main():
+    for size in (1_000_000, 4_000_000):
+        document = generate_document(size)
+        reference_time, num_tokens = timed(lambda: count(reference_tokenize_iter(document)), repeat=5)
+        current_time, current_tokens = timed(lambda: count(tokenize_iter(document)), repeat=5)
+        assert num_tokens == current_tokens
+        print(
+            f"{len(document) / 1e6:.1f} MB, {num_tokens} tokens: "
+            f"reference {num_tokens / reference_time:,.0f} tokens/s, "
+            f"current {num_tokens / current_time:,.0f} tokens/s "
+            f"({reference_time / current_time:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Compare linting a YAML document with PyYAML's pure Python loader versus libyaml's.
+
+Run with:
+
+    python -m benchmarks.yaml_loader
+"""
+
+import json
+
+import yaml
+
+from benchmarks.helpers import generate_document, timed
+from jsonschema_lint.linter import lint
+from jsonschema_lint.yaml_ast import utils
+
+SCHEMA = {"type": "array", "items": {"type": "object", "required": ["id", "name"]}}
+
+
+def main():
+    if utils.CSafeLoader is None:
+        print("PyYAML is built without libyaml, so there is nothing to compare")
+        return
+    document = yaml.safe_dump(json.loads(generate_document(200_000)), sort_keys=False)
+
+    def lint_with(loader):
+        utils.CSafeLoader = loader
+        return lint(schema=SCHEMA, document=document, mode="yaml")
+
+    c_loader = utils.CSafeLoader
+    python, expected = timed(lint_with, None)
+    libyaml, result = timed(lint_with, c_loader)
+    assert result == expected
+    print(
+        f"{len(document) / 1e3:.0f} KB of YAML: pure Python {python * 1e3:.0f} ms, "
+        f"libyaml {libyaml * 1e3:.0f} ms ({python / libyaml:.1f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+import os
+import re
+from pathlib import Path
+from typing import Callable, FrozenSet, Iterator, List, Optional, Set, Tuple
+
+from jsonschema_lint import compat
+
+# Directories which are never searched for instances.
+IGNORED_DIRECTORIES = frozenset(
+    [
+        ".git",
+        ".hg",
+        ".svn",
+        "node_modules",
+        "__pycache__",
+        ".venv",
+        "venv",
+        ".tox",
+        ".nox",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+    ]
+)
+
+_IGNORE_FILENAME = ".gitignore"
+
+
+def default_suffixes() -> FrozenSet[str]:
+    if compat.YAML_ENABLED:
+        return frozenset([".json", ".ndjson", ".jsonl", ".yaml", ".yml"])
+    return frozenset([".json", ".ndjson", ".jsonl"])
+
+
+def discover(
+    root: Path,
+    suffixes: Optional[FrozenSet[str]] = None,
+    search: Optional[Callable[[Path], bool]] = None,
+    on_directory: Optional[Callable[[Path], None]] = None,
+) -> Iterator[Path]:
+    """Yield files below root with a recognised extension, as they are found.
+
+    Directories are walked once, in sorted order, skipping IGNORED_DIRECTORIES, virtualenvs
+    and anything excluded by .gitignore files. Symlinks are followed, but each file and
+    directory is only visited once.
+
+    If search returns False for a directory, files in it are skipped without being
+    examined, but its subdirectories are still walked. If given, on_directory is called
+    with each directory as it is walked.
+    """
+    suffixes = default_suffixes() if suffixes is None else suffixes
+    try:
+        stat = root.stat()
+    except OSError:
+        return
+    seen: Set[Tuple[int, int]] = {(stat.st_dev, stat.st_ino)}
+    stack: List[Tuple[Path, Tuple["IgnoreFile", ...]]] = [(root, ())]
+    while stack:
+        directory, ignores = stack.pop()
+        if on_directory is not None:
+            on_directory(directory)
+        try:
+            with os.scandir(directory) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        names = {entry.name for entry in entries}
+        if "pyvenv.cfg" in names:
+            continue
+        if _IGNORE_FILENAME in names:
+            ignores = (*ignores, IgnoreFile.from_file(directory / _IGNORE_FILENAME))
+        wanted = suffixes if search is None or search(directory) else frozenset()
+        subdirectories = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+                if not is_dir and os.path.splitext(entry.name)[1] not in wanted:
+                    continue
+                if is_dir and entry.name in IGNORED_DIRECTORIES:
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            path = Path(entry.path)
+            if _ignored(path, is_dir, ignores):
+                continue
+            key = (stat.st_dev, stat.st_ino)
+            if key in seen:
+                continue
+            seen.add(key)
+            if is_dir:
+                subdirectories.append((path, ignores))
+            else:
+                yield path
+        stack.extend(reversed(subdirectories))
+
+
+class IgnoreFile:
+    """Patterns from a .gitignore file, matched against paths below its directory."""
+
+    def __init__(self, directory: Path, lines: List[str]):
+        self.directory = directory
+        self.patterns: List[Tuple[re.Pattern, bool, bool]] = []
+        for line in lines:
+            pattern = _parse_pattern(line)
+            if pattern is not None:
+                self.patterns.append(pattern)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "IgnoreFile":
+        try:
+            lines = path.read_text(errors="replace").splitlines()
+        except OSError:
+            lines = []
+        return cls(path.parent, lines)
+
+    def match(self, path: Path, is_dir: bool) -> Optional[bool]:
+        """Return whether the path is ignored, or None if no pattern applies to it.
+
+        As in git, the last matching pattern wins.
+        """
+        relative = path.relative_to(self.directory).as_posix()
+        for regex, negated, dir_only in reversed(self.patterns):
+            if dir_only and not is_dir:
+                continue
+            if regex.fullmatch(relative):
+                return not negated
+        return None
+
+
+def _ignored(path: Path, is_dir: bool, ignores: Tuple[IgnoreFile, ...]) -> bool:
+    # Patterns in deeper .gitignore files take priority
+    for ignore in reversed(ignores):
+        result = ignore.match(path, is_dir)
+        if result is not None:
+            return result
+    return False
+
+
+def _parse_pattern(line: str) -> Optional[Tuple[re.Pattern, bool, bool]]:
+    """Compile a .gitignore line to a regex, and whether it is negated or matches directories only."""
+    if line.endswith("\\ "):
+        line = line.rstrip("\n")
+    else:
+        line = line.rstrip()
+    if not line or line.startswith("#"):
+        return None
+    negated = line.startswith("!")
+    if negated:
+        line = line[1:]
+    elif line.startswith("\\"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    line = line.lstrip("/")
+    regex = _glob_to_regex(line)
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+    return re.compile(regex), negated, dir_only
+
+
+def _glob_to_regex(glob: str) -> str:
+    result = []
+    index = 0
+    while index < len(glob):
+        if glob.startswith("**/", index):
+            result.append("(?:.*/)?")
+            index += 3
+        elif glob.startswith("/**", index) and index + 3 == len(glob):
+            result.append("/.*")
+            index += 3
+        elif glob.startswith("**", index):
+            result.append(".*")
+            index += 2
+        elif glob[index] == "*":
+            result.append("[^/]*")
+            index += 1
+        elif glob[index] == "?":
+            result.append("[^/]")
+            index += 1
+        elif glob[index] == "[" and "]" in glob[index + 2 :]:
+            end = glob.index("]", index + 2)
+            content = glob[index + 1 : end]
+            if content.startswith("!"):
+                content = "^" + content[1:]
+            result.append(f"[{content}]")
+            index = end + 1
+        elif glob[index] == "\\" and index + 1 < len(glob):
+            result.append(re.escape(glob[index + 1]))
+            index += 2
+        else:
+            result.append(re.escape(glob[index]))
+            index += 1
+    return "".join(result)
@@ -0,0 +1,300 @@
+import cgi
+import hashlib
+import http.client
+import json
+import mimetypes
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from email.message import Message
+from pathlib import Path
+from typing import Dict, Iterable, NamedTuple, Optional, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.parse import urljoin, urlsplit
+from urllib.request import Request, getproxies, proxy_bypass, urlopen
+
+# Seconds to wait on a remote server before giving up.
+DEFAULT_TIMEOUT = 30.0
+
+# Times to retry a request which failed to connect, or got a server error.
+DEFAULT_RETRIES = 2
+
+# Seconds a cached document is used without revalidating it with the server.
+DEFAULT_TTL = 24 * 60 * 60
+
+# Bytes of document content to keep on disk, beyond which the least recently used are removed.
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+
+@dataclass
+class HTTPCache:
+    """On-disk cache of remote documents.
+
+    Document content is stored once per distinct content hash under objects/, and each URL
+    has an entry under entries/ pointing at its content along with the validators the
+    server sent. Entries younger than ttl are used without a request; older entries are
+    revalidated using ETag and Last-Modified.
+
+    With offline, cached entries are always used and uncached URLs fail. With refresh,
+    cached entries are ignored and every URL is downloaded again. Content which can't be
+    saved to the directory is still returned.
+    """
+
+    directory: Path
+    ttl: float = DEFAULT_TTL
+    max_size: int = DEFAULT_MAX_SIZE
+    offline: bool = False
+    refresh: bool = False
+    timeout: float = DEFAULT_TIMEOUT
+    retries: int = DEFAULT_RETRIES
+
+    _pool: "ConnectionPool" = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._pool = ConnectionPool(timeout=self.timeout, retries=self.retries)
+
+    def __getstate__(self) -> dict:
+        # Connections can't be shared with other processes
+        state = dict(self.__dict__)
+        del state["_pool"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.__post_init__()
+
+    def fetch(self, url: str) -> Tuple[str, bytes]:
+        """Return the content type and content of a URL, from the cache where possible."""
+        entry = None if self.refresh else self._read_entry(url)
+        content = None if entry is None else self._read_object(entry["digest"])
+        headers: Dict[str, str] = {}
+        if entry is not None and content is not None:
+            if self.offline or time.time() - entry["fetched_at"] < self.ttl:
+                return entry["content_type"], content
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        elif self.offline:
+            raise URLError(f"{url} is not cached, and cannot be downloaded offline")
+        response = self._pool.request(url, headers)
+        if response.status == 304 and entry is not None and content is not None:
+            entry["fetched_at"] = time.time()
+            try:
+                self._write_entry(url, entry)
+            except OSError:
+                pass  # Revalidated again next time
+            return entry["content_type"], content
+        if not 200 <= response.status < 300:
+            raise HTTPError(url, response.status, response.reason, response.headers, None)
+        new_content = response.content
+        content_type = content_type_of(response.url, response.headers.get("Content-Type"))
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        digest = hashlib.sha256(new_content).hexdigest()
+        try:
+            write_atomic(self._object_path(digest), new_content)
+            self._write_entry(
+                url,
+                {
+                    "url": url,
+                    "digest": digest,
+                    "content_type": content_type,
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "fetched_at": time.time(),
+                },
+            )
+        except OSError:
+            # Such as a cache directory that can't be written to, in which case the
+            # content is still used, and downloaded again next time
+            return content_type, new_content
+        self.prune()
+        return content_type, new_content
+
+    def prune(self) -> None:
+        """Remove the least recently used content until the cache is within max_size."""
+        prune_files((self.directory / "objects").glob("*"), self.max_size)
+
+    def _read_entry(self, url: str) -> Optional[dict]:
+        try:
+            return json.loads(self._entry_path(url).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _write_entry(self, url: str, entry: dict) -> None:
+        write_atomic(self._entry_path(url), json.dumps(entry).encode("utf-8"))
+
+    def _read_object(self, digest: str) -> Optional[bytes]:
+        path = self._object_path(digest)
+        try:
+            content = path.read_bytes()
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            return None
+        return content
+
+    def _entry_path(self, url: str) -> Path:
+        return self.directory / "entries" / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def _object_path(self, digest: str) -> Path:
+        return self.directory / "objects" / digest
+
+
+def write_atomic(path: Path, content: bytes) -> None:
+    """Write a file atomically, so that concurrent runs never see partial content."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(handle, "wb") as file:
+            file.write(content)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def prune_files(paths: Iterable[Path], max_size: int) -> None:
+    """Remove the least recently modified files until their total size is within max_size."""
+    files = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_size:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+
+
+def default_cache_dir() -> Path:
+    """Cache directory, following the XDG base directory specification."""
+    root = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(root) / "jsonschema-lint"
+
+
+def content_type_of(url: str, header: Optional[str] = None) -> str:
+    """Pull out mime type of a response.
+
+    Prefer explicit header if available, otherwise guess from url.
+    """
+    content_type = header or mimetypes.guess_type(url)[0] or ""
+    return cgi.parse_header(content_type)[0]
+
+
+class Response(NamedTuple):
+    url: str
+    status: int
+    reason: str
+    headers: Message
+    content: bytes
+
+
+# Statuses which redirect a GET request to the Location header.
+_REDIRECT_STATUSES = frozenset([301, 302, 303, 307, 308])
+
+_MAX_REDIRECTS = 10
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections, one per host for each thread.
+
+    Requests which fail to connect, time out or get a server error are retried with
+    exponential backoff. Redirects are followed. Hosts reached through a proxy are
+    requested with urlopen instead, without keep-alive.
+    """
+
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES, backoff: float = 0.5):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._local = threading.local()
+
+    def request(self, url: str, headers: Dict[str, str]) -> Response:
+        """GET a URL, returning the response whatever its status."""
+        for attempt in range(self.retries + 1):
+            try:
+                response = self._request(url, headers)
+            except URLError:
+                raise
+            except (OSError, http.client.HTTPException) as exc:
+                if attempt == self.retries:
+                    raise URLError(exc) from exc
+            else:
+                if response.status < 500 or attempt == self.retries:
+                    return response
+            time.sleep(self.backoff * 2**attempt)
+        raise AssertionError("Unreachable")
+
+    def _request(self, url: str, headers: Dict[str, str]) -> Response:
+        for _ in range(_MAX_REDIRECTS):
+            parts = urlsplit(url)
+            if _uses_proxy(parts.hostname or ""):
+                return self._request_with_urlopen(url, headers)
+            connection = self._connection(parts.scheme, parts.netloc)
+            path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+            try:
+                connection.request("GET", path, headers={"User-Agent": "jsonschema-lint", **headers})
+                response = connection.getresponse()
+                content = response.read()
+            except BaseException:
+                self._close(parts.scheme, parts.netloc)
+                raise
+            if response.will_close:
+                self._close(parts.scheme, parts.netloc)
+            location = response.headers.get("Location")
+            if response.status in _REDIRECT_STATUSES and location:
+                url = urljoin(url, location)
+                continue
+            return Response(url, response.status, response.reason, response.headers, content)
+        raise URLError(f"Too many redirects from {url}")
+
+    def _request_with_urlopen(self, url: str, headers: Dict[str, str]) -> Response:
+        try:
+            with urlopen(Request(url, headers=headers), timeout=self.timeout) as conn:
+                return Response(conn.url, conn.status, conn.reason, conn.headers, conn.read())
+        except HTTPError as exc:
+            return Response(url, exc.code, exc.reason, exc.headers, exc.read())
+        except URLError as exc:
+            if isinstance(exc.reason, OSError):
+                raise exc.reason from exc  # Retry
+            raise
+
+    def _connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        connections = self._connections()
+        connection = connections.get((scheme, netloc))
+        if connection is None:
+            if scheme == "https":
+                connection = http.client.HTTPSConnection(netloc, timeout=self.timeout)
+            elif scheme == "http":
+                connection = http.client.HTTPConnection(netloc, timeout=self.timeout)
+            else:
+                raise URLError(f"Unsupported URL scheme: {scheme}")
+            connections[(scheme, netloc)] = connection
+        return connection
+
+    def _close(self, scheme: str, netloc: str) -> None:
+        connection = self._connections().pop((scheme, netloc), None)
+        if connection is not None:
+            connection.close()
+
+    def _connections(self) -> Dict[Tuple[str, str], http.client.HTTPConnection]:
+        try:
+            return self._local.connections
+        except AttributeError:
+            self._local.connections = {}
+            return self._local.connections
+
+
+def _uses_proxy(host: str) -> bool:
+    proxies = getproxies()
+    return bool(proxies.get("http") or proxies.get("https")) and not proxy_bypass(host)
@@ -0,0 +1,329 @@
+import json
+import queue
+import threading
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Set
+from urllib.error import URLError
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import jsonschema_lint
+from jsonschema_lint._cli import constants, schema_loader
+from jsonschema_lint._cli.main import get_mode
+from jsonschema_lint._cli.rule_loader import RuleStack
+from jsonschema_lint.json_ast.errors import JSONASTError
+from jsonschema_lint.json_ast.incremental import IncrementalDocument
+from jsonschema_lint.json_ast.location import NEWLINE, LineIndex, Location, Position
+from jsonschema_lint.linter import Error, Mode, lint, lint_parsed
+from jsonschema_lint.ref_registry import REF_REGISTRY
+from jsonschema_lint.validator_cache import VALIDATOR_CACHE
+
+# JSON-RPC error codes.
+_METHOD_NOT_FOUND = -32601
+_INTERNAL_ERROR = -32603
+
+# LSP text document sync kind, for clients to send only the changed ranges.
+_INCREMENTAL_SYNC = 2
+
+_ERROR_SEVERITY = 1
+_ERROR_MESSAGE_TYPE = 1
+
+_LANGUAGE_MODES: Dict[str, Mode] = {"json": "json", "jsonc": "json", "jsonl": "ndjson", "yaml": "yaml"}
+
+
+class TextDocument:
+    """Text of an open document, updated in place with the edits the client sends."""
+
+    def __init__(self, uri: str, text: str, language_id: str = "", version: int = 0):
+        self.uri = uri
+        self.text = text
+        self.language_id = language_id
+        self.version = version
+        self.parsed: Optional[IncrementalDocument] = None
+        self._line_starts: Optional[List[int]] = None
+
+    @property
+    def line_starts(self) -> List[int]:
+        if self._line_starts is None:
+            self._line_starts = LineIndex(self.text).line_starts
+        return self._line_starts
+
+    def apply(self, change: dict) -> None:
+        """Apply a change from textDocument/didChange, which replaces a range or the whole text.
+
+        Line starts are shifted rather than found again, unless the change could split or
+        join a CRLF line ending.
+        """
+        if "range" not in change:
+            self.text = change["text"]
+            self._line_starts = None
+            return
+        start = self.offset(change["range"]["start"])
+        end = self.offset(change["range"]["end"])
+        text = change["text"]
+        line_starts = self.line_starts
+        if "\r" in text + self.text[start - 1 : start] + self.text[end - 1 : end]:
+            self._line_starts = None
+        else:
+            delta = len(text) - (end - start)
+            self._line_starts = (
+                line_starts[: bisect_right(line_starts, start)]
+                + [start + match.end() for match in NEWLINE.finditer(text)]
+                + [line_start + delta for line_start in line_starts[bisect_right(line_starts, end) :]]
+            )
+        self.text = self.text[:start] + text + self.text[end:]
+
+    def offset(self, position: dict) -> int:
+        """Convert an LSP position, which counts UTF-16 code units, to an offset in the text."""
+        line_starts = self.line_starts
+        if position["line"] >= len(line_starts):
+            return len(self.text)
+        start = line_starts[position["line"]]
+        end = line_starts[position["line"] + 1] if position["line"] + 1 < len(line_starts) else len(self.text)
+        line = self.text[start:end]
+        if line.isascii():
+            return start + min(position["character"], len(line))
+        units = 0
+        for index, char in enumerate(line):
+            if units >= position["character"]:
+                return start + index
+            units += 2 if ord(char) > 0xFFFF else 1
+        return end
+
+    def position(self, position: Position) -> dict:
+        """Convert a position in the text to an LSP position."""
+        line_start = position.index - position.column + 1
+        prefix = self.text[line_start : position.index]
+        character = len(prefix) if prefix.isascii() else len(prefix.encode("utf-16-le")) // 2
+        return {"line": position.line - 1, "character": character}
+
+
+class LanguageServer:
+    """Language server publishing lint errors as diagnostics for open documents.
+
+    Rules, schemas and validators are kept between edits, as are the ASTs of JSON documents,
+    so that after an edit within a top-level value only that value is parsed again (see
+    IncrementalDocument). Documents are linted after each batch of messages, so edits
+    which arrive while a document is being linted are applied together, and only the
+    latest text is linted again.
+
+    Errors loading rules or schemas are published as diagnostics, and errors handling
+    notifications are logged to the client, so the server keeps running.
+    """
+
+    def __init__(self, rule_stack: RuleStack, output: BinaryIO):
+        self.rule_stack = rule_stack
+        self.output = output
+        self.documents: Dict[str, TextDocument] = {}
+        self.dirty: Set[str] = set()
+        self.running = True
+        self.shutdown_requested = False
+        self._linted: Dict[str, str] = {}
+
+    def serve(self, input: BinaryIO) -> int:
+        """Handle messages until exit, or the end of input, and return the exit code."""
+        messages: "queue.Queue[Optional[dict]]" = queue.Queue()
+        reader = threading.Thread(target=_read_messages, args=(input, messages), daemon=True)
+        reader.start()
+        while True:
+            batch = [messages.get()]
+            while True:
+                try:
+                    batch.append(messages.get_nowait())
+                except queue.Empty:
+                    break
+            for message in batch:
+                if message is not None:
+                    self.handle(message)
+                if message is None or not self.running:
+                    return 0 if self.shutdown_requested else 1
+            self.publish()
+
+    def handle(self, message: dict) -> None:
+        method = message.get("method")
+        params = message.get("params") or {}
+        handler = {
+            "initialize": self._initialize,
+            "shutdown": self._shutdown,
+            "exit": self._exit,
+            "textDocument/didOpen": self._did_open,
+            "textDocument/didChange": self._did_change,
+            "textDocument/didClose": self._did_close,
+            "workspace/didChangeWatchedFiles": self._did_change_watched_files,
+        }.get(method or "")
+        if "id" not in message:
+            if handler is None:
+                return
+            try:
+                handler(params)
+            except Exception as exc:
+                self._notify("window/logMessage", {"type": _ERROR_MESSAGE_TYPE, "message": f"{method}: {exc}"})
+            return
+        if handler is None:
+            self._send({"id": message["id"], "error": {"code": _METHOD_NOT_FOUND, "message": f"Unknown: {method}"}})
+            return
+        try:
+            result = handler(params)
+        except Exception as exc:
+            self._send({"id": message["id"], "error": {"code": _INTERNAL_ERROR, "message": str(exc)}})
+        else:
+            self._send({"id": message["id"], "result": result})
+
+    def publish(self) -> None:
+        """Lint documents changed since they were last linted, and publish their diagnostics."""
+        for uri in sorted(self.dirty):
+            document = self.documents.get(uri)
+            if document is None or self._linted.get(uri) == document.text:
+                continue
+            diagnostics = [self._diagnostic(document, error) for error in self.lint(document)]
+            self._linted[uri] = document.text
+            self._notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": diagnostics})
+        self.dirty.clear()
+
+    def lint(self, document: TextDocument) -> List[Error]:
+        path = _path(document.uri)
+        if path is None:
+            return []
+        try:
+            rule = self.rule_stack.rule_for(path)
+        except Exception as exc:  # Such as a rules file saved while it is invalid
+            return [_document_error(f"Could not load rules for {path}: {exc}")]
+        if rule is None:
+            return []
+        mode = rule.mode or get_mode(path) or _LANGUAGE_MODES.get(document.language_id)
+        try:
+            schema = rule.schema
+            if mode == "json":
+                return self._lint_json(document, schema, rule.resolved_schema_uri)
+            return lint(schema=schema, document=document.text, mode=mode, schema_key=rule.resolved_schema_uri)
+        except URLError:
+            return [_document_error(f"Could not load schema from {rule.resolved_schema_uri}")]
+        except Exception as exc:  # Such as a schema saved while it is invalid
+            return [_document_error(f"Could not lint with {rule.resolved_schema_uri}: {exc}")]
+
+    def _lint_json(self, document: TextDocument, schema: Any, schema_key: str) -> List[Error]:
+        """Lint a JSON document, parsing again only what changed since it was last parsed.
+
+        The last valid parse is kept while the document is invalid, so that it can be
+        updated once the edit is complete.
+        """
+        if document.parsed is None or not document.parsed.update(document.text, document.line_starts):
+            try:
+                document.parsed = IncrementalDocument(document.text, document.line_starts)
+            except JSONASTError as exc:
+                return [Error(location=exc.location, message=str(exc))]
+        parsed = document.parsed
+        return lint_parsed(schema, parsed.ast, parsed.instance, schema_key=schema_key)
+
+    def _diagnostic(self, document: TextDocument, error: Error) -> dict:
+        return {
+            "range": {
+                "start": document.position(error.location.start),
+                "end": document.position(error.location.end),
+            },
+            "severity": _ERROR_SEVERITY,
+            "source": "jsonschema-lint",
+            "message": error.message,
+        }
+
+    def _initialize(self, params: dict) -> dict:
+        return {
+            "capabilities": {"textDocumentSync": {"openClose": True, "change": _INCREMENTAL_SYNC}},
+            "serverInfo": {"name": "jsonschema-lint", "version": jsonschema_lint.__version__},
+        }
+
+    def _shutdown(self, params: dict) -> None:
+        self.shutdown_requested = True
+        return None
+
+    def _exit(self, params: dict) -> None:
+        self.running = False
+
+    def _did_open(self, params: dict) -> None:
+        item = params["textDocument"]
+        self.documents[item["uri"]] = TextDocument(
+            item["uri"], item["text"], language_id=item.get("languageId", ""), version=item.get("version", 0)
+        )
+        self._linted.pop(item["uri"], None)
+        self.dirty.add(item["uri"])
+
+    def _did_change(self, params: dict) -> None:
+        document = self.documents.get(params["textDocument"]["uri"])
+        if document is None:
+            # Changes to documents which were never opened are ignored
+            return
+        for change in params["contentChanges"]:
+            document.apply(change)
+        document.version = params["textDocument"].get("version", document.version)
+        self.dirty.add(document.uri)
+
+    def _did_close(self, params: dict) -> None:
+        uri = params["textDocument"]["uri"]
+        self.documents.pop(uri, None)
+        self._linted.pop(uri, None)
+        self.dirty.discard(uri)
+        self._notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": []})
+
+    def _did_change_watched_files(self, params: dict) -> None:
+        """Forget rules and schemas which may have changed, and lint every open document again."""
+        for change in params.get("changes", []):
+            path = _path(change["uri"])
+            if path and path.name == constants.CONFIG_FILENAME:
+                self.rule_stack.invalidate(path.parent)
+            else:
+                schema_loader.load_schema.cache_clear()
+                VALIDATOR_CACHE.clear()
+                REF_REGISTRY.clear()
+        self._linted.clear()
+        self.dirty.update(self.documents)
+
+    def _notify(self, method: str, params: dict) -> None:
+        self._send({"method": method, "params": params})
+
+    def _send(self, message: dict) -> None:
+        write_message(self.output, message)
+
+
+def read_message(input: BinaryIO) -> Optional[dict]:
+    """Read a JSON-RPC message with its headers, or return None at the end of input."""
+    length = None
+    while True:
+        line = input.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.decode("ascii").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    if length is None:
+        return None
+    return json.loads(input.read(length))
+
+
+def write_message(output: BinaryIO, message: dict) -> None:
+    content = json.dumps({"jsonrpc": "2.0", **message}, separators=(",", ":")).encode("utf-8")
+    output.write(f"Content-Length: {len(content)}\r\n\r\n".encode("ascii") + content)
+    output.flush()
+
+
+def _read_messages(input: BinaryIO, messages: "queue.Queue[Optional[dict]]") -> None:
+    while True:
+        message = read_message(input)
+        messages.put(message)
+        if message is None:
+            return
+
+
+def _document_error(message: str) -> Error:
+    start = Position(line=1, column=1, index=0)
+    return Error(location=Location(start=start, end=start), message=message)
+
+
+def _path(uri: str) -> Optional[Path]:
+    url = urlparse(uri)
+    if url.scheme != "file":
+        return None
+    return Path(url2pathname(url.path))
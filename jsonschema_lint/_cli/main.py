@@ -1,14 +1,32 @@
+import mmap
+import os
 import sys
 import traceback
 import urllib
+from contextlib import contextmanager
+from dataclasses import replace
 from pathlib import Path
-from typing import Dict, Literal, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import click
 
+from jsonschema_lint._cli import schema_loader
+from jsonschema_lint._cli.http_cache import DEFAULT_MAX_SIZE, DEFAULT_TTL, HTTPCache, default_cache_dir
+from jsonschema_lint._cli.parallel import lint_parallel
+from jsonschema_lint._cli.prefetch import prefetch, prefetch_each
+from jsonschema_lint._cli.result_cache import DEFAULT_MAX_SIZE as DEFAULT_RESULTS_MAX_SIZE
+from jsonschema_lint._cli.result_cache import ResultCache
 from jsonschema_lint._cli.resolver import resolve_targets
-from jsonschema_lint._cli.rule_loader import Rule
-from jsonschema_lint.linter import Error, lint
+from jsonschema_lint._cli.rule_loader import Rule, RuleStack
+from jsonschema_lint._cli.watch import WatchSession
+from jsonschema_lint.json_ast.location import Document
+from jsonschema_lint.linter import Error, Mode, lint
+
+_result_cache: Optional[ResultCache] = None
+
+# Files at least this large are memory-mapped, and JSON in them parsed without decoding
+# the whole file, rather than being read into memory.
+MMAP_THRESHOLD = 32 * 1024 * 1024
 
 
 @click.command("jsonschema-lint")
@@ -26,12 +44,105 @@ from jsonschema_lint.linter import Error, lint
     default=False,
     help="Use schemastore.org to identify correct schemas.",
 )
+@click.option(
+    "--schema-store-catalog",
+    type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
+    default=None,
+    envvar="JSONSCHEMA_LINT_SCHEMA_STORE_CATALOG",
+    help="Use this copy of the Schema Store catalog instead of downloading it. Implies --schema-store.",
+)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    help="Number of processes to lint with. Pass 0 to use all CPUs.",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, dir_okay=True, path_type=Path),
+    default=None,
+    envvar="JSONSCHEMA_LINT_CACHE_DIR",
+    help="Directory to cache remote schemas in. Defaults to $XDG_CACHE_HOME/jsonschema-lint.",
+)
+@click.option(
+    "--cache-ttl",
+    type=click.IntRange(min=0),
+    default=DEFAULT_TTL,
+    help="Seconds to use cached remote schemas before checking them for changes.",
+)
+@click.option(
+    "--cache-max-size",
+    type=click.IntRange(min=0),
+    default=DEFAULT_MAX_SIZE // (1024 * 1024),
+    help="Megabytes of remote schemas to keep in the cache.",
+)
+@click.option(
+    "--offline",
+    is_flag=True,
+    default=False,
+    help="Only use cached remote schemas, never download them.",
+)
+@click.option(
+    "--refresh-cache",
+    is_flag=True,
+    default=False,
+    help="Download remote schemas again, ignoring cached copies.",
+)
+@click.option(
+    "--results-cache-dir",
+    type=click.Path(file_okay=False, dir_okay=True, path_type=Path),
+    default=None,
+    envvar="JSONSCHEMA_LINT_RESULTS_CACHE_DIR",
+    help="Directory to cache lint results in, so unchanged files are not linted again. Defaults to the --cache-dir.",
+)
+@click.option(
+    "--results-cache-max-size",
+    type=click.IntRange(min=0),
+    default=DEFAULT_RESULTS_MAX_SIZE // (1024 * 1024),
+    help="Megabytes of lint results to keep in the cache.",
+)
+@click.option(
+    "--no-results-cache",
+    is_flag=True,
+    default=False,
+    help="Lint every file, without reading or writing cached results.",
+)
+@click.option(
+    "--watch",
+    "-w",
+    is_flag=True,
+    default=False,
+    help="Keep running, and lint files again when they or their rules or schemas change.",
+)
+@click.option(
+    "--lsp",
+    is_flag=True,
+    default=False,
+    help="Run as a language server, over stdin and stdout.",
+)
 @click.argument(
     "filter",
     type=click.Path(exists=True, file_okay=True, dir_okay=False, path_type=Path),
     nargs=-1,
 )
-def jsonschema_lint(filter: Tuple[Path, ...], schema_path: Optional[Path] = None, schema_store: bool = False):
+def jsonschema_lint(
+    filter: Tuple[Path, ...],
+    schema_path: Optional[Path] = None,
+    schema_store: bool = False,
+    schema_store_catalog: Optional[Path] = None,
+    jobs: int = 1,
+    cache_dir: Optional[Path] = None,
+    cache_ttl: int = DEFAULT_TTL,
+    cache_max_size: int = DEFAULT_MAX_SIZE // (1024 * 1024),
+    offline: bool = False,
+    refresh_cache: bool = False,
+    results_cache_dir: Optional[Path] = None,
+    results_cache_max_size: int = DEFAULT_RESULTS_MAX_SIZE // (1024 * 1024),
+    no_results_cache: bool = False,
+    watch: bool = False,
+    lsp: bool = False,
+):
     """Lint instances against schemas.
 
     May pass file paths as arguments to lint specific files, otherwise all files with a
@@ -42,19 +153,111 @@ def jsonschema_lint(filter: Tuple[Path, ...], schema_path: Optional[Path] = None
     do not have a matching entry in any .jsonschema-lint file are not linted.
 
     If the --schema-store flag is provided, schemastore.org will be checked for common
-    filenames. Local .jsonschema-lint rules will always take priority over this.
+    filenames. Local .jsonschema-lint rules will always take priority over this. Pass
+    --schema-store-catalog to use a pinned copy of the catalog rather than downloading it.
 
     Alternatively, an exact schema may be passed using the --schema option. This will be
     used for all specified files.
+
+    With --jobs, files are linted in parallel. Output is the same as when linting serially.
+    When there is only one file, the records of an NDJSON file are linted in parallel instead.
+
+    Remote schemas are cached on disk, and revalidated with the server once older than
+    --cache-ttl. Pass --offline to only use cached schemas, or --refresh-cache to download
+    them all again. The documents each schema references are downloaded concurrently when
+    it's first used. With --jobs, every schema is downloaded before linting starts.
+
+    Results are cached in --results-cache-dir, and replayed for files whose content, schema
+    and mode are unchanged since they were last linted. The least recently used results
+    beyond --results-cache-max-size are removed at the end of each run.
+
+    With --watch, files are linted again whenever they change, along with every file affected
+    by a change to a .jsonschema-lint file or local schema, until interrupted.
+
+    With --lsp, the linter runs as a language server, publishing errors in open documents as
+    diagnostics.
     """
+    if offline and refresh_cache:
+        raise click.UsageError("--offline and --refresh-cache cannot be used together.")
+    http_cache = HTTPCache(
+        directory=cache_dir or default_cache_dir(),
+        ttl=cache_ttl,
+        max_size=cache_max_size * 1024 * 1024,
+        offline=offline,
+        refresh=refresh_cache,
+    )
+    result_cache = None
+    if not no_results_cache:
+        result_cache = ResultCache(
+            (results_cache_dir or http_cache.directory).absolute(), max_size=results_cache_max_size * 1024 * 1024
+        )
+    _configure_worker(http_cache, result_cache)
+    schema_store = schema_store or schema_store_catalog is not None
+    if lsp or watch:
+        rule_stack = RuleStack(
+            schema_store=schema_store, schema_override=schema_path, schema_store_catalog=schema_store_catalog
+        )
+        if lsp:
+            from jsonschema_lint._cli.lsp import LanguageServer
+
+            exit_code = LanguageServer(rule_stack, sys.stdout.buffer).serve(sys.stdin.buffer)
+            # Exit immediately, as the thread reading stdin may still be blocked on it.
+            sys.stdout.flush()
+            os._exit(exit_code)
+        num_errors = WatchSession(filter, rule_stack, lint_file_output).run()
+        if result_cache:
+            result_cache.prune()
+        sys.exit(min(1, num_errors))
+    jobs = jobs or os.cpu_count() or 1
+    targets = resolve_targets(filter, schema_path, schema_store, schema_store_catalog)
     num_errors = 0
-    for rule, path in resolve_targets(filter, schema_path, schema_store):
-        num_errors += lint_file(rule, path)
+    if jobs == 1:
+        # Files are linted as they are found, rather than after discovery finishes
+        for rule, path in prefetch_each(targets, uri=lambda target: target[0].resolved_schema_uri):
+            num_errors += lint_file(rule, path)
+    else:
+        target_list = list(targets)
+        prefetch({rule.resolved_schema_uri for rule, _ in target_list})
+        if len(target_list) == 1:
+            for rule, path in target_list:
+                num_errors += lint_file(rule, path, jobs=jobs)
+        else:
+            # Schemas were refreshed by the prefetch, so workers can use the cached copies.
+            worker_cache = replace(http_cache, refresh=False)
+            for output in lint_parallel(
+                target_list,
+                jobs,
+                lint_file_output,
+                initializer=_configure_worker,
+                initargs=(worker_cache, result_cache),
+            ):
+                for line in output:
+                    click.echo(line)
+                num_errors += len(output)
+    if result_cache:
+        result_cache.prune()
     sys.exit(min(1, num_errors))
 
 
-def lint_file(rule: Rule, path: Path) -> int:
+def _configure_worker(http_cache: Optional[HTTPCache], result_cache: Optional[ResultCache]) -> None:
+    global _result_cache
+    schema_loader.configure(http_cache)
+    _result_cache = result_cache
+
+
+def lint_file(rule: Rule, path: Path, jobs: int = 1) -> int:
     """Lint a file, print errors, return the number of errors."""
+    output = lint_file_output(rule, path, jobs=jobs)
+    for line in output:
+        click.echo(line)
+    return len(output)
+
+
+def lint_file_output(rule: Rule, path: Path, jobs: int = 1) -> List[str]:
+    """Lint a file, return a formatted line for each error.
+
+    With jobs > 1, the records of an NDJSON file are linted across a pool of processes.
+    """
     try:
         path = path.relative_to(Path.cwd())
     except ValueError:
@@ -62,20 +265,37 @@ def lint_file(rule: Rule, path: Path) -> int:
     try:
         schema = rule.schema
     except urllib.error.URLError:
-        click.echo(f"{path}:1:1:1:1: Could not load schema from {rule.resolved_schema_uri}")
-        return 1
+        return [f"{path}:1:1:1:1: Could not load schema from {rule.resolved_schema_uri}"]
     mode = rule.mode or get_mode(path)
-    errors = lint(schema=schema, document=path.read_text(), mode=mode)
-    for error in errors:
-        click.echo(format_error(path, error))
-    return len(errors)
+    key = _result_cache.key(path, rule.resolved_schema_uri, mode) if _result_cache else None
+    errors = _result_cache.get(key) if _result_cache and key else None
+    if errors is None:
+        with open_document(path, mode) as document:
+            errors = lint(
+                schema=schema, document=document, mode=mode, schema_key=rule.resolved_schema_uri, jobs=jobs
+            )
+        if _result_cache and key:
+            _result_cache.set(key, errors)
+    return [format_error(path, error) for error in errors]
+
+
+@contextmanager
+def open_document(path: Path, mode: Optional[Mode] = None) -> Iterator[Document]:
+    """Open a document to lint, memory-mapping it if it is large and could be JSON or NDJSON."""
+    if mode == "yaml" or path.stat().st_size < MMAP_THRESHOLD:
+        yield path.read_text()
+        return
+    with path.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
 
 
-def get_mode(path: Path) -> Optional[Literal["json", "yaml"]]:
-    mapping: Dict[str, Literal["json", "yaml"]] = {
+def get_mode(path: Path) -> Optional[Mode]:
+    mapping: Dict[str, Mode] = {
         "json": "json",
         "yml": "yaml",
         "yaml": "yaml",
+        "ndjson": "ndjson",
+        "jsonl": "ndjson",
     }
     return mapping.get(path.suffix.lstrip("."))
 
@@ -0,0 +1,116 @@
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from jsonschema_lint._cli.rule_loader import Rule
+
+LintFunc = Callable[[Rule, Path], List[str]]
+Batch = List[Tuple[int, Rule, Path]]
+
+# Number of batches to aim for per worker, so its output is yielded as it goes.
+_BATCHES_PER_JOB = 4
+
+
+def lint_parallel(
+    targets: Sequence[Tuple[Rule, Path]],
+    jobs: int,
+    lint_func: LintFunc,
+    initializer: Optional[Callable[..., Any]] = None,
+    initargs: Tuple = (),
+) -> Iterator[List[str]]:
+    """Lint targets across worker processes.
+
+    Yields the output of lint_func for each target, in the same order as the targets, so
+    that output is identical to linting serially. If given, initializer is called with
+    initargs in each worker before it lints anything.
+
+    Each worker is a separate single-process pool, so the batches scheduled for it (see
+    schedule) are linted there, with the validators it has already built.
+    """
+    results: Dict[int, List[str]] = {}
+    next_position = 0
+    with ExitStack() as stack:
+        futures = []
+        for batches in schedule(targets, jobs):
+            if not batches:
+                continue
+            executor = stack.enter_context(
+                ProcessPoolExecutor(max_workers=1, initializer=initializer, initargs=initargs)
+            )
+            futures += [executor.submit(_lint_batch, batch, lint_func) for batch in batches]
+        for future in as_completed(futures):
+            results.update(future.result())
+            while next_position in results:
+                yield results.pop(next_position)
+                next_position += 1
+
+
+def schedule(targets: Sequence[Tuple[Rule, Path]], jobs: int) -> List[List[Batch]]:
+    """Assign targets to workers, keeping files which share a schema on the same worker.
+
+    Returns the batches for each worker. Grouping by schema means a worker builds the
+    validators for a schema once, and reuses them for every file of that schema. Groups
+    are assigned largest first, each to the least loaded worker, by total file size.
+    Groups larger than a worker's share of the total are split into parts of about that
+    share, so a run dominated by one schema still uses every worker.
+
+    Each worker lints its files in the order of the targets, in batches of several files,
+    so output can be yielded as soon as earlier files are done.
+    """
+    sizes = [_file_size(path) for _, path in targets]
+    groups: Dict[str, List[int]] = defaultdict(list)
+    for position, (rule, _) in enumerate(targets):
+        groups[rule.resolved_schema_uri].append(position)
+
+    share = max(sum(sizes) // jobs, 1)
+    parts: List[Tuple[int, List[int]]] = []
+    for positions in groups.values():
+        positions.sort(key=lambda position: sizes[position], reverse=True)
+        parts += _split(positions, sizes, share)
+    parts.sort(key=lambda item: item[0], reverse=True)
+
+    loads = [0] * jobs
+    assigned: List[List[int]] = [[] for _ in range(jobs)]
+    for part_size, part in parts:
+        worker = loads.index(min(loads))
+        assigned[worker] += part
+        loads[worker] += part_size
+
+    max_batch_size = max(share // _BATCHES_PER_JOB, 1)
+    worker_batches: List[List[Batch]] = []
+    for positions in assigned:
+        batches = _split(sorted(positions), sizes, max_batch_size)
+        worker_batches.append([[(position, *targets[position]) for position in batch] for _, batch in batches])
+    return worker_batches
+
+
+def _split(positions: List[int], sizes: List[int], max_size: int) -> List[Tuple[int, List[int]]]:
+    """Split positions, in order, into parts whose sizes add up to at most max_size, and return each with its size.
+
+    A single file larger than max_size is a part of its own.
+    """
+    parts: List[Tuple[int, List[int]]] = []
+    part: List[int] = []
+    part_size = 0
+    for position in positions:
+        if part and part_size + sizes[position] > max_size:
+            parts.append((part_size, part))
+            part, part_size = [], 0
+        part.append(position)
+        part_size += sizes[position]
+    if part:
+        parts.append((part_size, part))
+    return parts
+
+
+def _lint_batch(batch: Batch, lint_func: LintFunc) -> Dict[int, List[str]]:
+    return {position: lint_func(rule, path) for position, rule, path in batch}
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
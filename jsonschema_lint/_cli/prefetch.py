@@ -0,0 +1,73 @@
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, Iterator, Set, TypeVar
+from urllib.parse import urldefrag, urljoin, urlparse
+
+from jsonschema_lint._cli.schema_loader import load_schema
+
+# Number of schemas to download at once.
+DEFAULT_WORKERS = 8
+
+T = TypeVar("T")
+
+
+def prefetch(uris: Iterable[str], workers: int = DEFAULT_WORKERS) -> None:
+    """Load schemas, and the documents they reference with $ref, concurrently.
+
+    Loaded schemas are kept by load_schema, so linting does not wait on each in turn.
+    Failures are ignored here, and reported when the schema is used.
+    """
+    seen: Set[str] = set()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: Dict[Future, str] = {}
+
+        def submit(uri: str) -> None:
+            if uri not in seen:
+                seen.add(uri)
+                pending[executor.submit(load_schema, uri)] = uri
+
+        for uri in uris:
+            submit(uri)
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                uri = pending.pop(future)
+                if future.exception() is None:
+                    for reference in iter_references(future.result(), uri):
+                        submit(reference)
+
+
+def prefetch_each(items: Iterable[T], uri: Callable[[T], str], workers: int = DEFAULT_WORKERS) -> Iterator[T]:
+    """Yield items as they come, prefetching the schema of each the first time it's seen.
+
+    Unlike prefetch, items aren't collected first, so they can be used while more are
+    still being found. Only the documents a schema references are loaded concurrently.
+    """
+    seen: Set[str] = set()
+    for item in items:
+        item_uri = uri(item)
+        if item_uri not in seen:
+            seen.add(item_uri)
+            prefetch([item_uri], workers)
+        yield item
+
+
+def iter_references(schema: Any, base_uri: str) -> Iterator[str]:
+    """Yield the URI of each document referenced by a schema with $ref.
+
+    References within the same document are skipped.
+    """
+    stack = [(schema, base_uri)]
+    while stack:
+        node, base = stack.pop()
+        if isinstance(node, dict):
+            scope = node.get("$id", node.get("id"))
+            if isinstance(scope, str):
+                base = urljoin(base, scope)
+            reference = node.get("$ref")
+            if isinstance(reference, str):
+                uri = urldefrag(urljoin(base, reference))[0]
+                if uri and uri != urldefrag(base)[0] and urlparse(uri).scheme in ("http", "https", "file"):
+                    yield uri
+            stack.extend((value, base) for value in node.values())
+        elif isinstance(node, list):
+            stack.extend((value, base) for value in node)
@@ -1,26 +1,34 @@
 from pathlib import Path
-from typing import Iterator, Optional, Tuple
+from typing import Callable, Iterable, Iterator, Optional, Tuple
 
-from jsonschema_lint import compat
+from jsonschema_lint._cli.discovery import discover
 from jsonschema_lint._cli.rule_loader import Rule, RuleStack
 
 
 def resolve_targets(
-    filter: Tuple[Path, ...], schema_path: Optional[Path] = None, schema_store: bool = False
+    filter: Tuple[Path, ...],
+    schema_path: Optional[Path] = None,
+    schema_store: bool = False,
+    schema_store_catalog: Optional[Path] = None,
 ) -> Iterator[Tuple[Rule, Path]]:
-    """Resolve instances and their corresponding schema rules."""
-    filter = filter or default_targets()
-    filter = tuple([path.absolute() for path in filter])
-    for path in filter:
-        rule_stack = RuleStack(cwd=path.parent, schema_store=schema_store, schema_override=schema_path)
+    """Resolve instances and their corresponding schema rules.
+
+    Without a filter, instances are discovered below the working directory and resolved
+    as they are found, skipping files in directories which no rule could match.
+    """
+    rule_stack = RuleStack(
+        schema_store=schema_store, schema_override=schema_path, schema_store_catalog=schema_store_catalog
+    )
+    paths: Iterable[Path]
+    if filter:
+        paths = (path.absolute() for path in filter)
+    else:
+        paths = default_targets(search=rule_stack.may_match_in)
+    for path in paths:
         rule = rule_stack.rule_for(path)
         if rule:
             yield rule, path
 
 
-def default_targets() -> Tuple[Path, ...]:
-    result = list(Path.cwd().glob("**/*.json"))
-    if compat.YAML_ENABLED:
-        result.extend(Path.cwd().glob("**/*.yaml"))
-        result.extend(Path.cwd().glob("**/*.yml"))
-    return tuple(result)
+def default_targets(search: Optional[Callable[[Path], bool]] = None) -> Iterator[Path]:
+    return discover(Path.cwd(), search=search)
@@ -0,0 +1,164 @@
+import hashlib
+import itertools
+import json
+import os
+import time
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import jsonschema_lint
+from jsonschema_lint._cli.http_cache import prune_files, write_atomic
+from jsonschema_lint._cli.prefetch import iter_references
+from jsonschema_lint._cli.schema_loader import load_schema
+from jsonschema_lint.json_ast.location import Location, Position
+from jsonschema_lint.linter import Error
+from jsonschema_lint.validator_cache import fingerprint
+
+# Bytes of results and file hashes to keep on disk, beyond which the least recently used are removed.
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+# Seconds within which a file's modification time can't be trusted, since it could be
+# modified again without its modification time changing.
+_RACY_SECONDS = 2
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+class ResultCache:
+    """On-disk cache of lint errors, keyed by the content of a file and how it is linted.
+
+    The key combines a hash of the file's content with the fingerprints of its schema and
+    every document that schema references, the mode, and the versions of this tool and of
+    jsonschema. Changing any of these misses the cache.
+
+    Content hashes are remembered against each file's modification time, size and inode,
+    so unchanged files are not read. Results are also held in memory, so identical files
+    are only linted once per run. Files used are marked as recently used, and prune
+    removes the least recently used beyond max_size. If the directory can't be read or
+    written, files are linted as if nothing was cached.
+    """
+
+    def __init__(self, directory: Path, max_size: int = DEFAULT_MAX_SIZE):
+        self.directory = directory
+        self.max_size = max_size
+        self._results: Dict[str, List[Error]] = {}
+
+    def key(self, path: Path, schema_uri: str, mode: Optional[str]) -> Optional[str]:
+        """Return the key of a file's results, or None if they can't be cached."""
+        schema_digest = schema_fingerprint(schema_uri)
+        if schema_digest is None:
+            return None
+        parts = [content_digest(path, self.directory), schema_digest, mode or "", *_versions()]
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[List[Error]]:
+        try:
+            return self._results[key]
+        except KeyError:
+            pass
+        path = self._result_path(key)
+        try:
+            content = json.loads(path.read_text())
+            os.utime(path)  # Mark as recently used
+        except (OSError, ValueError):
+            return None
+        errors = self._results[key] = [_load_error(error) for error in content]
+        return errors
+
+    def set(self, key: str, errors: List[Error]) -> None:
+        self._results[key] = errors
+        content = json.dumps([_dump_error(error) for error in errors])
+        try:
+            write_atomic(self._result_path(key), content.encode("utf-8"))
+        except OSError:
+            pass  # Such as a cache directory that can't be written to, so results are kept in memory only
+
+    def prune(self) -> None:
+        """Remove the least recently used results and hashes until the cache is within max_size."""
+        prune_files(
+            itertools.chain((self.directory / "results").glob("*/*.json"), (self.directory / "stat").glob("*.json")),
+            self.max_size,
+        )
+
+    def _result_path(self, key: str) -> Path:
+        return self.directory / "results" / key[:2] / f"{key}.json"
+
+
+def content_digest(path: Path, directory: Path) -> str:
+    """Return a hash of a file's content, reusing the last hash if the file is unchanged."""
+    path = path.absolute()
+    stat = path.stat()
+    signature = [stat.st_mtime_ns, stat.st_size, stat.st_ino]
+    stat_path = directory / "stat" / f"{hashlib.sha256(str(path).encode('utf-8')).hexdigest()}.json"
+    try:
+        entry = json.loads(stat_path.read_text())
+    except (OSError, ValueError):
+        entry = None
+    if entry and entry["signature"] == signature:
+        try:
+            os.utime(stat_path)  # Mark as recently used
+        except OSError:
+            pass
+        return entry["digest"]
+    digest = _file_digest(path)
+    if time.time() - stat.st_mtime > _RACY_SECONDS:
+        try:
+            write_atomic(stat_path, json.dumps({"signature": signature, "digest": digest}).encode("utf-8"))
+        except OSError:
+            pass  # The file is hashed again next time
+    return digest
+
+
+def _file_digest(path: Path) -> str:
+    """Hash a file in chunks, so large files are never held in memory."""
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        for chunk in iter(lambda: file.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def schema_fingerprint(uri: str) -> Optional[str]:
+    """Return a hash of a schema and every document it references, or None if any fail to load."""
+    digest = hashlib.sha256()
+    seen = {uri}
+    stack = [uri]
+    while stack:
+        document_uri = stack.pop()
+        try:
+            document = load_schema(document_uri)
+        except Exception:
+            return None
+        digest.update(f"{document_uri}\0{fingerprint(document)}\0".encode("utf-8"))
+        for reference in sorted(set(iter_references(document, document_uri)) - seen):
+            seen.add(reference)
+            stack.append(reference)
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def _versions() -> List[str]:
+    try:
+        jsonschema_version = version("jsonschema")
+    except PackageNotFoundError:
+        jsonschema_version = ""
+    return [jsonschema_lint.__version__, jsonschema_version]
+
+
+def _dump_error(error: Error) -> list:
+    start, end = error.location.start, error.location.end
+    return [start.line, start.column, start.index, end.line, end.column, end.index, error.message]
+
+
+def _load_error(content: list) -> Error:
+    start_line, start_column, start_index, end_line, end_column, end_index, message = content
+    return Error(
+        location=Location(
+            start=Position(line=start_line, column=start_column, index=start_index),
+            end=Position(line=end_line, column=end_column, index=end_index),
+        ),
+        message=message,
+    )
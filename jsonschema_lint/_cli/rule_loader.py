@@ -1,23 +1,34 @@
+import hashlib
 import json
 from dataclasses import dataclass, field
 from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import List, Literal, Optional
+from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse
-from urllib.request import urlopen
 
 from jsonschema_lint import utils
 from jsonschema_lint._cli import constants
-from jsonschema_lint._cli.schema_loader import load_schema
+from jsonschema_lint._cli.http_cache import write_atomic
+from jsonschema_lint._cli.schema_loader import fetch, get_http_cache, load_schema
+from jsonschema_lint.linter import Mode
 
 
 @dataclass
 class RuleStack:
-    cwd: Path = field(default_factory=Path.cwd)
+    """Index of rules for a whole run.
+
+    Parsed .jsonschema-lint files are held in a directory trie, with each directory
+    inheriting the rules of its parents. Resolving a path costs one lookup per
+    directory level, and each .jsonschema-lint file is only read once.
+    """
+
     schema_store: bool = False
     schema_override: Optional[Path] = None
+    schema_store_catalog: Optional[Path] = None
 
     _cache: dict = field(default_factory=dict)
+    _roots: Dict[str, "_Directory"] = field(default_factory=dict)
+    _directories: Dict[Path, "_Directory"] = field(default_factory=dict)
 
     def rule_for(self, path: Path) -> Optional["Rule"]:
         if path not in self._cache:
@@ -26,24 +37,85 @@ class RuleStack:
 
     def _rule_for(self, path: Path) -> Optional["Rule"]:
         if self.schema_override:
-            return Rule(owner=Path.cwd(), glob="**/*", schema_uri=str(self.schema_override), mode=None)
-        for rule in self.local_rules:
-            if rule.match(path):
-                return rule
-        for rule in self.remote_rules:
+            return self.override_rule
+        for rule in self.local_rules(path.parent):
             if rule.match(path):
                 return rule
+        if self.schema_store:
+            return schema_store_index(self.schema_store_catalog).rule_for(path)
         return None
 
+    def may_match_in(self, directory: Path) -> bool:
+        """Whether any rule could match a file directly in a directory.
+
+        Discovery uses this to skip files in directories without any applicable rule.
+        Subdirectories must still be visited, since they may have .jsonschema-lint files
+        of their own.
+        """
+        if self.schema_override or self.schema_store:
+            return True
+        directory = directory.absolute()
+        return any(rule.may_match_in(directory) for rule in self.local_rules(directory))
+
+    def invalidate(self, directory: Path) -> None:
+        """Forget the rules for a directory and everything below it, so they are read again."""
+        directory = directory.absolute()
+        for path in [path for path in self._directories if path == directory or directory in path.parents]:
+            del self._directories[path]
+        if directory.parent == directory:
+            self._roots.pop(directory.anchor, None)
+        elif directory.parent in self._directories:
+            self._directories[directory.parent].children.pop(directory.name, None)
+        for path in [path for path in self._cache if directory in path.parents]:
+            del self._cache[path]
+
+    def local_rules(self, directory: Path) -> List["Rule"]:
+        """Rules applying to files in a directory, in priority order."""
+        return self._directory(directory.absolute()).rules
+
+    def _directory(self, path: Path) -> "_Directory":
+        try:
+            return self._directories[path]
+        except KeyError:
+            pass
+        if path.parent == path:
+            node = self._roots.get(path.anchor)
+            if node is None:
+                node = self._roots[path.anchor] = _Directory(path=path, rules=_load_rules(path))
+        else:
+            node = self._directory(path.parent).child(path.name)
+        self._directories[path] = node
+        return node
+
     @cached_property
-    def local_rules(self) -> List["Rule"]:
-        return Rule.from_tree(self.cwd)
+    def override_rule(self) -> "Rule":
+        return Rule(owner=Path.cwd(), glob="**/*", schema_uri=str(self.schema_override), mode=None)
 
-    @property
-    def remote_rules(self) -> List["Rule"]:
-        if not self.schema_store:
-            return []
-        return get_schema_store_rules()
+
+@dataclass
+class _Directory:
+    """Node in the directory trie of rules."""
+
+    path: Path
+    rules: List["Rule"]
+    children: Dict[str, "_Directory"] = field(default_factory=dict)
+
+    def child(self, name: str) -> "_Directory":
+        node = self.children.get(name)
+        if node is None:
+            path = self.path / name
+            own_rules = _load_rules(path)
+            node = self.children[name] = _Directory(
+                path=path, rules=own_rules + self.rules if own_rules else self.rules
+            )
+        return node
+
+
+def _load_rules(directory: Path) -> List["Rule"]:
+    config_filepath = directory / constants.CONFIG_FILENAME
+    if config_filepath.is_file():
+        return Rule.from_file(config_filepath)
+    return []
 
 
 @dataclass
@@ -51,7 +123,7 @@ class Rule:
     owner: Path
     glob: str
     schema_uri: str
-    mode: Optional[Literal["json", "yaml"]] = None
+    mode: Optional[Mode] = None
 
     @property
     def schema(self):
@@ -60,6 +132,14 @@ class Rule:
     def match(self, path: Path) -> bool:
         return utils.path_match(path, self.glob)
 
+    def may_match_in(self, directory: Path) -> bool:
+        """Whether the rule could match a file directly in an absolute directory."""
+        literal = utils.literal_directory(self.glob)
+        if literal is None:
+            return True
+        prefix = Path(literal)
+        return directory == prefix or prefix in directory.parents
+
     @cached_property
     def resolved_schema_uri(self) -> str:
         url = urlparse(self.schema_uri)
@@ -67,18 +147,6 @@ class Rule:
             return (self.owner / self.schema_uri).as_uri()
         return self.schema_uri
 
-    @classmethod
-    @lru_cache(maxsize=None)
-    def from_tree(cls, root: Path) -> List["Rule"]:
-        root = root.absolute()
-        config_filepath = root / constants.CONFIG_FILENAME
-        result = []
-        if config_filepath.exists() and config_filepath.is_file():
-            result += cls.from_file(config_filepath)
-        if root.parent == root:
-            return result
-        return result + cls.from_tree(root.parent)
-
     @classmethod
     def from_file(cls, owner: Path) -> List["Rule"]:
         return list(filter(None, (cls.from_line(owner, line) for line in reversed(owner.read_text().splitlines()))))
@@ -96,21 +164,82 @@ class Rule:
         return None
 
 
-@lru_cache(maxsize=1)
-def get_schema_store_rules():
-    catalog = schema_store_catalog()
-    return [
-        Rule(
-            owner=Path("/"),
-            glob=glob,
-            schema_uri=rule["url"],
+SCHEMA_STORE_CATALOG_URL = "https://www.schemastore.org/api/json/catalog.json"
+
+# Bump when the layout of SchemaStoreIndex snapshots changes, so that old snapshots are ignored.
+_SNAPSHOT_VERSION = 1
+
+
+@dataclass
+class SchemaStoreIndex:
+    """Schema Store catalog, flattened to one entry per glob and indexed for matching.
+
+    Rules are only built for globs which match a path. The (glob, url) entries are
+    snapshotted as JSON to the on-disk cache keyed by the catalog's content hash, so an
+    unchanged catalog is never parsed again, only the cheap matcher rebuilt.
+    """
+
+    urls: List[str]
+    matcher: utils.PathMatcher
+    _rules: Dict[int, "Rule"] = field(default_factory=dict)
+
+    @classmethod
+    def from_catalog(cls, catalog: dict) -> "SchemaStoreIndex":
+        return cls.from_entries(
+            [(glob, rule["url"]) for rule in catalog["schemas"] for glob in (rule.get("fileMatch") or [])]
         )
-        for rule in catalog["schemas"]
-        for glob in (rule.get("fileMatch") or [])
-    ]
 
+    @classmethod
+    def from_entries(cls, entries: List[Tuple[str, str]]) -> "SchemaStoreIndex":
+        return cls(urls=[url for _, url in entries], matcher=utils.PathMatcher([glob for glob, _ in entries]))
+
+    @classmethod
+    def load(cls, content: bytes, directory: Optional[Path] = None) -> "SchemaStoreIndex":
+        """Load the index of a catalog, from a snapshot in directory where possible."""
+        if directory is None:
+            return cls.from_catalog(json.loads(content))
+        digest = hashlib.sha256(content).hexdigest()
+        path = directory / f"{digest}-{_SNAPSHOT_VERSION}.json"
+        try:
+            entries = json.loads(path.read_text())
+        except (OSError, ValueError):  # Missing or corrupt
+            pass
+        else:
+            if isinstance(entries, list) and all(
+                isinstance(entry, list) and len(entry) == 2 and all(isinstance(part, str) for part in entry)
+                for entry in entries
+            ):
+                return cls.from_entries([(glob, url) for glob, url in entries])
+        index = cls.from_catalog(json.loads(content))
+        write_atomic(path, json.dumps(list(zip(index.matcher.globs, index.urls))).encode("utf-8"))
+        for stale in directory.glob("*.json"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+        return index
 
-@lru_cache(maxsize=1)
-def schema_store_catalog() -> dict:
-    with urlopen("https://www.schemastore.org/api/json/catalog.json") as conn:
-        return json.load(conn)
+    def rule_for(self, path: Path) -> Optional["Rule"]:
+        position = self.matcher.match(path)
+        if position is None:
+            return None
+        rule = self._rules.get(position)
+        if rule is None:
+            rule = self._rules[position] = Rule(
+                owner=Path("/"), glob=self.matcher.globs[position], schema_uri=self.urls[position]
+            )
+        return rule
+
+    def rules(self) -> List["Rule"]:
+        return [
+            Rule(owner=Path("/"), glob=glob, schema_uri=url) for glob, url in zip(self.matcher.globs, self.urls)
+        ]
+
+
+@lru_cache(maxsize=None)
+def schema_store_index(catalog_path: Optional[Path] = None) -> SchemaStoreIndex:
+    """Index of the Schema Store catalog, or of a pinned copy of it at catalog_path."""
+    if catalog_path is not None:
+        content = catalog_path.read_bytes()
+    else:
+        _, content = fetch(SCHEMA_STORE_CATALOG_URL)
+    http_cache = get_http_cache()
+    return SchemaStoreIndex.load(content, http_cache.directory / "schema-store" if http_cache else None)
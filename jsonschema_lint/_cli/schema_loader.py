@@ -1,10 +1,31 @@
-import cgi
 import json
-import mimetypes
 from functools import lru_cache
+from typing import Optional, Tuple
+from urllib.parse import urlparse
 from urllib.request import urlopen
 
 from jsonschema_lint import compat
+from jsonschema_lint._cli.http_cache import DEFAULT_TIMEOUT, HTTPCache, content_type_of
+from jsonschema_lint.ref_registry import REF_REGISTRY
+
+_http_cache: Optional[HTTPCache] = None
+
+
+def configure(http_cache: Optional[HTTPCache]) -> None:
+    """Set the on-disk cache used for remote schemas, or None to always download them.
+
+    Documents referenced with $ref are loaded the same way as schemas, and only once.
+    """
+    global _http_cache
+    _http_cache = http_cache
+    load_schema.cache_clear()
+    REF_REGISTRY.clear()
+    REF_REGISTRY.loader = load_schema
+
+
+def get_http_cache() -> Optional[HTTPCache]:
+    """Return the on-disk cache used for remote schemas, if one is configured."""
+    return _http_cache
 
 
 @lru_cache(maxsize=None)
@@ -15,33 +36,34 @@ def load_schema(url: str) -> dict:
     JSON and YAML. JSON is preferred, and errors from this will be raised
     if neither work.
     """
-    with urlopen(url) as conn:
-        content_type = _get_content_type(conn)
-        content = conn.read()
+    content_type, content = fetch(url)
     if not compat.YAML_ENABLED:
         return json.loads(content)
     import yaml
 
+    from jsonschema_lint.yaml_ast.utils import safe_load
+
     if "json" in content_type:
         return json.loads(content)
     if "yaml" in content_type:
-        return yaml.safe_load(content)
+        return safe_load(content)
     try:
         return json.loads(content)
     except json.JSONDecodeError as exc:
         try:
-            return yaml.safe_load(content)
+            return safe_load(content)
         except yaml.error.YAMLError:
             pass
         raise exc
 
 
-def _get_content_type(conn) -> str:
-    """Pull out mime type from a connection.
+def fetch(url: str) -> Tuple[str, bytes]:
+    """Return the content type and content of a URL.
 
-    Prefer explicit header if available, otherwise guess from url.
+    Remote URLs are read through the configured on-disk cache, if there is one.
     """
-    content_type = mimetypes.guess_type(conn.url)[0] or ""
-    if hasattr(conn, "getheaders"):
-        content_type = dict(conn.getheaders()).get("Content-Type", content_type)
-    return cgi.parse_header(content_type)[0]
+    if _http_cache is not None and urlparse(url).scheme in ("http", "https"):
+        return _http_cache.fetch(url)
+    with urlopen(url, timeout=DEFAULT_TIMEOUT) as conn:
+        header = conn.headers.get("Content-Type") if hasattr(conn, "getheaders") else None
+        return content_type_of(conn.url, header), conn.read()
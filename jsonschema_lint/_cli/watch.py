@@ -0,0 +1,214 @@
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import click
+
+from jsonschema_lint._cli import constants, schema_loader
+from jsonschema_lint._cli.discovery import discover
+from jsonschema_lint._cli.prefetch import iter_references
+from jsonschema_lint._cli.result_cache import schema_fingerprint
+from jsonschema_lint._cli.rule_loader import Rule, RuleStack
+from jsonschema_lint.ref_registry import REF_REGISTRY
+from jsonschema_lint.validator_cache import VALIDATOR_CACHE
+
+LintFunc = Callable[[Rule, Path], List[str]]
+Signature = Optional[Tuple[int, int, int]]
+
+# Seconds between checks for changes.
+DEFAULT_INTERVAL = 0.5
+
+
+class Poller:
+    """Detects changes to a set of paths by comparing their stat signatures.
+
+    Directories are included, since adding or removing an entry changes their
+    modification time.
+    """
+
+    def __init__(self):
+        self._signatures: Dict[Path, Signature] = {}
+
+    def watch(self, paths: Iterable[Path]) -> None:
+        for path in paths:
+            if path not in self._signatures:
+                self._signatures[path] = _signature(path)
+
+    def unwatch(self, path: Path) -> None:
+        self._signatures.pop(path, None)
+
+    def poll(self) -> Set[Path]:
+        """Return the paths which have changed since they were last polled."""
+        changed = set()
+        for path, signature in self._signatures.items():
+            current = _signature(path)
+            if current != signature:
+                self._signatures[path] = current
+                changed.add(path)
+        return changed
+
+
+class WatchSession:
+    """Lints files, then re-lints the files affected by each change.
+
+    An edited instance is re-linted on its own. Editing a .jsonschema-lint file re-lints
+    every instance below it, and editing a local schema re-lints every instance whose schema
+    is or references it. Rules, schemas and validators are otherwise kept between changes.
+    """
+
+    def __init__(self, filter: Tuple[Path, ...], rule_stack: RuleStack, lint_func: LintFunc):
+        self.rule_stack = rule_stack
+        self.lint_func = lint_func
+        self.poller = Poller()
+        self.root = None if filter else Path.cwd()
+        self.instances: Dict[Path, None] = dict.fromkeys(path.absolute() for path in filter)
+        self.outputs: Dict[Path, List[str]] = {}
+        self.rules: Dict[Path, Rule] = {}
+        self.schema_documents: Dict[str, Set[str]] = {}
+        self.directories: Set[Path] = set()
+
+    def run(self, interval: float = DEFAULT_INTERVAL) -> int:
+        """Lint until interrupted, then return the number of errors."""
+        self.start()
+        try:
+            while True:
+                time.sleep(interval)
+                self.update()
+        except KeyboardInterrupt:
+            pass
+        return sum(len(output) for output in self.outputs.values())
+
+    def start(self) -> None:
+        """Find and lint every instance."""
+        if self.root is not None:
+            self._scan()
+        self._lint(list(self.instances))
+
+    def update(self) -> List[Path]:
+        """Re-lint the instances affected by changes since the last update, returning those linted."""
+        return self._lint(self.affected(self.poller.poll()))
+
+    def affected(self, changed: Set[Path]) -> List[Path]:
+        """Update state for changed paths, returning the instances to re-lint."""
+        affected: Set[Path] = set()
+        if self.root is not None and any(path in self.directories or path.name == ".gitignore" for path in changed):
+            affected.update(self._scan())
+        for path in changed:
+            if path.name == constants.CONFIG_FILENAME:
+                self.rule_stack.invalidate(path.parent)
+                affected.update(instance for instance in self.instances if path.parent in instance.parents)
+            if path in self.instances:
+                affected.add(path)
+        changed_documents = {
+            document
+            for documents in self.schema_documents.values()
+            for document in documents
+            if document.startswith("file:") and _local_path(document) in changed
+        }
+        changed_schemas = [uri for uri, documents in self.schema_documents.items() if documents & changed_documents]
+        if changed_schemas:
+            schema_loader.load_schema.cache_clear()
+            schema_fingerprint.cache_clear()
+            for uri in changed_documents:
+                REF_REGISTRY.discard(uri)
+            for uri in changed_schemas:
+                VALIDATOR_CACHE.discard(uri)
+                del self.schema_documents[uri]
+            affected.update(path for path, rule in self.rules.items() if rule.resolved_schema_uri in changed_schemas)
+        return [instance for instance in self.instances if instance in affected]
+
+    def _lint(self, paths: List[Path]) -> List[Path]:
+        if not paths:
+            return []
+        linted = []
+        for path in paths:
+            self.outputs.pop(path, None)
+            if not path.is_file():
+                self.poller.unwatch(path)
+                del self.instances[path]
+                self.rules.pop(path, None)
+                continue
+            rule = self.rule_stack.rule_for(path)
+            self.poller.watch([path, *self._rule_files(path.parent)])
+            if rule is None:
+                self.rules.pop(path, None)
+                continue
+            self.rules[path] = rule
+            self._watch_schema(rule.resolved_schema_uri)
+            try:
+                output = self.lint_func(rule, path)
+            except Exception as exc:  # Such as a schema saved while it is invalid
+                output = [f"{_display_path(path)}:1:1:1:1: Could not lint with {rule.resolved_schema_uri}: {exc}"]
+            self.outputs[path] = output
+            linted.append(path)
+            for line in output:
+                click.echo(line)
+        num_errors = sum(len(output) for output in self.outputs.values())
+        num_files = sum(1 for output in self.outputs.values() if output)
+        click.echo(f"Found {num_errors} errors in {num_files} files. Watching for changes...", err=True)
+        return linted
+
+    def _scan(self) -> List[Path]:
+        """Find instances below the root, returning those not seen before.
+
+        Instances are discovered as in a normal run, and every directory walked is watched
+        along with its .gitignore file. Instances no longer discovered, such as those newly
+        ignored, are forgotten.
+        """
+        assert self.root is not None
+        found = dict.fromkeys(discover(self.root, on_directory=self._watch_directory))
+        for path in [path for path in self.instances if path not in found]:
+            del self.instances[path]
+            self.outputs.pop(path, None)
+            self.rules.pop(path, None)
+            self.poller.unwatch(path)
+        new = [path for path in found if path not in self.instances]
+        self.instances.update(dict.fromkeys(new))
+        return new
+
+    def _watch_directory(self, directory: Path) -> None:
+        self.directories.add(directory)
+        self.poller.watch([directory, directory / ".gitignore"])
+
+    def _rule_files(self, directory: Path) -> List[Path]:
+        return [parent / constants.CONFIG_FILENAME for parent in (directory, *directory.parents)]
+
+    def _watch_schema(self, uri: str) -> None:
+        """Watch the local files making up a schema, including those it references."""
+        if uri in self.schema_documents:
+            return
+        documents = self.schema_documents[uri] = {uri}
+        stack = [uri]
+        while stack:
+            document_uri = stack.pop()
+            try:
+                document = schema_loader.load_schema(document_uri)
+            except Exception:
+                continue
+            for reference in iter_references(document, document_uri):
+                if reference not in documents:
+                    documents.add(reference)
+                    stack.append(reference)
+        self.poller.watch(_local_path(document_uri) for document_uri in documents if document_uri.startswith("file:"))
+
+
+def _display_path(path: Path) -> Path:
+    try:
+        return path.relative_to(Path.cwd())
+    except ValueError:
+        return path
+
+
+def _local_path(uri: str) -> Path:
+    return Path(os.path.normpath(url2pathname(urlparse(uri).path)))
+
+
+def _signature(path: Path) -> Signature:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
@@ -1,5 +1,5 @@
 from jsonschema_lint.json_ast.errors import JSONASTError
 from jsonschema_lint.json_ast.nodes import Node
-from jsonschema_lint.json_ast.parser import parse
+from jsonschema_lint.json_ast.parser import parse, parse_with_instance
 
-__all__ = ["JSONASTError", "Node", "parse"]
+__all__ = ["JSONASTError", "Node", "parse", "parse_with_instance"]
@@ -1,13 +1,13 @@
 from typing import TYPE_CHECKING, List, Union
 
-from jsonschema_lint.json_ast.location import Location, Position
+from jsonschema_lint.json_ast.location import Document, Location, Position
 
 if TYPE_CHECKING:
     from jsonschema_lint.json_ast.tokenizer import Token, TokenType  # pragma: no cover
 
 
 class JSONASTError(Exception):
-    def __init__(self, message: str, document: str, location: Union[Position, Location]):
+    def __init__(self, message: str, document: Document, location: Union[Position, Location]):
         super().__init__(message)
         self.message = message
         self.document = document
@@ -16,15 +16,15 @@ class JSONASTError(Exception):
         self.location = location
 
     @classmethod
-    def unexpected_symbol(cls, document: str, position: Position):
+    def unexpected_symbol(cls, document: str, symbol: str, position: Position):
         return cls(
-            f"Unexpected symbol {document[position.index]!r} at line {position.line}, column {position.column}",
+            f"Unexpected symbol {symbol!r} at line {position.line}, column {position.column}",
             document,
             position,
         )
 
     @classmethod
-    def unexpected_token(cls, document: str, token: "Token", expected: List[Union["TokenType", str]]):
+    def unexpected_token(cls, document: Document, token: "Token", expected: List[Union["TokenType", str]]):
         expected_names = [token_type if isinstance(token_type, str) else token_type.name for token_type in expected]
         start = token.location.start
         message = (
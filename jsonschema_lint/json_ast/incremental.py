@@ -0,0 +1,196 @@
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+from jsonschema_lint.json_ast.errors import JSONASTError
+from jsonschema_lint.json_ast.location import LineIndex, Position
+from jsonschema_lint.json_ast.nodes import Array, Node, Object, Property
+from jsonschema_lint.json_ast.parser import parse_with_instance
+
+# Number of edits applied in place before a document is parsed again from scratch, which
+# bounds the chain of revisions offsets are mapped through.
+MAX_REVISIONS = 100
+
+
+class _Revision(LineIndex):
+    """Line index for a revision of a document.
+
+    Nodes keep the line index they were parsed with, so those outside an edit are kept as
+    they are. Once a revision is superseded, offsets in it are shifted past the edits made
+    since, and resolved in the latest revision.
+    """
+
+    def __init__(self, document: str, line_starts: Optional[List[int]] = None):
+        super().__init__(document)
+        self._line_starts = line_starts
+        self._edit: Optional[Tuple[int, int, "_Revision"]] = None
+
+    def supersede(self, end: int, delta: int, revision: "_Revision") -> None:
+        """Record an edit, ending at end and changing the length by delta, which made revision."""
+        self._edit = (end, delta, revision)
+        # Only the text of the latest revision is needed
+        self.document = ""
+        self._line_starts = None
+
+    def latest(self, index: int) -> Tuple["_Revision", int]:
+        """Return the latest revision, and the offset in it of an offset in this revision."""
+        revision = self
+        while revision._edit is not None:
+            end, delta, revision = revision._edit
+            if index >= end:
+                index += delta
+        return revision, index
+
+    def position(self, index: int) -> Position:
+        revision, index = self.latest(index)
+        return LineIndex.position(revision, index)
+
+    def text(self, start: int, end: int) -> str:
+        revision, start = self.latest(start)
+        document = revision.document
+        assert isinstance(document, str)
+        return document[start : self.latest(end)[1]]
+
+
+class _Slice(LineIndex):
+    """Line index for a value parsed from a slice of a revision, starting at offset."""
+
+    def __init__(self, document: str, revision: _Revision, offset: int):
+        super().__init__(document)
+        self.revision = revision
+        self.offset = offset
+
+    def latest(self, index: int) -> Tuple[_Revision, int]:
+        return self.revision.latest(index + self.offset)
+
+    def position(self, index: int) -> Position:
+        return self.revision.position(index + self.offset)
+
+
+class IncrementalDocument:
+    """A JSON document parsed to an AST and instance, which are updated in place as it's edited.
+
+    Where an edit is within one value of the top-level array or object, only that value
+    is parsed again, and spliced into the AST and instance.
+    """
+
+    def __init__(self, text: str, line_starts: Optional[List[int]] = None):
+        self.text = text
+        self._revision = _Revision(text, line_starts)
+        self.ast, self.instance = parse_with_instance(text, lines=self._revision)
+        self.revisions = 1
+
+    def update(self, text: str, line_starts: Optional[List[int]] = None) -> bool:
+        """Update the AST and instance for the text after an edit.
+
+        Return False if the edit isn't within a top-level value, or the value is no longer
+        valid on its own, in which case the document must be parsed again.
+        """
+        if text == self.text:
+            return True
+        if self.revisions >= MAX_REVISIONS:
+            return False
+        start = _common_prefix(self.text, text)
+        end = len(self.text) - _common_suffix(self.text, text, limit=min(len(self.text), len(text)) - start)
+        found = self._find_value(start, end)
+        if found is None:
+            return False
+        parent, key, node = found
+        value_start = _latest(node, node.start)
+        value_end = _latest(node, node.end) + len(text) - len(self.text)
+        revision = _Revision(text, line_starts)
+        value = text[value_start:value_end]
+        try:
+            new_node, new_instance = parse_with_instance(value, lines=_Slice(value, revision, value_start))
+        except JSONASTError:
+            return False
+
+        self._revision.supersede(end, len(text) - len(self.text), revision)
+        self._revision = revision
+        self.text = text
+        self.revisions += 1
+        if isinstance(parent, Property):
+            # Properties end with the first token of their value
+            first_token_end = new_node.start + 1 if isinstance(new_node, (Array, Object)) else new_node.end
+            parent.start, parent.end = _latest(parent, parent.start), value_start + first_token_end
+            parent.lines = revision
+            parent.value = new_node
+        else:
+            parent.children[key] = new_node
+        self.instance[key] = new_instance
+        return True
+
+    def _find_value(self, start: int, end: int) -> Optional[Tuple[Union[Array, Property], Any, Node]]:
+        """Find the top-level value spanning the offsets between start and end.
+
+        Return the array or property it's the value of, its index or key in the instance,
+        and its node.
+        """
+        ast = self.ast
+        children: Sequence[Node]
+        if isinstance(ast, Array) and isinstance(self.instance, list):
+            children = ast.children
+        elif isinstance(ast, Object) and isinstance(self.instance, dict):
+            children = ast.children
+        else:
+            return None
+        low, high = 0, len(children)
+        while low < high:
+            middle = (low + high) // 2
+            node = children[middle]
+            if isinstance(node, Property):
+                node = node.value
+            if _latest(node, node.end) < start:
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(children):
+            return None
+        child = children[low]
+        found: Tuple[Union[Array, Property], Any, Node]
+        if isinstance(child, Property):
+            key = child.identifier.value
+            # The instance has the value of the last of duplicated keys
+            if sum(prop.identifier.value == key for prop in children if isinstance(prop, Property)) > 1:
+                return None
+            found = (child, key, child.value)
+        else:
+            assert isinstance(ast, Array)
+            found = (ast, low, child)
+        node = found[2]
+        if _latest(node, node.start) <= start and end <= _latest(node, node.end):
+            return found
+        return None
+
+
+def _latest(node: Node, index: int) -> int:
+    """Return the offset in the latest revision of an offset in a node."""
+    lines = node.lines
+    assert isinstance(lines, (_Revision, _Slice))
+    return lines.latest(index)[1]
+
+
+def _common_prefix(a: str, b: str) -> int:
+    """Return the length of the common prefix of two strings.
+
+    The prefix is found by bisection, so strings are compared in slices rather than
+    character by character.
+    """
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[low:middle] == b[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _common_suffix(a: str, b: str, limit: int) -> int:
+    """Return the length of the common suffix of two strings, up to limit."""
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[len(a) - middle : len(a) - low] == b[len(b) - middle : len(b) - low]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
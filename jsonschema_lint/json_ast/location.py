@@ -1,4 +1,19 @@
+import mmap
+import re
+from bisect import bisect_right
 from dataclasses import dataclass
+from typing import List, Optional, Pattern, Union
+
+NEWLINE = re.compile(r"\r\n|\r|\n")
+NEWLINE_BYTES = re.compile(rb"\r\n|\r|\n")
+
+# A document as UTF-8 encoded bytes, such as a memory-mapped file
+EncodedDocument = Union[bytes, mmap.mmap]
+# A document as text, or encoded
+Document = Union[str, EncodedDocument]
+
+# Bytes of a memory-mapped document to scan between releasing the pages already scanned.
+RELEASE_INTERVAL = 16 * 1024 * 1024
 
 
 @dataclass
@@ -17,3 +32,105 @@ class Position:
 class Location:
     start: Position
     end: Position
+
+
+class LineIndex:
+    """Resolves offsets in a document to line and column positions.
+
+    The table of line start offsets is built on first use, so documents for which no
+    location is ever requested don't pay for it.
+
+    If the document is part of a larger one, such as a record in a stream, origin is the
+    position it starts at, and positions are given in the larger document.
+    """
+
+    def __init__(self, document: Document, newline: Pattern = NEWLINE, origin: Optional[Position] = None):
+        self.document = document
+        self.newline = newline
+        self.origin = origin
+        self._line_starts: Optional[List[int]] = None
+
+    @property
+    def line_starts(self) -> List[int]:
+        if self._line_starts is None:
+            self._line_starts = [0] + [match.end() for match in self.newline.finditer(self.document)]
+        return self._line_starts
+
+    def position(self, index: int) -> Position:
+        line_starts = self.line_starts
+        line = bisect_right(line_starts, index)
+        return self._from_origin(line, index - line_starts[line - 1] + 1, index)
+
+    def location(self, start: int, end: int) -> Location:
+        return Location(start=self.position(start), end=self.position(end))
+
+    def text(self, start: int, end: int) -> str:
+        text = self.document[start:end]
+        assert isinstance(text, str), "Encoded documents are indexed by Utf8LineIndex"
+        return text
+
+    def _from_origin(self, line: int, column: int, index: int) -> Position:
+        origin = self.origin
+        if origin is None:
+            return Position(line=line, column=column, index=index)
+        if line == 1:
+            column += origin.column - 1
+        return Position(line=line + origin.line - 1, column=column, index=index + origin.index)
+
+
+class Utf8LineIndex(LineIndex):
+    """Resolves byte offsets in a UTF-8 encoded document to line and column positions.
+
+    Columns and indexes count characters, as they would in the decoded text. Characters
+    are counted by decoding from the nearest offset already resolved, so positions
+    resolved in document order decode each part of the document once.
+    """
+
+    document: EncodedDocument
+
+    def __init__(
+        self, document: EncodedDocument, newline: Pattern = NEWLINE_BYTES, origin: Optional[Position] = None
+    ):
+        super().__init__(document, newline, origin)
+        self._offsets = [0]
+        self._characters = [0]
+
+    @property
+    def line_starts(self) -> List[int]:
+        if self._line_starts is None:
+            self._line_starts = super().line_starts
+            if isinstance(self.document, mmap.mmap):
+                release_pages(self.document, len(self.document))
+        return self._line_starts
+
+    def position(self, index: int) -> Position:
+        line_starts = self.line_starts
+        line = bisect_right(line_starts, index)
+        character = self.characters(index)
+        return self._from_origin(line, character - self.characters(line_starts[line - 1]) + 1, character)
+
+    def text(self, start: int, end: int) -> str:
+        return str(self.document[start:end], "utf-8")
+
+    def characters(self, offset: int) -> int:
+        """Return the number of characters before a byte offset."""
+        nearest = bisect_right(self._offsets, offset) - 1
+        known = self._offsets[nearest]
+        if known == offset:
+            return self._characters[nearest]
+        characters = self._characters[nearest] + len(str(self.document[known:offset], "utf-8", "replace"))
+        self._offsets.insert(nearest + 1, offset)
+        self._characters.insert(nearest + 1, characters)
+        return characters
+
+
+def release_pages(document: mmap.mmap, end: int) -> None:
+    """Release the pages of a memory-mapped document before an offset from memory.
+
+    Pages are read from the file again if they are accessed later, so this keeps resident
+    memory from growing with the size of the file while it is scanned.
+    """
+    madvise = getattr(document, "madvise", None)
+    dont_need = getattr(mmap, "MADV_DONTNEED", None)
+    if madvise is not None and dont_need is not None:
+        madvise(dont_need, 0, end - end % mmap.PAGESIZE)
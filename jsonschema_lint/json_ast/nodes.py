@@ -1,16 +1,57 @@
-from dataclasses import asdict, dataclass
-from typing import Generic, List, Type, TypeVar, Union
+from dataclasses import asdict
+from typing import Any, ClassVar, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 
-from jsonschema_lint.json_ast.location import Location
+from jsonschema_lint.json_ast.location import LineIndex, Location
+
+PathT = Sequence[Union[str, int]]
+
+_TERMINAL = object()
 
 
-@dataclass
 class Node:
-    location: Location
+    """Base AST node.
+
+    Nodes are slotted and store only offsets into the document, so that large documents
+    can be held in memory cheaply. Locations are resolved on demand.
+    """
+
+    __slots__ = ("start", "end", "lines")
+
+    type: ClassVar[str] = "node"
+    _fields: ClassVar[Tuple[str, ...]] = ()
+
+    def __init__(self, start: int, end: int, lines: LineIndex):
+        self.start = start
+        self.end = end
+        self.lines = lines
+
+    @property
+    def location(self) -> Location:
+        return self.lines.location(self.start, self.end)
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return (self.start, self.end) == (other.start, other.end) and all(
+            getattr(self, name) == getattr(other, name) for name in self._fields
+        )
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in ("start", "end", *self._fields))
+        return f"{type(self).__name__}({fields})"
 
     def dict(self):
         """Return the AST as a dict."""
-        return asdict(self)
+        result = {"location": asdict(self.location)}
+        for name in self._fields:
+            value = getattr(self, name)
+            if isinstance(value, Node):
+                value = value.dict()
+            elif isinstance(value, list):
+                value = [child.dict() for child in value]
+            result[name] = value
+        result["type"] = self.type
+        return result
 
     def resolve(self):
         """Return a dict of the JSON described by the AST."""
@@ -23,30 +64,61 @@ class Node:
         raise TypeError(f"Invalid node type {type(self)} of {self}.")
 
     def get(self, *path: Union[str, int]) -> "Node":
-        if not path:
-            return self
-        if isinstance(self, Object):
-            key = path[0]
-            for prop in self.children:
-                if prop.identifier.value == key:
-                    return prop.value.get(*path[1:])
-            raise KeyError(f"No such property {key!r}")
-        if isinstance(self, Array):
-            index = path[0]
-            if not isinstance(index, int):
-                raise TypeError(f"Array indices must be integers, got {index!r}")
-            return self.children[index].get(*path[1:])
+        node = self
+        for key in path:
+            node = node.child(key)
+        return node
+
+    def get_many(self, paths: Sequence[PathT]) -> List["Node"]:
+        """Get the nodes at many paths, in order.
+
+        Paths are merged into a trie, so nodes on common prefixes are only looked up once.
+        """
+        trie: Dict[Any, Any] = {}
+        for position, path in enumerate(paths):
+            branch = trie
+            for key in path:
+                branch = branch.setdefault(key, {})
+            branch.setdefault(_TERMINAL, []).append(position)
+
+        results: List[Node] = [self] * len(paths)
+        stack: List[Tuple[Node, Dict[Any, Any]]] = [(self, trie)]
+        while stack:
+            node, branch = stack.pop()
+            for key, value in branch.items():
+                if key is _TERMINAL:
+                    for position in value:
+                        results[position] = node
+                else:
+                    stack.append((node.child(key), value))
+        return results
+
+    def child(self, key: Union[str, int]) -> "Node":
         raise TypeError(f"Cannot child of {self}")
 
 
 LiteralT = TypeVar("LiteralT", bool, str, int, float, None)
 
 
-@dataclass
 class Literal(Node, Generic[LiteralT]):
-    value: LiteralT
-    raw: str
-    type: str = "literal"
+    __slots__ = ("value", "_raw")
+
+    type: ClassVar[str] = "literal"
+    _fields = ("value", "raw")
+
+    def __init__(self, start: int, end: int, lines: LineIndex, value: LiteralT, raw: Optional[str] = None):
+        self.start = start
+        self.end = end
+        self.lines = lines
+        self.value: LiteralT = value
+        self._raw = raw
+
+    @property
+    def raw(self) -> str:
+        """Source text of the literal, sliced from the document unless given explicitly."""
+        if self._raw is not None:
+            return self._raw
+        return self.lines.text(self.start, self.end)
 
     @staticmethod
     def detect(value: LiteralT) -> Type["Literal[LiteralT]"]:
@@ -63,45 +135,83 @@ class Literal(Node, Generic[LiteralT]):
         raise TypeError(f"Invalid type {type(value)} of {value} for literal JSON value.")
 
 
-@dataclass
 class Boolean(Literal[bool]):
-    type: str = "boolean"
+    __slots__ = ()
+    type: ClassVar[str] = "boolean"
 
 
-@dataclass
 class String(Literal[str]):
-    type: str = "string"
+    __slots__ = ()
+    type: ClassVar[str] = "string"
 
 
-@dataclass
 class Integer(Literal[int]):
-    type: str = "integer"
+    __slots__ = ()
+    type: ClassVar[str] = "integer"
 
 
-@dataclass
 class Number(Literal[float]):
-    type: str = "number"
+    __slots__ = ()
+    type: ClassVar[str] = "number"
 
 
-@dataclass
 class Null(Literal[None]):
-    type: str = "null"
+    __slots__ = ()
+    type: ClassVar[str] = "null"
 
 
-@dataclass
 class Array(Node):
-    children: List[Node]
-    type: str = "array"
+    __slots__ = ("children",)
+
+    type: ClassVar[str] = "array"
+    _fields = ("children",)
+
+    def __init__(self, start: int, end: int, lines: LineIndex, children: List[Node]):
+        self.start = start
+        self.end = end
+        self.lines = lines
+        self.children = children
+
+    def child(self, key: Union[str, int]) -> Node:
+        if not isinstance(key, int):
+            raise TypeError(f"Array indices must be integers, got {key!r}")
+        return self.children[key]
 
 
-@dataclass
 class Property(Node):
-    identifier: Literal
-    value: Node
-    type: str = "property"
+    __slots__ = ("identifier", "value")
+
+    type: ClassVar[str] = "property"
+    _fields = ("identifier", "value")
+
+    def __init__(self, start: int, end: int, lines: LineIndex, identifier: Literal, value: Node):
+        self.start = start
+        self.end = end
+        self.lines = lines
+        self.identifier = identifier
+        self.value = value
 
 
-@dataclass
 class Object(Node):
-    children: List[Property]
-    type: str = "object"
+    __slots__ = ("children", "_index")
+
+    type: ClassVar[str] = "object"
+    _fields = ("children",)
+
+    def __init__(self, start: int, end: int, lines: LineIndex, children: List[Property]):
+        self.start = start
+        self.end = end
+        self.lines = lines
+        self.children = children
+        self._index: Optional[Dict[Any, Property]] = None
+
+    def child(self, key: Union[str, int]) -> Node:
+        if self._index is None:
+            # Built on first lookup. Where keys are duplicated, the first property wins.
+            self._index = {}
+            for prop in self.children:
+                self._index.setdefault(prop.identifier.value, prop)
+        try:
+            return self._index[key].value
+        except KeyError:
+            raise KeyError(f"No such property {key!r}") from None
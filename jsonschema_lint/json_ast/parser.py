@@ -1,12 +1,12 @@
 import json
-from dataclasses import dataclass
+import sys
 from enum import Enum
-from typing import Generic, List, Optional, TypeVar
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 from jsonschema_lint.json_ast.errors import JSONASTError
-from jsonschema_lint.json_ast.location import Location, Position
+from jsonschema_lint.json_ast.location import Document, LineIndex, Location, Position, Utf8LineIndex
 from jsonschema_lint.json_ast.nodes import Array, Literal, Node, Object, Property, String
-from jsonschema_lint.json_ast.tokenizer import Token, TokenType, tokenize
+from jsonschema_lint.json_ast.tokenizer import Token, TokenType, tokenize_iter
 
 
 class ObjectState(Enum):
@@ -29,241 +29,252 @@ class ArrayState(Enum):
     COMMA = 3
 
 
-NodeT = TypeVar("NodeT", bound=Node)
+_VALUE_TOKENS: List[Union[TokenType, str]] = [
+    TokenType.LEFT_BRACE,
+    TokenType.LEFT_BRACKET,
+    TokenType.STRING,
+    TokenType.NUMBER,
+    TokenType.TRUE,
+    TokenType.FALSE,
+    TokenType.NULL,
+]
+_LITERAL_TOKENS = frozenset(
+    [
+        TokenType.STRING,
+        TokenType.NUMBER,
+        TokenType.TRUE,
+        TokenType.FALSE,
+        TokenType.NULL,
+    ]
+)
 
 
-@dataclass
-class ParseResult(Generic[NodeT]):
-    node: NodeT
-    index: int
+class _ArrayFrame:
+    __slots__ = ("state", "start", "children", "values")
 
+    def __init__(self, start: Token):
+        self.state = ArrayState.OPEN_ARRAY
+        self.start = start
+        self.children: List[Node] = []
+        self.values: List[Any] = []
 
-def parse(document: str) -> Node:
-    tokens = tokenize(document)
-    if not tokens:
-        raise JSONASTError("Input is empty", document, Position(line=1, column=1, index=0))
 
-    result = parse_value(document, tokens)
+class _ObjectFrame:
+    __slots__ = ("state", "start", "children", "values")
 
-    if result.index == len(tokens):
-        return result.node
+    def __init__(self, start: Token):
+        self.state = ObjectState.OPEN_OBJECT
+        self.start = start
+        self.children: List[Property] = []
+        self.values: Dict[str, Any] = {}
 
-    raise JSONASTError.unexpected_token(document=document, token=tokens[result.index], expected=["EOF"])
 
+class _PropertyFrame:
+    __slots__ = ("state", "start", "identifier", "value_start")
 
-def parse_value(document: str, tokens: List[Token], index: int = 0) -> ParseResult:
-    result = (
-        parse_literal(document, tokens, index)
-        or parse_object(document, tokens, index)
-        or parse_array(document, tokens, index)
-    )
-    if not result:
-        raise JSONASTError.unexpected_token(
-            document=document,
-            token=tokens[index],
-            expected=[
-                TokenType.LEFT_BRACE,
-                TokenType.LEFT_BRACKET,
-                TokenType.STRING,
-                TokenType.NUMBER,
-                TokenType.TRUE,
-                TokenType.FALSE,
-                TokenType.NULL,
-            ],
-        )
-    return result
-
-
-def parse_literal(document: str, tokens: List[Token], index: int = 0) -> Optional[ParseResult[Literal]]:
-    token = tokens[index]
-
-    if token.type not in (
-        TokenType.STRING,
-        TokenType.NUMBER,
-        TokenType.TRUE,
-        TokenType.FALSE,
-        TokenType.NULL,
-    ):
-        return None
-
-    value = json.loads(token.value)
-    return ParseResult(
-        node=Literal.detect(value)(
-            location=token.location,
-            value=json.loads(token.value),
-            raw=token.value,
-        ),
-        index=index + 1,
-    )
+    def __init__(self, start: Token, identifier: String):
+        self.state = PropertyState.KEY
+        self.start = start
+        self.identifier = identifier
+        self.value_start: Optional[Token] = None
 
 
-def parse_array(document: str, tokens: List[Token], index: int = 0) -> Optional[ParseResult[Array]]:
-    state = ArrayState.START
-
-    start_token = tokens[index]
-    children: List[Node] = []
-
-    while index < len(tokens):
-        token = tokens[index]
-
-        if state is ArrayState.START:
-            if token.type is not TokenType.LEFT_BRACKET:
-                return None
-            state = ArrayState.OPEN_ARRAY
-            index += 1
-        elif state is ArrayState.OPEN_ARRAY:
-            if token.type is TokenType.RIGHT_BRACKET:
-                return ParseResult(
-                    node=Array(
-                        location=Location(start=start_token.location.start, end=token.location.end),
-                        children=children,
-                    ),
-                    index=index + 1,
-                )
-            else:
-                result = parse_value(document, tokens, index)
-                children.append(result.node)
-                index = result.index
-                state = ArrayState.VALUE
-        elif state is ArrayState.VALUE:
-            if token.type is TokenType.RIGHT_BRACKET:
-                return ParseResult(
-                    node=Array(
-                        location=Location(start=start_token.location.start, end=token.location.end),
-                        children=children,
-                    ),
-                    index=index + 1,
-                )
-            elif token.type is TokenType.COMMA:
-                state = ArrayState.COMMA
-                index += 1
-            else:
-                raise JSONASTError.unexpected_token(
-                    document=document,
-                    token=token,
-                    expected=[TokenType.COMMA, TokenType.RIGHT_BRACKET],
-                )
-        elif state is ArrayState.COMMA:
-            result = parse_value(document, tokens, index)
-            children.append(result.node)
-            index = result.index
-            state = ArrayState.VALUE
+_Frame = Union[_ArrayFrame, _ObjectFrame, _PropertyFrame]
 
-    start = start_token.location.start
-    raise JSONASTError(
-        f"Unclosed array at line {start.line}, column {start.column}",
-        document=document,
-        location=Location(start=start, end=tokens[-1].location.end),
-    )
+_CONSTANTS = {TokenType.TRUE: True, TokenType.FALSE: False, TokenType.NULL: None}
 
 
-def parse_object(document: str, tokens: List[Token], index: int = 0) -> Optional[ParseResult[Object]]:
-    state = ObjectState.START
-
-    start_token = tokens[index]
-    children: List[Property] = []
-
-    while index < len(tokens):
-        token = tokens[index]
-
-        if state is ObjectState.START:
-            if token.type is not TokenType.LEFT_BRACE:
-                return None
-            state = ObjectState.OPEN_OBJECT
-            index += 1
-        elif state is ObjectState.OPEN_OBJECT:
-            if token.type is TokenType.RIGHT_BRACE:
-                return ParseResult(
-                    node=Object(
-                        location=Location(start=start_token.location.start, end=token.location.end),
-                        children=children,
-                    ),
-                    index=index + 1,
-                )
-            else:
-                result = parse_property(document, tokens, index)
-                children.append(result.node)
-                index = result.index
-                state = ObjectState.PROPERTY
-        elif state is ObjectState.PROPERTY:
-            if token.type is TokenType.RIGHT_BRACE:
-                return ParseResult(
-                    node=Object(
-                        location=Location(start=start_token.location.start, end=token.location.end),
-                        children=children,
-                    ),
-                    index=index + 1,
-                )
-            elif token.type is TokenType.COMMA:
-                state = ObjectState.COMMA
-                index += 1
-            else:
-                raise JSONASTError.unexpected_token(
-                    document=document,
-                    token=token,
-                    expected=[TokenType.COMMA, TokenType.RIGHT_BRACE],
-                )
-        elif state is ObjectState.COMMA:
-            result = parse_property(document, tokens, index)
-            children.append(result.node)
-            index = result.index
-            state = ObjectState.PROPERTY
+def parse(document: Document) -> Node:
+    return parse_with_instance(document)[0]
 
-    start = start_token.location.start
-    raise JSONASTError(
-        f"Unclosed object at line {start.line}, column {start.column}",
-        document=document,
-        location=Location(start=start, end=tokens[-1].location.end),
-    )
 
+def parse_with_instance(
+    document: Document, origin: Optional[Position] = None, lines: Optional[LineIndex] = None
+) -> Tuple[Node, Any]:
+    """Parse a JSON document to an AST, and the instance it describes.
+
+    Both are built in a single pass, so the document need not be decoded again.
+
+    Parsing is driven by an explicit stack of open arrays, objects and properties rather
+    than by recursion, so nesting depth is not limited by the interpreter stack. Tokens
+    are consumed lazily, so memory use scales with nesting depth and AST size rather
+    than with the number of tokens.
 
-def parse_property(document: str, tokens: List[Token], index: int = 0) -> ParseResult[Property]:
-    state = PropertyState.START
+    The document may be UTF-8 encoded bytes or a memory-mapped file, which are parsed
+    without decoding the whole document. Invalid documents are parsed again as text, so
+    errors are the same as for the decoded text.
 
-    start_token = tokens[index]
+    If the document is part of a larger one, origin is the position it starts at, and
+    locations are given in the larger document. Alternatively, for a text document, lines
+    may be given to resolve locations with.
+    """
+    if not isinstance(document, str):
+        utf8_lines = Utf8LineIndex(document, origin=origin)
+        try:
+            return _parse_tokens(document, tokenize_iter(document, utf8_lines), utf8_lines)
+        except (JSONASTError, UnicodeDecodeError):
+            document = str(document, "utf-8")
+    lines = lines or LineIndex(document, origin=origin)
+    return _parse_tokens(document, tokenize_iter(document, lines), lines)
 
-    identifier: String
 
-    while index < len(tokens):
-        token = tokens[index]
+def _parse_tokens(document: Document, tokens: Iterable[Token], lines: LineIndex) -> Tuple[Node, Any]:
+    stack: List[_Frame] = []
+    result: Optional[Tuple[Node, Any]] = None
+    token: Optional[Token] = None
 
-        if state is PropertyState.START:
-            if token.type is not TokenType.STRING:
-                raise JSONASTError.unexpected_token(
-                    document=document,
-                    token=token,
-                    expected=[TokenType.STRING],
+    for token in tokens:
+        if result is not None:
+            raise JSONASTError.unexpected_token(document=document, token=token, expected=["EOF"])
+
+        frame = stack[-1] if stack else None
+        kind = token.type
+        node: Optional[Node] = None
+        value: Any = None
+
+        if type(frame) is _ArrayFrame:
+            if kind is TokenType.RIGHT_BRACKET and frame.state is not ArrayState.COMMA:
+                stack.pop()
+                node = Array(
+                    start=frame.start.offset,
+                    end=token.end,
+                    lines=lines,
+                    children=frame.children,
                 )
-            identifier = String(
-                location=token.location,
-                value=json.loads(token.value),
-                raw=token.value,
-            )
-            state = PropertyState.KEY
-            index += 1
-        elif state is PropertyState.KEY:
-            if token.type is not TokenType.COLON:
-                raise JSONASTError.unexpected_token(
-                    document=document,
-                    token=token,
-                    expected=[TokenType.COLON],
+                value = frame.values
+            elif frame.state is ArrayState.VALUE:
+                if kind is not TokenType.COMMA:
+                    raise JSONASTError.unexpected_token(
+                        document=document,
+                        token=token,
+                        expected=[TokenType.COMMA, TokenType.RIGHT_BRACKET],
+                    )
+                frame.state = ArrayState.COMMA
+                continue
+        elif type(frame) is _ObjectFrame:
+            if kind is TokenType.RIGHT_BRACE and frame.state is not ObjectState.COMMA:
+                stack.pop()
+                node = Object(
+                    start=frame.start.offset,
+                    end=token.end,
+                    lines=lines,
+                    children=frame.children,
+                )
+                value = frame.values
+            elif frame.state is ObjectState.PROPERTY:
+                if kind is not TokenType.COMMA:
+                    raise JSONASTError.unexpected_token(
+                        document=document,
+                        token=token,
+                        expected=[TokenType.COMMA, TokenType.RIGHT_BRACE],
+                    )
+                frame.state = ObjectState.COMMA
+                continue
+            else:
+                if kind is not TokenType.STRING:
+                    raise JSONASTError.unexpected_token(
+                        document=document,
+                        token=token,
+                        expected=[TokenType.STRING],
+                    )
+                identifier = String(
+                    start=token.offset,
+                    end=token.end,
+                    lines=lines,
+                    value=sys.intern(_decode_literal(token)),
                 )
-            state = PropertyState.COLON
-            index += 1
-        elif state is PropertyState.COLON:
-            result = parse_value(document, tokens, index)
-            return ParseResult(
-                node=Property(
-                    location=Location(start=start_token.location.start, end=token.location.end),
-                    identifier=identifier,
-                    value=result.node,
-                ),
-                index=result.index,
+                stack.append(_PropertyFrame(token, identifier))
+                continue
+        elif type(frame) is _PropertyFrame:
+            if frame.state is PropertyState.KEY:
+                if kind is not TokenType.COLON:
+                    raise JSONASTError.unexpected_token(
+                        document=document,
+                        token=token,
+                        expected=[TokenType.COLON],
+                    )
+                frame.state = PropertyState.COLON
+                continue
+            if frame.value_start is None:
+                frame.value_start = token
+
+        if node is None:
+            # Expecting a value
+            if kind in _LITERAL_TOKENS:
+                value = _decode_literal(token)
+                node = Literal.detect(value)(
+                    start=token.offset,
+                    end=token.end,
+                    lines=lines,
+                    value=value,
+                )
+            elif kind is TokenType.LEFT_BRACKET:
+                stack.append(_ArrayFrame(token))
+                continue
+            elif kind is TokenType.LEFT_BRACE:
+                stack.append(_ObjectFrame(token))
+                continue
+            else:
+                raise JSONASTError.unexpected_token(document=document, token=token, expected=_VALUE_TOKENS)
+
+        # A value is complete, so add it to its parent
+        frame = stack[-1] if stack else None
+        if type(frame) is _PropertyFrame:
+            stack.pop()
+            assert frame.value_start
+            identifier = frame.identifier
+            prop = Property(
+                start=frame.start.offset,
+                end=frame.value_start.end,
+                lines=lines,
+                identifier=identifier,
+                value=node,
             )
-
-    start = start_token.location.start
+            frame = stack[-1]
+            assert type(frame) is _ObjectFrame
+            frame.children.append(prop)
+            frame.values[identifier.value] = value
+            frame.state = ObjectState.PROPERTY
+        elif type(frame) is _ArrayFrame:
+            frame.children.append(node)
+            frame.values.append(value)
+            frame.state = ArrayState.VALUE
+        else:
+            result = (node, value)
+
+    if result is not None:
+        return result
+
+    if token is None:
+        raise JSONASTError("Input is empty", document, lines.position(0))
+
+    frame = stack[-1]
+    start = frame.start.location.start
+    if type(frame) is _PropertyFrame:
+        message = f"Incomplete property at line {start.line}, column {start.column}"
+    elif type(frame) is _ArrayFrame:
+        message = f"Unclosed array at line {start.line}, column {start.column}"
+    else:
+        message = f"Unclosed object at line {start.line}, column {start.column}"
     raise JSONASTError(
-        f"Incomplete property at line {start.line}, column {start.column}",
+        message,
         document=document,
-        location=Location(start=start, end=tokens[-1].location.end),
+        location=Location(start=start, end=token.location.end),
     )
+
+
+def _decode_literal(token: Token) -> Any:
+    """Decode a literal token, avoiding the JSON decoder where the value is trivial."""
+    raw = token.value
+    kind = token.type
+    if type(raw) is bytes:
+        if kind is TokenType.STRING:
+            return json.loads(raw) if b"\\" in raw else raw[1:-1].decode("utf-8")
+        raw = raw.decode("ascii")
+    if kind is TokenType.STRING:
+        return json.loads(raw) if "\\" in raw else raw[1:-1]
+    if kind is TokenType.NUMBER:
+        if "." in raw or "e" in raw or "E" in raw:
+            return float(raw)
+        return int(raw)
+    return _CONSTANTS[kind]
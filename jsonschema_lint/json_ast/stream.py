@@ -0,0 +1,79 @@
+import mmap
+from typing import Iterator, NamedTuple, Tuple
+
+from jsonschema_lint.json_ast.location import (
+    NEWLINE,
+    NEWLINE_BYTES,
+    RELEASE_INTERVAL,
+    Document,
+    Position,
+    release_pages,
+)
+
+RECORD_SEPARATOR = "\x1e"
+
+
+class Record(NamedTuple):
+    """A JSON text in a stream, and the position it starts at in the stream."""
+
+    document: Document
+    origin: Position
+
+
+def iter_records(document: Document) -> Iterator[Record]:
+    """Split a stream of JSON texts into records.
+
+    Streams starting with a record separator are JSON text sequences (RFC 7464), in which
+    each record follows a separator and may span several lines. Otherwise the stream is
+    JSON Lines (NDJSON), with one record per line. Blank records are skipped.
+
+    Records are sliced from the stream one at a time, so memory use doesn't grow with the
+    size of the stream. Pages of a memory-mapped stream are released once scanned.
+    """
+    is_text = isinstance(document, str)
+    newline = "\n" if is_text else b"\n"
+    separator = RECORD_SEPARATOR if is_text else RECORD_SEPARATOR.encode("ascii")
+    is_sequence = document[:1] == separator
+    delimiter = separator if is_sequence else newline
+    size = len(document)
+    release_at = RELEASE_INTERVAL if isinstance(document, mmap.mmap) else size + 1
+
+    # Skip the separator a sequence starts with
+    offset = characters = 1 if is_sequence else 0
+    line, column = 1, offset + 1
+    while offset < size:
+        end = document.find(delimiter, offset)  # type: ignore[arg-type]
+        if end == -1:
+            end = size
+        record = document[offset:end]
+        if record.strip():
+            yield Record(record, Position(line=line, column=column, index=characters))
+        if is_sequence:
+            line, column = _advance(record, line, column)
+        else:
+            line, column = line + 1, 1
+        characters += _characters(record) + 1
+        offset = end + 1
+        if offset >= release_at:
+            release_pages(document, offset)  # type: ignore[arg-type]
+            release_at = offset + RELEASE_INTERVAL
+
+
+def _advance(record: Document, line: int, column: int) -> Tuple[int, int]:
+    """Return the line and column after a record and the separator following it."""
+    last = None
+    for last in (NEWLINE if isinstance(record, str) else NEWLINE_BYTES).finditer(record):  # type: ignore[arg-type]
+        line += 1
+    if last is not None:
+        column = 1 + _characters(record[last.end() :])
+    else:
+        column += _characters(record)
+    return line, column + 1
+
+
+def _characters(text: Document) -> int:
+    if isinstance(text, str):
+        return len(text)
+    # Slices of memory-mapped streams are already bytes, so this doesn't copy
+    data = bytes(text)
+    return len(data) if data.isascii() else len(str(data, "utf-8", "replace"))
@@ -1,11 +1,19 @@
 import json
+import mmap
 import re
-from dataclasses import dataclass
 from enum import Enum
-from typing import Iterator, List, NoReturn
+from typing import Any, Dict, Iterator, List, NamedTuple, NoReturn, Optional, Pattern, Union
 
 from jsonschema_lint.json_ast.errors import JSONASTError
-from jsonschema_lint.json_ast.location import Location, Position
+from jsonschema_lint.json_ast.location import (
+    RELEASE_INTERVAL,
+    Document,
+    LineIndex,
+    Location,
+    Position,
+    Utf8LineIndex,
+    release_pages,
+)
 
 
 class TokenType(Enum):
@@ -30,86 +38,122 @@ class TokenType(Enum):
     INVALID_STRING_UNICODE_ESCAPE = -5
 
 
-@dataclass
-class Token:
+class Token(NamedTuple):
     type: TokenType
-    value: str
-    location: Location
+    value: Union[str, bytes]
+    offset: int
+    lines: LineIndex
+
+    @property
+    def end(self) -> int:
+        return self.offset + len(self.value)
+
+    @property
+    def location(self) -> Location:
+        return self.lines.location(self.offset, self.end)
+
+
+# Groups: 1 whitespace, 2 punctuation, 3 string, 4 number, 5 keyword
+# Strings are matched as runs of characters separated by escapes, so that there is only
+# one way to match each string, and unclosed strings fail without backtracking.
+_PATTERN = (
+    r"([ \t\r\n]+)"
+    r"|([{}\[\]:,])"
+    r'|("[^"\\\0-\x1F\x7F]*(?:\\(?:["\\/bfnrt]|u[a-fA-F0-9]{4})[^"\\\0-\x1F\x7F]*)*")'
+    r"|(-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)"
+    r"|(true|false|null)"
+)
+_SCANNER: Pattern[Any] = re.compile(_PATTERN)
+# The same pattern for UTF-8 encoded documents. Bytes of multi-byte characters are all
+# above 0x7F, so can only match within strings. Scanners and keywords are typed with Any,
+# as text and encoded documents are tokenized by the same code.
+_BYTES_SCANNER: Pattern[Any] = re.compile(_PATTERN.encode("ascii"))
+_INVALID_STRING = re.compile(r'"[^"\\\0-\x1F\x7F]*(?:\\.[^"\\\0-\x1F\x7F]*)*"')
+
+_KINDS: Dict[Any, TokenType] = {
+    "{": TokenType.LEFT_BRACE,
+    "}": TokenType.RIGHT_BRACE,
+    "[": TokenType.LEFT_BRACKET,
+    "]": TokenType.RIGHT_BRACKET,
+    ":": TokenType.COLON,
+    ",": TokenType.COMMA,
+    "true": TokenType.TRUE,
+    "false": TokenType.FALSE,
+    "null": TokenType.NULL,
+}
+_BYTES_KINDS: Dict[Any, TokenType] = {value.encode("ascii"): kind for value, kind in _KINDS.items()}
+
+
+def tokenize(document: Document, lines: Optional[LineIndex] = None) -> List[Token]:
+    """Tokenize a JSON document."""
+    return list(tokenize_iter(document, lines))
 
 
-def tokenize(document: str) -> List[Token]:
-    """Tokenize a JSON document."""
-    return list(tokenize_iter(document))
+def tokenize_iter(document: Document, lines: Optional[LineIndex] = None) -> Iterator[Token]:
+    """Tokenize a JSON document.
 
+    Tokens are matched by a single precompiled pattern, and dispatched on the group which
+    matched. Runs of whitespace are skipped in bulk. Tokens only record their offset;
+    line and column are resolved from the line index when a location is requested.
 
-def tokenize_iter(document: str) -> Iterator[Token]:
-    """Tokenize a JSON document."""
-    TT = TokenType
-    tokens = {
-        TT.LEFT_BRACE: re.escape("{"),
-        TT.RIGHT_BRACE: re.escape("}"),
-        TT.LEFT_BRACKET: re.escape("["),
-        TT.RIGHT_BRACKET: re.escape("]"),
-        TT.COLON: re.escape(":"),
-        TT.COMMA: re.escape(","),
-        TT.STRING: r'("(\\(["\\\/bfnrt]|u[a-fA-F0-9]{4})|[^"\\\0-\x1F\x7F]+)*")',
-        TT.NUMBER: r"-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?",
-        TT.TRUE: re.escape("true"),
-        TT.FALSE: re.escape("false"),
-        TT.NULL: re.escape("null"),
-        TT.NEWLINE: r"(\r\n|\r|\n)",
-        TT.WHITESPACE: r"[ \t]+",
-        TT.INVALID_STRING: r'("(\\.|[^"\\\0-\x1F\x7F]+)*")',
-        TT.UNCLOSED_STRING: r'("(\\.|[^"\\\0-\x1F\x7F]+)*)',
-        TT.MISMATCH: r".",
-    }
-    token_regex = "|".join(f"(?P<{token_type.name}>{regex})" for token_type, regex in tokens.items())
-
-    position = Position(line=1, column=1, index=0)
-
-    for match in re.finditer(token_regex, document):
-        assert match.lastgroup
-        length = match.end() - match.start()
-
-        kind = TokenType[match.lastgroup]
-        value = match.group()
-        if kind is TT.MISMATCH:
-            raise JSONASTError.unexpected_symbol(
-                document,
-                position,
-            )
-        elif kind is TT.NEWLINE:
-            position.index += length
-            position.column = 1
-            position.line += 1
+    UTF-8 encoded documents, including memory-mapped files, are tokenized without being
+    decoded. Their tokens hold bytes, and offsets are byte offsets.
+    """
+    STRING = TokenType.STRING
+    NUMBER = TokenType.NUMBER
+    new_token = tuple.__new__
+    if isinstance(document, str):
+        scanner, kinds = _SCANNER, _KINDS
+        lines = lines or LineIndex(document)
+    else:
+        scanner, kinds = _BYTES_SCANNER, _BYTES_KINDS
+        lines = lines or Utf8LineIndex(document)
+
+    index = 0
+    release_at = RELEASE_INTERVAL if isinstance(document, mmap.mmap) else len(document) + 1
+
+    for match in scanner.finditer(document):
+        start = match.start()
+        if start != index:
+            break
+        index = match.end()
+        if index >= release_at:
+            release_pages(document, index)  # type: ignore[arg-type]
+            release_at = index + RELEASE_INTERVAL
+        group = match.lastindex
+        if group == 1:
             continue
-        elif kind is TT.WHITESPACE:
-            pass
-        elif kind is TT.UNCLOSED_STRING:
-            raise JSONASTError(
-                f"Unclosed string at line {position.line}, column {position.column}",
-                document,
-                position,
-            )
-        elif kind is TT.INVALID_STRING:
-            _invalid_string(document, position, value)  # Try to get a detailed error
+        value = match.group()
+        if group == 3:
+            kind = STRING
+        elif group == 4:
+            kind = NUMBER
         else:
-            yield Token(
-                type=kind,
-                value=value,
-                location=Location(
-                    start=position,
-                    end=position + length,
-                ),
-            )
-        position += length
+            kind = kinds[value]
+        yield new_token(Token, (kind, value, start, lines))
 
+    if index < len(document):
+        position = lines.position(index)
+        if not isinstance(document, str):
+            raise JSONASTError(f"Invalid JSON at line {position.line}, column {position.column}", document, position)
+        if document[index] == '"':
+            _invalid_string(document, index, position)
+        raise JSONASTError.unexpected_symbol(document, document[index], position)
 
-def _invalid_string(document: str, position: Position, value: str) -> NoReturn:
+
+def _invalid_string(document: str, index: int, position: Position) -> NoReturn:
     """Validate JSON string token.
 
     Used to give more detailed errors regarding strings.
     """
+    match = _INVALID_STRING.match(document, index)
+    if match is None:
+        raise JSONASTError(
+            f"Unclosed string at line {position.line}, column {position.column}",
+            document,
+            position,
+        )
+    value = match.group()
     try:
         json.loads(value)
     except json.JSONDecodeError as exc:
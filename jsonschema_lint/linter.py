@@ -1,29 +1,33 @@
-import json
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import List, Literal, Tuple
+from itertools import islice
+from typing import Any, Deque, Iterable, Iterator, List, Literal, Optional, Tuple
 
 from jsonschema import ValidationError
-from jsonschema.validators import validator_for
 
 from jsonschema_lint.compat import YAML_ENABLED
 from jsonschema_lint.json_ast import nodes
-from jsonschema_lint.json_ast import parse as json_parse
+from jsonschema_lint.json_ast import parse_with_instance as json_parse
 from jsonschema_lint.json_ast.errors import JSONASTError
-from jsonschema_lint.json_ast.location import Location
+from jsonschema_lint.json_ast.location import Document, Location
+from jsonschema_lint.json_ast.stream import Record, iter_records
+from jsonschema_lint.validator_cache import VALIDATOR_CACHE, ValidatorCache
 
 if YAML_ENABLED:
-    from yaml import safe_load as load_yaml
-
     from jsonschema_lint.yaml_ast import YAMLASTError
-    from jsonschema_lint.yaml_ast import parse_all as yaml_parse
+    from jsonschema_lint.yaml_ast import parse_all_with_instance as yaml_parse
 else:
     YAMLASTError = JSONASTError  # type: ignore[assignment, misc]
 
-    def yaml_parse(document: str) -> List[nodes.Node]:
+    def yaml_parse(document: str, max_alias_nodes: int = 1_000_000) -> List[Tuple[nodes.Node, Any]]:
         raise RuntimeError("PyYAML is not installed")
 
-    def load_yaml(*args, **kwargs):  # type: ignore[misc]
-        raise RuntimeError("PyYAML is not installed")
+
+Mode = Literal["json", "yaml", "ndjson"]
+
+# Number of records per task when the records of a stream are linted in parallel.
+RECORDS_PER_BATCH = 1000
 
 
 @dataclass
@@ -32,24 +36,62 @@ class Error:
     message: str
 
 
-def lint(schema: dict, document: str, mode: Literal["json", "yaml"] = None) -> List[Error]:
+def lint(
+    schema: dict,
+    document: Document,
+    mode: Optional[Mode] = None,
+    schema_key: Optional[str] = None,
+    cache: Optional[ValidatorCache] = None,
+    jobs: int = 1,
+) -> List[Error]:
+    """Lint a document against a schema.
+
+    The document may be text, or UTF-8 encoded bytes such as a memory-mapped file.
+    JSON in bytes is parsed without decoding the whole document.
+
+    Validators are shared between calls via the cache, keyed by schema_key if provided
+    (e.g. the schema URI), otherwise by a fingerprint of the schema.
+
+    In ndjson mode, the document is a stream of JSON texts, each of which is an instance
+    (see iter_records). Records are parsed and validated one at a time, and an invalid
+    record doesn't stop the rest of the stream being linted. With jobs > 1, batches of
+    records are linted across a pool of processes.
+    """
+    if mode == "ndjson":
+        return _lint_records(schema, iter_records(document), schema_key, cache, jobs)
     try:
-        mode, asts = _parse_document(document, mode=mode)
+        mode, documents = _parse_document(document, mode=mode)
     except (JSONASTError, YAMLASTError) as exc:
         return [Error(location=exc.location, message=str(exc))]
-    return sum([_get_schema_errors(schema, document, ast, mode) for ast in asts], [])
+    validator = (cache or VALIDATOR_CACHE).get(schema, key=schema_key)
+    return sum([_get_schema_errors(validator, instance, ast) for ast, instance in documents], [])
+
+
+def lint_parsed(
+    schema: dict,
+    ast: nodes.Node,
+    instance: Any,
+    schema_key: Optional[str] = None,
+    cache: Optional[ValidatorCache] = None,
+) -> List[Error]:
+    """Lint an instance already parsed from a document, with its AST, against a schema."""
+    validator = (cache or VALIDATOR_CACHE).get(schema, key=schema_key)
+    return _get_schema_errors(validator, instance, ast)
 
 
 def _parse_document(
-    document: str, mode: Literal["json", "yaml"] = None
-) -> Tuple[Literal["json", "yaml"], List[nodes.Node]]:
-    """Parse a YAML or JSON document to an AST.
+    document: Document, mode: Optional[Literal["json", "yaml"]] = None
+) -> Tuple[Literal["json", "yaml"], List[Tuple[nodes.Node, Any]]]:
+    """Parse a YAML or JSON document to an AST, and the instance it describes.
 
     If mode is specified, use that format.
     Otherwise, try JSON first and fallback to YAML. If neither works, raise the error from
     JSON.
     """
-    parsers = {"json": lambda doc: [json_parse(doc)], "yaml": yaml_parse}
+    parsers = {
+        "json": lambda doc: [json_parse(doc)],
+        "yaml": lambda doc: yaml_parse(doc if isinstance(doc, str) else str(doc, "utf-8")),
+    }
     if mode:
         return mode, parsers[mode](document)
     try:
@@ -63,16 +105,51 @@ def _parse_document(
         raise exc
 
 
-def _get_schema_errors(schema: dict, document: str, ast: nodes.Node, mode: Literal["json", "yaml"]) -> List[Error]:
-    instance = json.loads(document) if mode == "json" else load_yaml(document)
-    validator_cls = validator_for(schema)
-    validator_cls.check_schema(schema)
-    validator = validator_cls(schema)
-    return [_convert_error(ast, exc) for exc in validator.iter_errors(instance)]
+def _lint_records(
+    schema: dict, records: Iterator[Record], schema_key: Optional[str], cache: Optional[ValidatorCache], jobs: int
+) -> List[Error]:
+    if jobs == 1:
+        return _lint_record_batch(schema, schema_key, records, cache)
+    errors: List[Error] = []
+    pending: Deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # Results are collected in order, and only a few batches per worker are in flight
+        # at once, so memory use doesn't grow with the length of the stream.
+        for batch in iter(lambda: list(islice(records, RECORDS_PER_BATCH)), []):
+            pending.append(executor.submit(_lint_record_batch, schema, schema_key, batch))
+            if len(pending) >= 2 * jobs:
+                errors += pending.popleft().result()
+        for future in pending:
+            errors += future.result()
+    return errors
+
+
+def _lint_record_batch(
+    schema: dict, schema_key: Optional[str], records: Iterable[Record], cache: Optional[ValidatorCache] = None
+) -> List[Error]:
+    validator = (cache or VALIDATOR_CACHE).get(schema, key=schema_key)
+    errors: List[Error] = []
+    for record in records:
+        try:
+            ast, instance = json_parse(record.document, record.origin)
+        except JSONASTError as exc:
+            errors.append(Error(location=exc.location, message=str(exc)))
+            continue
+        errors += _get_schema_errors(validator, instance, ast)
+    return errors
+
+
+def _get_schema_errors(validator, instance: Any, ast: nodes.Node) -> List[Error]:
+    try:
+        exceptions = list(validator.iter_errors(instance))
+        error_nodes = ast.get_many([exception.absolute_path for exception in exceptions])
+        return [_convert_error(node, exception) for node, exception in zip(error_nodes, exceptions)]
+    except RecursionError:
+        # jsonschema validates, and formats instances in messages, recursively
+        return [Error(location=ast.location, message="Too deeply nested to validate")]
 
 
-def _convert_error(ast: nodes.Node, exception: ValidationError) -> Error:
-    node = ast.get(*exception.absolute_path)
+def _convert_error(node: nodes.Node, exception: ValidationError) -> Error:
     instance_repr = repr(exception.instance)
     message = exception.message.replace(instance_repr, _truncate(instance_repr, max_length=40))
     return Error(
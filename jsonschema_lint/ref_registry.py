@@ -0,0 +1,68 @@
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urldefrag
+
+from jsonschema import RefResolver
+
+
+class RefRegistry:
+    """Documents and resolved $refs shared by every validator in a run.
+
+    Each referenced document is loaded once, using loader if set and otherwise the
+    default jsonschema behaviour. Resolved references are memoized by absolute URI,
+    so a fragment is only looked up once however many schemas refer to it.
+    """
+
+    def __init__(self, loader: Optional[Callable[[str], Any]] = None):
+        self.loader = loader
+        self.documents: Dict[str, Any] = {}
+        self.resolved: Dict[str, Any] = {}
+
+    def resolver(self, schema: Any, base_uri: str = "") -> RefResolver:
+        """Return a resolver for a schema, retrieved from base_uri, backed by the registry."""
+        return _RegistryRefResolver(base_uri, schema, registry=self)
+
+    def discard(self, uri: str) -> None:
+        """Forget a document and the references resolved within it."""
+        self.documents.pop(uri, None)
+        prefix = f"{uri}#"
+        for key in [key for key in self.resolved if key.startswith(prefix)]:
+            del self.resolved[key]
+
+    def clear(self) -> None:
+        self.documents.clear()
+        self.resolved.clear()
+
+
+class _RegistryRefResolver(RefResolver):
+    def __init__(self, base_uri: str, referrer: Any, registry: RefRegistry, **kwargs):
+        super().__init__(base_uri, referrer, **kwargs)
+        self.registry = registry
+
+    def resolve_from_url(self, url: str) -> Any:
+        document_uri, fragment = urldefrag(url)
+        document_uri = document_uri or self.base_uri
+        if not document_uri:
+            # Anonymous schemas cannot be told apart, so their references are not shared
+            return super().resolve_from_url(url)
+        key = f"{document_uri}#{fragment}"
+        try:
+            return self.registry.resolved[key]
+        except KeyError:
+            pass
+        resolved = self.registry.resolved[key] = super().resolve_from_url(url)
+        return resolved
+
+    def resolve_remote(self, uri: str) -> Any:
+        try:
+            return self.registry.documents[uri]
+        except KeyError:
+            pass
+        if self.registry.loader is None:
+            document = super().resolve_remote(uri)
+        else:
+            document = self.registry.loader(uri)
+        self.registry.documents[uri] = document
+        return document
+
+
+REF_REGISTRY = RefRegistry()
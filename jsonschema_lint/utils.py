@@ -1,5 +1,7 @@
 import re
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, List, Optional, Sequence
 
 
 def path_match(path: Path, glob: str) -> bool:
@@ -9,13 +11,13 @@ def path_match(path: Path, glob: str) -> bool:
     return False
 
 
+@lru_cache(maxsize=None)
 def path_pattern(glob: str, sep: str = "/") -> re.Pattern:
     absolute = glob.startswith(sep)
     if absolute:
         glob = glob[1:]
     else:
-        if not glob.startswith("**/"):
-            glob = f"**/{glob}"
+        glob = _relative_glob(glob, sep)
 
     sep = re.escape(sep)
 
@@ -64,3 +66,69 @@ def path_pattern(glob: str, sep: str = "/") -> re.Pattern:
         result = f"{sep}{result}"
 
     return re.compile("^" + result)
+
+
+def _relative_glob(glob: str, sep: str) -> str:
+    if not glob.startswith(f"**{sep}"):
+        glob = f"**{sep}{glob}"
+    return glob
+
+
+def _literal_suffix(glob: str, sep: str = "/") -> str:
+    """Return the literal text which any path matching the glob must end with."""
+    if not glob.startswith(sep):
+        glob = _relative_glob(glob, sep)
+    head, star, tail = glob.rpartition("*")
+    if star and tail.startswith(sep):
+        # A separator next to a wildcard is optional
+        tail = tail[len(sep) :]
+    return tail
+
+
+def literal_directory(glob: str, sep: str = "/") -> Optional[str]:
+    """Return the directory which any path matching an absolute glob must be within.
+
+    Relative globs can match at any depth, so have no such directory.
+    """
+    if not glob.startswith(sep):
+        return None
+    head, star, _ = glob.partition("*")
+    if star and head.endswith(sep):
+        # A separator next to a wildcard is optional
+        head = head[: -len(sep)]
+    return head.rpartition(sep)[0] or sep
+
+
+class PathMatcher:
+    """Matches paths against many globs at once, with the same semantics as path_match.
+
+    Globs are indexed by the literal suffix which a matching path must end with, such as
+    ".json" for "*.json" or "package.json" for "**/package.json". Looking up a path takes
+    one dict lookup per distinct suffix length, and only the globs whose suffix matches
+    are evaluated as patterns. Patterns are compiled on first use.
+    """
+
+    def __init__(self, globs: Sequence[str]):
+        self.globs = list(globs)
+        self._suffixes: Dict[int, Dict[str, List[int]]] = {}
+        self._unfiltered: List[int] = []
+        for position, glob in enumerate(self.globs):
+            suffix = _literal_suffix(glob)
+            if suffix:
+                self._suffixes.setdefault(len(suffix), {}).setdefault(suffix, []).append(position)
+            else:
+                self._unfiltered.append(position)
+
+    def match(self, path: Path) -> Optional[int]:
+        """Return the position of the first glob matching the path, if any."""
+        text = str(path)
+        candidates = list(self._unfiltered)
+        for length, suffixes in self._suffixes.items():
+            positions = suffixes.get(text[-length:])
+            if positions:
+                candidates.extend(positions)
+        candidates.sort()
+        for position in candidates:
+            if path_pattern(self.globs[position]).match(text):
+                return position
+        return None
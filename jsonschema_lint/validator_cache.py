@@ -0,0 +1,82 @@
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, NamedTuple, Optional
+from urllib.parse import urlparse
+
+from jsonschema.validators import validator_for
+
+from jsonschema_lint.ref_registry import REF_REGISTRY, RefRegistry
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class ValidatorCache:
+    """Cache of compiled validators, keyed by schema URI or fingerprint.
+
+    Schemas are checked against their metaschema once, when first added to the cache.
+    If maxsize is set, the least recently used validators are evicted beyond that size.
+    If registry is set, validators resolve $refs through it, relative to the key when
+    that is a URI.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None, registry: Optional[RefRegistry] = None):
+        self.maxsize = maxsize
+        self.registry = registry
+        self.hits = 0
+        self.misses = 0
+        self._validators: "OrderedDict[str, Any]" = OrderedDict()
+
+    def get(self, schema: dict, key: Optional[str] = None) -> Any:
+        """Return a validator for the schema, building it if necessary.
+
+        If key is not provided, a fingerprint of the schema is used.
+        """
+        if key is None:
+            key = fingerprint(schema)
+        try:
+            validator = self._validators[key]
+        except KeyError:
+            self.misses += 1
+            validator = self._validators[key] = _build_validator(schema, key, self.registry)
+            if self.maxsize is not None and len(self._validators) > self.maxsize:
+                self._validators.popitem(last=False)
+            return validator
+        self.hits += 1
+        self._validators.move_to_end(key)
+        return validator
+
+    def discard(self, key: str) -> None:
+        """Forget the validator for a key, so that it is built again."""
+        self._validators.pop(key, None)
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(hits=self.hits, misses=self.misses, maxsize=self.maxsize, currsize=len(self._validators))
+
+    def clear(self) -> None:
+        self._validators.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def fingerprint(schema: Any) -> str:
+    """Return a stable hash of a schema's content."""
+    content = json.dumps(schema, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _build_validator(schema: dict, key: str, registry: Optional[RefRegistry] = None) -> Any:
+    validator_cls = validator_for(schema)
+    validator_cls.check_schema(schema)
+    if registry is None:
+        return validator_cls(schema)
+    base_uri = validator_cls.ID_OF(schema) or (key if urlparse(key).scheme else "")
+    return validator_cls(schema, resolver=registry.resolver(schema, base_uri=base_uri))
+
+
+VALIDATOR_CACHE = ValidatorCache(maxsize=128, registry=REF_REGISTRY)
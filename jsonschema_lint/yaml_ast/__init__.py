@@ -1,4 +1,4 @@
 from jsonschema_lint.yaml_ast.errors import YAMLASTError
-from jsonschema_lint.yaml_ast.parser import parse, parse_all
+from jsonschema_lint.yaml_ast.parser import parse, parse_all, parse_all_with_instance
 
-__all__ = ["YAMLASTError", "parse", "parse_all"]
+__all__ = ["YAMLASTError", "parse", "parse_all", "parse_all_with_instance"]
@@ -1,19 +1,48 @@
-from typing import List, Tuple
+from typing import Any, Callable, Dict, List, Set, Tuple
 
 import yaml
+from yaml.constructor import SafeConstructor
 
 from jsonschema_lint.json_ast import nodes
-from jsonschema_lint.json_ast.location import Location, Position
+from jsonschema_lint.json_ast.location import LineIndex, Position
 from jsonschema_lint.yaml_ast import utils
 from jsonschema_lint.yaml_ast.errors import YAMLASTError
 
+_MERGE_TAG = "tag:yaml.org,2002:merge"
 
-def parse_all(document: str) -> List[nodes.Node]:
-    return [_convert_pyyaml_node(document, node) for node in _compose(document, many=True) if not node.value == ""]
+# Default limit on the number of nodes aliases may add to a document, were they expanded.
+# Shared nodes are only converted once, but instances are validated as if expanded, so
+# this guards against "billion laughs" documents while allowing heavy use of anchors.
+DEFAULT_MAX_ALIAS_NODES = 1_000_000
 
 
-def parse(document: str) -> nodes.Node:
-    return _convert_pyyaml_node(document, _compose(document))
+def parse_all(document: str, max_alias_nodes: int = DEFAULT_MAX_ALIAS_NODES) -> List[nodes.Node]:
+    converter = _Converter(document, max_alias_nodes)
+    return [converter.convert(node) for node in _compose(document, many=True) if not node.value == ""]
+
+
+def parse_all_with_instance(
+    document: str, max_alias_nodes: int = DEFAULT_MAX_ALIAS_NODES
+) -> List[Tuple[nodes.Node, Any]]:
+    """Parse each document in a YAML stream to an AST, and the instance it describes.
+
+    The stream is composed once, and both are built from the same nodes. Scalars are
+    constructed from the tags the resolver gave them, and instances are constructed as
+    yaml.safe_load would.
+    """
+    converter = _Converter(document, max_alias_nodes)
+    result = []
+    for node in _compose(document, many=True):
+        if node.value == "":
+            continue
+        # Convert first, since constructing the instance flattens merge keys in place
+        ast = converter.convert(node)
+        result.append((ast, _construct(document, converter.constructor.construct_document, node)))
+    return result
+
+
+def parse(document: str, max_alias_nodes: int = DEFAULT_MAX_ALIAS_NODES) -> nodes.Node:
+    return _Converter(document, max_alias_nodes).convert(_compose(document))
 
 
 def _compose(document: str, many: bool = False):
@@ -22,14 +51,10 @@ def _compose(document: str, many: bool = False):
 
     try:
         if many:
-            return [node for node in yaml.compose_all(document)]
-        return yaml.compose(document)
+            return utils.compose_all(document)
+        return utils.compose(document)
     except yaml.error.MarkedYAMLError as exc:
-        message = exc.problem or default_message
-        position = default_position
-        if exc.problem_mark:
-            position = utils.position_from_mark(exc.problem_mark)
-        raise YAMLASTError(message=message.capitalize(), document=document, location=position)
+        raise _marked_error(document, exc, default_message)
     except yaml.error.YAMLError as exc:
         message = str(exc)
         raise YAMLASTError(message=str(exc).capitalize(), document=document, location=default_position)
@@ -37,38 +62,150 @@ def _compose(document: str, many: bool = False):
         raise YAMLASTError(message=default_message, document=document, location=default_position)
 
 
-def _convert_pyyaml_node(document: str, node: yaml.nodes.Node) -> nodes.Node:
-    if not node:
-        raise YAMLASTError(message="Input is empty", document=document, location=Position(line=1, column=1, index=0))
-    if isinstance(node, yaml.nodes.ScalarNode):
-        raw = document[node.start_mark.index : node.end_mark.index]
-        value = yaml.safe_load(raw)
-        return nodes.Literal.detect(value)(
-            location=utils.location_from_marks(start=node.start_mark, end=node.end_mark),
+def _construct(document: str, construct: Callable[[yaml.nodes.Node], Any], node: yaml.nodes.Node) -> Any:
+    try:
+        return construct(node)
+    except yaml.error.MarkedYAMLError as exc:
+        raise _marked_error(document, exc, "Failed to construct YAML value")
+
+
+def _marked_error(document: str, exc: yaml.error.MarkedYAMLError, default_message: str) -> YAMLASTError:
+    message = exc.problem or default_message
+    position = Position(line=1, column=1, index=0)
+    if exc.problem_mark:
+        position = utils.position_from_mark(exc.problem_mark)
+    return YAMLASTError(message=message.capitalize(), document=document, location=position)
+
+
+class _Converter:
+    """Converts composed PyYAML nodes to AST nodes.
+
+    An alias composes to the same node as its anchor, so nodes are converted once and
+    the AST shares them in the same way. The number of nodes aliases would add if
+    expanded is counted, and limited to max_alias_nodes per document.
+    """
+
+    def __init__(self, document: str, max_alias_nodes: int):
+        self.document = document
+        self.max_alias_nodes = max_alias_nodes
+        self.lines = LineIndex(document, newline=utils.NEWLINE)
+        self.constructor = SafeConstructor()
+        self._converted: Dict[yaml.nodes.Node, nodes.Node] = {}
+        self._sizes: Dict[yaml.nodes.Node, int] = {}
+        self._converting: Set[yaml.nodes.Node] = set()
+        self._alias_nodes = 0
+
+    def convert(self, node: yaml.nodes.Node) -> nodes.Node:
+        """Convert the root node of a document."""
+        self._alias_nodes = 0
+        return self._convert_pyyaml_node(node)
+
+    def _convert_pyyaml_node(self, node: yaml.nodes.Node) -> nodes.Node:
+        if not node:
+            raise YAMLASTError(
+                message="Input is empty", document=self.document, location=Position(line=1, column=1, index=0)
+            )
+        converted = self._converted.get(node)
+        if converted is not None:
+            self._alias_nodes += self._sizes[node]
+            if self._alias_nodes > self.max_alias_nodes:
+                raise self._error(node, f"Aliases expand the document by more than {self.max_alias_nodes} nodes")
+            return converted
+        if node in self._converting:
+            raise self._error(node, "Recursive aliases are not supported")
+        if isinstance(node, yaml.nodes.ScalarNode):
+            if node.tag == _MERGE_TAG:
+                value = node.value
+            else:
+                value = _construct(self.document, self.constructor.construct_object, node)
+            result: nodes.Node = nodes.Literal.detect(value)(
+                start=node.start_mark.index,
+                end=node.end_mark.index,
+                lines=self.lines,
+                value=value,
+            )
+            size = 1
+        elif isinstance(node, yaml.nodes.SequenceNode):
+            self._converting.add(node)
+            items = [self._convert_pyyaml_node(item) for item in node.value]
+            self._converting.discard(node)
+            result = nodes.Array(
+                start=node.start_mark.index,
+                end=node.end_mark.index,
+                lines=self.lines,
+                children=items,
+            )
+            size = 1 + sum(self._sizes[item] for item in node.value)
+        elif isinstance(node, yaml.nodes.MappingNode):
+            self._converting.add(node)
+            properties = self._convert_pyyaml_properties(node)
+            self._converting.discard(node)
+            result = nodes.Object(
+                start=node.start_mark.index,
+                end=node.end_mark.index,
+                lines=self.lines,
+                children=properties,
+            )
+            # Merge keys aren't converted, but the mappings they merge are
+            size = 1 + sum(self._sizes.get(key, 0) + self._sizes[value] for key, value in node.value)
+        else:
+            raise RuntimeError(f"Got unexpected node {node}")
+        self._converted[node] = result
+        self._sizes[node] = size
+        return result
+
+    def _convert_pyyaml_properties(self, node: yaml.nodes.MappingNode) -> List[nodes.Property]:
+        """Convert the pairs of a mapping, replacing merge keys with the properties they merge.
+
+        Keys are merged as yaml.safe_load merges them, so the AST has the same properties
+        as the instance. Merged properties share the nodes of the mappings they came from.
+        """
+        properties = []
+        for key, value in node.value:
+            if key.tag == _MERGE_TAG:
+                # Converted first, so that recursive and oversized merges are reported
+                self._convert_pyyaml_node(value)
+            else:
+                properties.append(self._convert_pyyaml_property((key, value)))
+        merged: Dict[Any, nodes.Property] = {}
+        for pair in _merged_pairs(node):
+            prop = self._convert_pyyaml_property(pair)
+            merged[prop.identifier.value] = prop
+        for prop in properties:
+            merged.pop(prop.identifier.value, None)
+        return [*merged.values(), *properties]
+
+    def _convert_pyyaml_property(self, prop: Tuple[yaml.nodes.Node, yaml.nodes.Node]) -> nodes.Property:
+        identifier = self._convert_pyyaml_node(prop[0])
+        assert isinstance(identifier, nodes.Literal)
+        value = self._convert_pyyaml_node(prop[1])
+        return nodes.Property(
+            start=identifier.start,
+            # An aliased value is wherever its anchor is, which may be before the key
+            end=max(value.end, identifier.end),
+            lines=self.lines,
+            identifier=identifier,
             value=value,
-            raw=raw,
         )
-    if isinstance(node, yaml.nodes.SequenceNode):
-        items = [_convert_pyyaml_node(document, item) for item in node.value]
-        return nodes.Array(
-            location=utils.location_from_marks(start=node.start_mark, end=node.end_mark),
-            children=items,
-        )
-    if isinstance(node, yaml.nodes.MappingNode):
-        properties = [_convert_pyyaml_property(document, prop) for prop in node.value]
-        return nodes.Object(
-            location=utils.location_from_marks(start=node.start_mark, end=node.end_mark),
-            children=properties,
-        )
-    raise RuntimeError(f"Got unexpected node {node}")
-
-
-def _convert_pyyaml_property(document: str, prop: Tuple[yaml.nodes.Node, yaml.nodes.Node]) -> nodes.Property:
-    identifier = _convert_pyyaml_node(document, prop[0])
-    assert isinstance(identifier, nodes.Literal)
-    value = _convert_pyyaml_node(document, prop[1])
-    return nodes.Property(
-        location=Location(start=identifier.location.start, end=value.location.end),
-        identifier=identifier,
-        value=value,
-    )
+
+    def _error(self, node: yaml.nodes.Node, message: str) -> YAMLASTError:
+        return YAMLASTError(message=message, document=self.document, location=utils.position_from_mark(node.start_mark))
+
+
+def _merged_pairs(node: yaml.nodes.MappingNode) -> List[Tuple[yaml.nodes.Node, yaml.nodes.Node]]:
+    """Return the pairs the merge keys of a mapping add to it, where later pairs win.
+
+    This follows SafeConstructor.flatten_mapping without modifying the nodes: mappings in
+    a merged sequence win over those after them, and a merged mapping's own merge keys
+    are merged first. Values which aren't mappings fail when the instance is constructed.
+    """
+    merged = []
+    for key, value in node.value:
+        if key.tag != _MERGE_TAG:
+            continue
+        sources = reversed(value.value) if isinstance(value, yaml.nodes.SequenceNode) else [value]
+        for source in sources:
+            if isinstance(source, yaml.nodes.MappingNode):
+                merged.extend(_merged_pairs(source))
+                merged.extend(pair for pair in source.value if pair[0].tag != _MERGE_TAG)
+    return merged
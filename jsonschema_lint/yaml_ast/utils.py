@@ -1,7 +1,45 @@
+import re
+from typing import Any, Callable, List, Optional, Type, TypeVar, Union
+
 import yaml
 
 from jsonschema_lint.json_ast.location import Location, Position
 
+# Line breaks as recognised by PyYAML's reader
+NEWLINE = re.compile("\r\n|[\r\n\x85\u2028\u2029]")
+
+# Loader backed by libyaml, which is around 10x faster, if PyYAML was built with it
+CSafeLoader: Optional[Type[yaml.SafeLoader]] = getattr(yaml, "CSafeLoader", None)
+
+T = TypeVar("T")
+Stream = Union[str, bytes]
+
+
+def compose(stream: Stream) -> Optional[yaml.nodes.Node]:
+    return _with_fallback(lambda loader: yaml.compose(stream, Loader=loader))
+
+
+def compose_all(stream: Stream) -> List[yaml.nodes.Node]:
+    return _with_fallback(lambda loader: list(yaml.compose_all(stream, Loader=loader)))
+
+
+def safe_load(stream: Stream) -> Any:
+    return _with_fallback(lambda loader: yaml.load(stream, Loader=loader))
+
+
+def _with_fallback(func: Callable[[Type[yaml.SafeLoader]], T]) -> T:
+    """Call func with libyaml's loader if available, otherwise with the pure Python loader.
+
+    Streams which libyaml fails on are loaded again by the pure Python loader, so that
+    errors are the same with or without libyaml. Marks from both have the same indexes.
+    """
+    if CSafeLoader is not None:
+        try:
+            return func(CSafeLoader)
+        except Exception:
+            pass
+    return func(yaml.SafeLoader)
+
 
 def position_from_mark(mark: yaml.error.Mark) -> Position:
     return Position(line=mark.line + 1, column=mark.column + 1, index=mark.index)
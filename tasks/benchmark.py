@@ -0,0 +1,16 @@
+import pkgutil
+
+from invoke import task
+
+import benchmarks
+from tasks.helpers import print_header
+
+
+@task()
+def benchmark(ctx):
+    """Run performance benchmarks."""
+    for module in pkgutil.iter_modules(benchmarks.__path__):
+        if module.name == "helpers":
+            continue
+        print_header(f"BENCHMARK: {module.name}", level=2)
+        ctx.run(f"python -m benchmarks.{module.name}", pty=True)
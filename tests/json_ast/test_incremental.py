@@ -0,0 +1,59 @@
+import pytest
+
+from jsonschema_lint.json_ast.incremental import IncrementalDocument
+from jsonschema_lint.json_ast.parser import parse_with_instance
+
+DOCUMENT = '{\n  "a": [1, "é"],\n  "b": {"c": true}\n}\n'
+
+
+def _assert_parsed(document: IncrementalDocument, text: str):
+    ast, instance = parse_with_instance(text)
+    assert document.instance == instance
+    assert document.ast.dict() == ast.dict()
+
+
+@pytest.mark.parametrize(
+    "edits",
+    [
+        ['{\n  "a": [1, "é", 2],\n  "b": {"c": true}\n}\n'],
+        ['{\n  "a": [1, "é"],\n  "b": {"c": \nfalse}\n}\n'],
+        ['{\n  "a": {},\n  "b": {"c": true}\n}\n', '{\n  "a": {},\n  "b": {"c": \n\n true}\n}\n'],
+    ],
+)
+def test_incremental_document_parses_edited_values(edits):
+    document = IncrementalDocument(DOCUMENT)
+    ast = document.ast
+    for text in edits:
+        assert document.update(text)
+        _assert_parsed(document, text)
+    assert document.ast is ast
+
+
+def test_incremental_document_parses_edited_array_items():
+    document = IncrementalDocument("[\n1,\n[2, 3],\n4\n]")
+    assert document.update("[\n1,\n[2, \n3, 5],\n4\n]")
+    assert document.update("[\n1,\n[2, \n3, 5],\n44\n]")
+    _assert_parsed(document, "[\n1,\n[2, \n3, 5],\n44\n]")
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        # Edits outside a top-level value
+        '{\n  "a": [1, "é"],\n  "b": {"c": true}, "d": 1\n}\n',
+        '{\n  "aa": [1, "é"],\n  "b": {"c": true}\n}\n',
+        # Edits which leave the value invalid on its own
+        '{\n  "a": [1, "é"], "x": [],\n  "b": {"c": true}\n}\n',
+        '{\n  "a": [1, "é",\n  "b": {"c": true}\n}\n',
+    ],
+)
+def test_incremental_document_rejects_other_edits(text):
+    document = IncrementalDocument(DOCUMENT)
+    assert not document.update(text)
+    assert document.text == DOCUMENT
+    _assert_parsed(document, DOCUMENT)
+
+
+def test_incremental_document_rejects_edits_to_duplicated_keys():
+    document = IncrementalDocument('{"a": 1, "a": 2}')
+    assert not document.update('{"a": 3, "a": 2}')
@@ -1,23 +1,24 @@
 from dataclasses import asdict
-from typing import Type, Union
+from typing import Any, Dict, Type, Union
 
 import pytest
 
 from jsonschema_lint.json_ast import nodes
-from jsonschema_lint.json_ast.location import Location, Position
+from jsonschema_lint.json_ast.location import LineIndex, Location, Position
 
-_LOC = Location(start=Position(line=1, column=1, index=0), end=Position(line=1, column=2, index=1))
+_LINES = LineIndex('{"list": ["string"]}')
+_LOC: Dict[str, Any] = {"start": 0, "end": 1, "lines": _LINES}
 
 TREE = nodes.Object(
-    location=_LOC,
+    **_LOC,
     children=[
         nodes.Property(
-            location=_LOC,
-            identifier=nodes.String(value="list", raw='"list"', location=_LOC),
+            **_LOC,
+            identifier=nodes.String(value="list", raw='"list"', **_LOC),
             value=nodes.Array(
-                location=_LOC,
+                **_LOC,
                 children=[
-                    nodes.String(value="string", raw='"string"', location=_LOC),
+                    nodes.String(value="string", raw='"string"', **_LOC),
                 ],
             ),
         )
@@ -29,7 +30,7 @@ TREE = nodes.Object(
     "path,expected",
     [
         ([], TREE),
-        (["list", 0], nodes.String(value="string", raw='"string"', location=_LOC)),
+        (["list", 0], nodes.String(value="string", raw='"string"', **_LOC)),
         (["list", "key"], TypeError),
         (["foo"], KeyError),
         (["list", 1], IndexError),
@@ -60,7 +61,33 @@ def test_resolve(node: nodes.Node, expected):
 
 
 def test_dict():
-    assert TREE.dict() == asdict(TREE)
+    location = asdict(Location(start=Position(line=1, column=1, index=0), end=Position(line=1, column=2, index=1)))
+    assert TREE.dict() == {
+        "location": location,
+        "children": [
+            {
+                "location": location,
+                "identifier": {"location": location, "value": "list", "raw": '"list"', "type": "string"},
+                "value": {
+                    "location": location,
+                    "children": [{"location": location, "value": "string", "raw": '"string"', "type": "string"}],
+                    "type": "array",
+                },
+                "type": "property",
+            }
+        ],
+        "type": "object",
+    }
+
+
+def test_location():
+    lines = LineIndex("[\n  1,\r\n  2\r]")
+    node = nodes.Integer(start=10, end=11, value=2, raw="2", lines=lines)
+    assert node.location == Location(
+        start=Position(line=3, column=3, index=10),
+        end=Position(line=3, column=4, index=11),
+    )
+    assert lines.position(len("[\n  1,\r\n  2\r")) == Position(line=4, column=1, index=12)
 
 
 @pytest.mark.parametrize(
@@ -80,3 +107,47 @@ def test_literal_detect(value, expected: Union[Type[nodes.Node], Type[Exception]
             _ = nodes.Literal.detect(value)
     else:
         assert nodes.Literal.detect(value) == expected
+
+
+def test_node_get_many():
+    paths = [["list", 0], [], ["list"], ["list", 0]]
+    assert TREE.get_many(paths) == [TREE.get(*path) for path in paths]
+
+
+@pytest.mark.parametrize(
+    "path,expected",
+    [
+        (["list", "key"], TypeError),
+        (["foo"], KeyError),
+        (["list", 1], IndexError),
+    ],
+)
+def test_node_get_many_invalid(path: list, expected: Type[Exception]):
+    with pytest.raises(expected):
+        _ = TREE.get_many([["list", 0], path])
+
+
+def test_node_get_duplicate_key():
+    lines = LineIndex('{"a": 1, "a": 2}')
+    tree = nodes.Object(
+        start=0,
+        end=16,
+        lines=lines,
+        children=[
+            nodes.Property(
+                start=1,
+                end=7,
+                lines=lines,
+                identifier=nodes.String(start=1, end=4, lines=lines, value="a"),
+                value=nodes.Integer(start=6, end=7, lines=lines, value=1),
+            ),
+            nodes.Property(
+                start=9,
+                end=15,
+                lines=lines,
+                identifier=nodes.String(start=9, end=12, lines=lines, value="a"),
+                value=nodes.Integer(start=14, end=15, lines=lines, value=2),
+            ),
+        ],
+    )
+    assert tree.get("a").raw == "1"
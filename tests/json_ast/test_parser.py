@@ -1,9 +1,11 @@
+import json
 from fnmatch import fnmatch
 
 import pytest
 
+from jsonschema_lint.json_ast import nodes
 from jsonschema_lint.json_ast.errors import JSONASTError
-from jsonschema_lint.json_ast.parser import parse
+from jsonschema_lint.json_ast.parser import parse, parse_with_instance
 
 
 def test_parse_simple():
@@ -29,6 +31,9 @@ def test_parse_simple():
         ("{}{}", "Unexpected LEFT_BRACE token '{' at line 1, column 3. Expected one of ['EOF']."),
         ('{"foo": ,}', "Unexpected COMMA token ',' at line 1, column 9. Expected one of *."),
         ("[", "Unclosed array at line 1, column 1"),
+        ("[[1, {", "Unclosed object at line 1, column 6"),
+        ("[1,]", "Unexpected RIGHT_BRACKET token ']' at line 1, column 4. Expected one of *."),
+        ('{"foo": 1,}', "Unexpected RIGHT_BRACE token '}' at line 1, column 11. Expected one of ['STRING']."),
         ("{", "Unclosed object at line 1, column 1"),
         ("[]", []),
         ("[1 2]", "Unexpected NUMBER token '2' at line 1, column 4. Expected one of ['COMMA', 'RIGHT_BRACKET']."),
@@ -49,3 +54,57 @@ def test_parse(document: str, expected):
     else:
         tree = parse(document)
         assert tree.resolve() == expected
+
+
+def test_parse_with_instance():
+    document = '{"foo": [1, "ab\\"c", {"x": true}], "foo": null, "bar": 0.6e+4}'
+    tree, instance = parse_with_instance(document)
+    assert instance == json.loads(document)
+    assert list(instance) == list(json.loads(document))
+    assert tree.resolve() == instance
+
+
+def test_parse_deeply_nested():
+    depth = 10_000
+    document = '{"a": ' * depth + "[" * depth + "]" * depth + "}" * depth
+    tree, instance = parse_with_instance(document)
+    assert tree.location.end.index == len(document)
+    for _ in range(depth):
+        instance = instance["a"]
+    assert isinstance(instance, list)
+
+
+def _positions(tree):
+    positions = [(tree.location.start, tree.location.end)]
+    children = [tree.identifier, tree.value] if isinstance(tree, nodes.Property) else getattr(tree, "children", [])
+    for child in children:
+        positions.extend(_positions(child))
+    return positions
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        '{"foo": [1, "ab\\"c", {"x": true}], "bar": 0.6e+4}',
+        '{\r\n  "café": "☃\U0001f600",\r\n  "x": [null, "é"]\n}',
+    ],
+)
+def test_parse_with_instance_from_bytes(document: str):
+    text_tree, text_instance = parse_with_instance(document)
+    bytes_tree, bytes_instance = parse_with_instance(document.encode())
+    assert bytes_instance == text_instance
+    assert _positions(bytes_tree) == _positions(text_tree)
+    assert isinstance(bytes_tree, nodes.Object) and isinstance(text_tree, nodes.Object)
+    assert [prop.identifier.raw for prop in bytes_tree.children] == [prop.identifier.raw for prop in text_tree.children]
+
+
+@pytest.mark.parametrize("document", ['{"é": ,}', '["é" 2]', "[", '"\\x"', "é", b"[\xff]"])
+def test_parse_with_instance_from_bytes_errors(document):
+    text = document if isinstance(document, str) else document.decode("utf-8", "replace")
+    with pytest.raises(JSONASTError) as text_error:
+        parse_with_instance(text)
+    with pytest.raises((JSONASTError, UnicodeDecodeError)) as bytes_error:
+        parse_with_instance(document.encode() if isinstance(document, str) else document)
+    if isinstance(document, str):
+        assert str(bytes_error.value) == str(text_error.value)
+        assert bytes_error.value.location == text_error.value.location
@@ -0,0 +1,61 @@
+import mmap
+from pathlib import Path
+
+import pytest
+
+from jsonschema_lint.json_ast.errors import JSONASTError
+from jsonschema_lint.json_ast.location import Document, Position
+from jsonschema_lint.json_ast.parser import parse_with_instance
+from jsonschema_lint.json_ast.stream import iter_records
+
+
+@pytest.mark.parametrize(
+    "document,expected",
+    [
+        ("", []),
+        (
+            '{"a": 1}\n\n  \n["é"]\r\n2',
+            [('{"a": 1}', Position(1, 1, 0)), ('["é"]\r', Position(4, 1, 13)), ("2", Position(5, 1, 20))],
+        ),
+        (
+            '\x1e{"a":\n 1}\n\x1e\n\x1e"é"\x1e[2]\n',
+            [('{"a":\n 1}\n', Position(1, 2, 1)), ('"é"', Position(4, 2, 14)), ("[2]\n", Position(4, 6, 18))],
+        ),
+    ],
+)
+def test_iter_records(document: str, expected):
+    assert [(record.document, record.origin) for record in iter_records(document)] == expected
+    records = iter_records(document.encode())
+    assert [(_decode(record.document), record.origin) for record in records] == expected
+
+
+def _decode(document: Document) -> str:
+    assert isinstance(document, bytes)
+    return str(document, "utf-8")
+
+
+def test_iter_records_memory_mapped(tmp_path: Path):
+    path = tmp_path / "records.ndjson"
+    path.write_bytes(b'{"a": 1}\n{"b": 2}\n')
+    with path.open("rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as document:
+        records = [(record.document, record.origin) for record in iter_records(document)]
+    assert records == [(b'{"a": 1}', Position(1, 1, 0)), (b'{"b": 2}', Position(2, 1, 9))]
+
+
+@pytest.mark.parametrize(
+    "document,expected",
+    [
+        ('[1]\n  {"é": [tru]}\n', ("Unexpected symbol 't' at line 2, column 10", Position(2, 10, 13))),
+        ('\x1e[1]\n\x1e{"é":\n [tru]}\n', ("Unexpected symbol 't' at line 3, column 3", Position(3, 3, 14))),
+        (
+            '[1]\n{"é": 1,}\n',
+            ("Unexpected RIGHT_BRACE token '}' at line 2, column 9. Expected one of ['STRING'].", Position(2, 9, 12)),
+        ),
+    ],
+)
+def test_records_are_located_in_the_stream(document: str, expected):
+    for stream in (document, document.encode()):
+        *_, record = iter_records(stream)
+        with pytest.raises(JSONASTError) as exc_info:
+            parse_with_instance(record.document, record.origin)
+        assert (str(exc_info.value), exc_info.value.location.start) == expected
@@ -33,6 +33,7 @@ def test_tokenize_simple():
         (r'"foo\\"', [r'"foo\\"']),  # raised
         (r'"foo\\\"', "Unclosed string at line 1, column 1"),
         (r'"foo\\\\"', [r'"foo\\\\"']),  # raised
+        ('["' + "é1 " * 40 + "\\x" * 40, "Unclosed string at line 1, column 2"),  # used to backtrack exponentially
         ('"\\u0123"', ['"\\u0123"']),
         ('"\\u012h"', 'Invalid unicode escape "\\u012h" at line 1, column 2'),
         ('"\\x"', 'Unexpected escape "\\x" at line 1, column 2'),
@@ -75,3 +76,22 @@ def test_token_locations():
         "1": ((3, 16, 40), (3, 17, 41)),
     }.items():
         assert locations_by_value[value] == expected
+
+
+@pytest.mark.parametrize("newline", ["\n", "\r", "\r\n"])
+def test_token_locations_across_newlines(newline: str):
+    document = newline.join(["[", "  1,", "", "\t2", "]"])
+    tokens = tokenize(document)
+    assert [(token.value, token.location.start.line, token.location.start.column) for token in tokens] == [
+        ("[", 1, 1),
+        ("1", 2, 3),
+        (",", 2, 4),
+        ("2", 4, 2),
+        ("]", 5, 1),
+    ]
+
+
+def test_tokenize_error_after_newline():
+    with pytest.raises(JSONASTError) as exc_info:
+        _ = tokenize('[\n  1,\n  "\\x"]')
+    assert str(exc_info.value) == 'Unexpected escape "\\x" at line 3, column 4'
@@ -8,6 +8,13 @@ ASSETS_DIR = Path(__file__).parent / "assets"
 SIMPLE_DIR = ASSETS_DIR / "simple"
 
 
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("JSONSCHEMA_LINT_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("JSONSCHEMA_LINT_RESULTS_CACHE_DIR", str(tmp_path / "results"))
+    return tmp_path / "cache"
+
+
 def test_it_uses_rc_file():
     result = subprocess.run(["jsonschema-lint"], cwd=SIMPLE_DIR, capture_output=True, text=True)
     output = "\n".join([result.stdout, result.stderr])
@@ -15,18 +22,45 @@ def test_it_uses_rc_file():
     assert (
         result.stdout
         == """
-object/instances/002.json:1:1:1:15: Additional properties are not allowed ('qux' was unexpected)
 numbers/instances/002.json:1:2:1:8: 'spam' is not of type 'number'
 numbers/instances/002.json:1:2:1:8: 'spam' is not one of [1, 2, 3]
 numbers/instances/002.json:1:1:1:12: ['spam', 2] is too short
 numbers/instances/002.yaml:2:3:2:7: 'spam' is not of type 'number'
 numbers/instances/002.yaml:2:3:2:7: 'spam' is not one of [1, 2, 3]
 numbers/instances/002.yaml:2:1:4:1: ['spam', 2] is too short
+object/instances/002.json:1:1:1:15: Additional properties are not allowed ('qux' was unexpected)
 object/instances/002.yml:1:1:2:1: Additional properties are not allowed ('qux' was unexpected)
 """.lstrip()
     )
 
 
+def test_it_lints_in_parallel():
+    serial = subprocess.run(["jsonschema-lint"], cwd=SIMPLE_DIR, capture_output=True, text=True)
+    parallel = subprocess.run(["jsonschema-lint", "--jobs", "3"], cwd=SIMPLE_DIR, capture_output=True, text=True)
+    output = "\n".join([parallel.stdout, parallel.stderr])
+    assert parallel.returncode == serial.returncode == 1, output
+    assert parallel.stdout == serial.stdout
+
+
+def test_it_replays_cached_results(tmp_path: Path):
+    first = subprocess.run(["jsonschema-lint"], cwd=SIMPLE_DIR, capture_output=True, text=True)
+    second = subprocess.run(["jsonschema-lint"], cwd=SIMPLE_DIR, capture_output=True, text=True)
+    output = "\n".join([second.stdout, second.stderr])
+    assert second.returncode == first.returncode == 1, output
+    assert second.stdout == first.stdout
+    assert list((tmp_path / "results" / "results").glob("*/*.json"))
+
+
+def test_it_lints_without_a_writable_results_cache(tmp_path: Path, monkeypatch):
+    (tmp_path / "file").touch()
+    monkeypatch.setenv("JSONSCHEMA_LINT_RESULTS_CACHE_DIR", str(tmp_path / "file" / "results"))
+    expected = subprocess.run(["jsonschema-lint", "--no-results-cache"], cwd=SIMPLE_DIR, capture_output=True, text=True)
+    result = subprocess.run(["jsonschema-lint"], cwd=SIMPLE_DIR, capture_output=True, text=True)
+    output = "\n".join([result.stdout, result.stderr])
+    assert result.returncode == expected.returncode == 1, output
+    assert result.stdout == expected.stdout
+
+
 def test_it_filters_on_provided_files():
     result = subprocess.run(
         ["jsonschema-lint", "numbers/instances/002.json"], cwd=SIMPLE_DIR, capture_output=True, text=True
@@ -45,7 +79,7 @@ numbers/instances/002.json:1:1:1:12: ['spam', 2] is too short
 
 def test_it_uses_specified_schema():
     result = subprocess.run(
-        ["jsonschema-lint", "--schema", "numbers/schema.json", *SIMPLE_DIR.glob("**/instances/**/*.json")],
+        ["jsonschema-lint", "--schema", "numbers/schema.json", *sorted(SIMPLE_DIR.glob("**/instances/**/*.json"))],
         cwd=SIMPLE_DIR,
         capture_output=True,
         text=True,
@@ -55,11 +89,11 @@ def test_it_uses_specified_schema():
     assert (
         result.stdout
         == """
-object/instances/001.json:1:1:1:15: {'foo': 'bar'} is not of type 'array'
-object/instances/002.json:1:1:1:15: {'qux': 'mux'} is not of type 'array'
 numbers/instances/002.json:1:2:1:8: 'spam' is not of type 'number'
 numbers/instances/002.json:1:2:1:8: 'spam' is not one of [1, 2, 3]
 numbers/instances/002.json:1:1:1:12: ['spam', 2] is too short
+object/instances/001.json:1:1:1:15: {'foo': 'bar'} is not of type 'array'
+object/instances/002.json:1:1:1:15: {'qux': 'mux'} is not of type 'array'
 """.lstrip()
     )
 
@@ -92,6 +126,29 @@ instances/002.json:1:12:1:13: 1 is not of type 'string'
     )
 
 
+def test_it_does_not_download_schemas_offline():
+    result = subprocess.run(
+        ["jsonschema-lint", "--offline"], cwd=ASSETS_DIR / "extra" / "remote-schema", capture_output=True, text=True
+    )
+    output = "\n".join([result.stdout, result.stderr])
+    assert result.returncode == 1, output
+    assert sorted(result.stdout.splitlines()) == [
+        "instances/001.json:1:1:1:1: Could not load schema from http://localhost:8000/schema.json",
+        "instances/002.json:1:1:1:1: Could not load schema from http://localhost:8000/schema.json",
+    ]
+
+
+def test_it_uses_cached_schema_offline(mock_remote_schema_server, cache_dir: Path):
+    subprocess.run(["jsonschema-lint"], cwd=ASSETS_DIR / "extra" / "remote-schema", capture_output=True, text=True)
+    result = subprocess.run(
+        ["jsonschema-lint", "--offline"], cwd=ASSETS_DIR / "extra" / "remote-schema", capture_output=True, text=True
+    )
+    output = "\n".join([result.stdout, result.stderr])
+    assert result.returncode == 1, output
+    assert result.stdout == "instances/002.json:1:12:1:13: 1 is not of type 'string'\n"
+    assert len(list((cache_dir / "objects").iterdir())) == 1
+
+
 @pytest.fixture()
 def mock_remote_schema_server():
     process = subprocess.Popen(
@@ -0,0 +1,83 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from jsonschema_lint._cli.discovery import IgnoreFile, discover
+
+
+def _create(root: Path, *names: str) -> None:
+    for name in names:
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("{}")
+
+
+def _discover(root: Path):
+    return [path.relative_to(root).as_posix() for path in discover(root)]
+
+
+def test_it_finds_every_extension_in_one_sorted_walk(tmp_path: Path):
+    _create(tmp_path, "b.yml", "a.json", "sub/c.yaml", "sub/d.txt", "e.json", "f.jsonl", "g.ndjson")
+    assert _discover(tmp_path) == ["a.json", "b.yml", "e.json", "f.jsonl", "g.ndjson", "sub/c.yaml"]
+
+
+def test_it_skips_ignored_directories(tmp_path: Path):
+    _create(tmp_path, "a.json", ".git/config.json", "node_modules/pkg/package.json", "env/lib.json")
+    (tmp_path / "env" / "pyvenv.cfg").write_text("")
+    assert _discover(tmp_path) == ["a.json"]
+
+
+def test_it_honours_gitignore(tmp_path: Path):
+    _create(tmp_path, "a.json", "build/out.json", "keep.json", "sub/x.json", "sub/y.json", "sub/deep/x.json")
+    (tmp_path / ".gitignore").write_text("# comment\nbuild/\n*.json\n!keep.json\n!sub/\n")
+    (tmp_path / "sub" / ".gitignore").write_text("!*.json\n/x.json\n")
+    assert _discover(tmp_path) == ["keep.json", "sub/y.json", "sub/deep/x.json"]
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="symlinks are not supported")
+def test_it_yields_each_file_once(tmp_path: Path):
+    _create(tmp_path, "real/a.json")
+    os.symlink(tmp_path / "real", tmp_path / "link")
+    os.symlink(tmp_path / "real" / "a.json", tmp_path / "real" / "b.json")
+    os.symlink(tmp_path, tmp_path / "real" / "loop")
+    assert _discover(tmp_path) == ["link/a.json"]
+
+
+def test_it_streams_paths(tmp_path: Path):
+    _create(tmp_path, "a.json", "b.json")
+    paths = discover(tmp_path)
+    assert next(paths) == tmp_path / "a.json"
+    (tmp_path / "b.json").unlink()
+    assert list(paths) == []
+
+
+
+def test_it_skips_files_in_directories_not_searched(tmp_path: Path):
+    _create(tmp_path, "a.json", "skip/b.json", "skip/sub/c.json")
+    paths = discover(tmp_path, search=lambda directory: directory.name != "skip")
+    assert [path.relative_to(tmp_path).as_posix() for path in paths] == ["a.json", "skip/sub/c.json"]
+
+
+@pytest.mark.parametrize(
+    "pattern, path, is_dir, expected",
+    [
+        ("*.json", "a/b.json", False, True),
+        ("/*.json", "a/b.json", False, None),
+        ("/*.json", "b.json", False, True),
+        ("a/*.json", "a/b/c.json", False, None),
+        ("a/**/c.json", "a/b/x/c.json", False, True),
+        ("a/**/c.json", "a/c.json", False, True),
+        ("**/out", "x/y/out", True, True),
+        ("out/", "out", False, None),
+        ("out/", "x/out", True, True),
+        ("a/**", "a/b/c", False, True),
+        ("b[0-9].json", "b1.json", False, True),
+        ("b[!0-9].json", "b1.json", False, None),
+        ("b?.json", "bx.json", False, True),
+        ("\\#x", "#x", False, True),
+        ("!*.json", "a.json", False, False),
+    ],
+)
+def test_ignore_file_patterns(tmp_path: Path, pattern, path, is_dir, expected):
+    assert IgnoreFile(tmp_path, [pattern]).match(tmp_path / path, is_dir) == expected
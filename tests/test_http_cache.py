@@ -0,0 +1,163 @@
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Iterator, List, Set, cast
+from urllib.error import URLError
+
+import pytest
+
+from jsonschema_lint._cli.http_cache import ConnectionPool, HTTPCache
+
+SCHEMA = b'{"type": "string"}'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serve one JSON document with an ETag, recording each request.
+
+    /redirect redirects to the document, and /flaky fails with a server error once.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        server = cast(_Server, self.server)
+        server.requests.append(dict(self.headers))
+        server.clients.add(self.client_address)
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/schema.json")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/flaky" and len(server.requests) == 1:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        etag = f'"{hashlib.md5(server.content).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(server.content)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(server.content)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    """Local server for _Handler, with the requests it has handled and the content it serves."""
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.requests: List[dict] = []
+        self.clients: Set[Any] = set()
+        self.content = SCHEMA
+        self.root = f"http://127.0.0.1:{self.server_address[1]}"
+        self.url = f"{self.root}/schema.json"
+
+
+@pytest.fixture()
+def server() -> Iterator[_Server]:
+    server = _Server()
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_http_cache_reuses_fresh_entries(tmp_path: Path, server: _Server):
+    cache = HTTPCache(directory=tmp_path)
+    assert cache.fetch(server.url) == ("application/json", SCHEMA)
+    assert HTTPCache(directory=tmp_path).fetch(server.url) == ("application/json", SCHEMA)
+    assert len(server.requests) == 1
+
+
+def test_http_cache_revalidates_stale_entries(tmp_path: Path, server: _Server):
+    HTTPCache(directory=tmp_path).fetch(server.url)
+    cache = HTTPCache(directory=tmp_path, ttl=0)
+    assert cache.fetch(server.url) == ("application/json", SCHEMA)
+    assert server.requests[1]["If-None-Match"] == f'"{hashlib.md5(SCHEMA).hexdigest()}"'
+
+    server.content = b'{"type": "number"}'
+    assert cache.fetch(server.url) == ("application/json", server.content)
+    assert len(server.requests) == 3
+
+
+def test_http_cache_refresh_ignores_entries(tmp_path: Path, server: _Server):
+    HTTPCache(directory=tmp_path).fetch(server.url)
+    HTTPCache(directory=tmp_path, refresh=True).fetch(server.url)
+    assert len(server.requests) == 2
+    assert "If-None-Match" not in server.requests[1]
+
+
+def test_http_cache_offline(tmp_path: Path, server: _Server):
+    cache = HTTPCache(directory=tmp_path, ttl=0, offline=True)
+    with pytest.raises(URLError):
+        cache.fetch(server.url)
+    HTTPCache(directory=tmp_path).fetch(server.url)
+    assert cache.fetch(server.url) == ("application/json", SCHEMA)
+    assert len(server.requests) == 1
+
+
+def test_http_cache_stores_content_once(tmp_path: Path, server: _Server):
+    cache = HTTPCache(directory=tmp_path)
+    cache.fetch(server.url)
+    cache.fetch(server.url + "?copy")
+    assert len(list((tmp_path / "entries").iterdir())) == 2
+    assert len(list((tmp_path / "objects").iterdir())) == 1
+
+
+def test_http_cache_prunes_to_max_size(tmp_path: Path, server: _Server):
+    cache = HTTPCache(directory=tmp_path, max_size=len(SCHEMA))
+    cache.fetch(server.url)
+    for path in (tmp_path / "objects").iterdir():
+        os.utime(path, (0, 0))
+    server.content = b'{"type": "number"}'
+    cache.fetch(server.url + "?other")
+    assert [path.read_bytes() for path in (tmp_path / "objects").iterdir()] == [server.content]
+
+    assert cache.fetch(server.url) == ("application/json", server.content)
+    assert len(server.requests) == 3
+
+
+def test_http_cache_returns_content_it_cannot_save(tmp_path: Path, server: _Server):
+    (tmp_path / "file").touch()
+    cache = HTTPCache(directory=tmp_path / "file")
+    assert cache.fetch(server.url) == ("application/json", SCHEMA)
+    assert cache.fetch(server.url) == ("application/json", SCHEMA)
+    assert len(server.requests) == 2
+
+
+def test_connection_pool_keeps_connections_alive(server: _Server):
+    pool = ConnectionPool()
+    for _ in range(3):
+        assert pool.request(server.url, {}).content == SCHEMA
+    assert len(server.requests) == 3
+    assert len(server.clients) == 1
+
+
+def test_connection_pool_follows_redirects(server: _Server):
+    response = ConnectionPool().request(server.root + "/redirect", {})
+    assert (response.url, response.status, response.content) == (server.url, 200, SCHEMA)
+
+
+def test_connection_pool_retries_server_errors(server: _Server):
+    response = ConnectionPool(backoff=0).request(server.root + "/flaky", {})
+    assert (response.status, response.content) == (200, SCHEMA)
+    assert len(server.requests) == 2
+
+
+def test_connection_pool_gives_up_on_unreachable_hosts():
+    with pytest.raises(URLError):
+        ConnectionPool(timeout=1, retries=1, backoff=0).request("http://127.0.0.1:1/schema.json", {})
@@ -1,5 +1,10 @@
+import mmap
+from pathlib import Path
 from typing import List
 
+import pytest
+
+from jsonschema_lint._cli import main
 from jsonschema_lint.json_ast.location import Location, Position
 from jsonschema_lint.linter import Error, lint
 
@@ -69,3 +74,94 @@ def test_lint_yaml():
             message="['spam', 2] is too short",
         ),
     ]
+
+
+def test_lint_yaml_stream():
+    schema = {"type": "object", "properties": {"a": {"type": "integer"}}}
+    document = "---\na: 1\n---\na: x\n"
+    errors: List[Error] = lint(schema, document, mode="yaml")
+
+    assert errors == [
+        Error(
+            location=Location(start=Position(line=4, column=4, index=16), end=Position(line=4, column=5, index=17)),
+            message="'x' is not of type 'integer'",
+        )
+    ]
+
+
+def test_lint_yaml_merge_keys():
+    schema = {"properties": {"derived": {"properties": {"x": {"type": "string"}}}}}
+    document = "base: &b\n  x: 1\nderived:\n  <<: *b\n  y: 2\n"
+    errors: List[Error] = lint(schema, document, mode="yaml")
+
+    # Merged properties are located where they are defined
+    assert errors == [
+        Error(
+            location=Location(start=Position(line=2, column=6, index=14), end=Position(line=2, column=7, index=15)),
+            message="1 is not of type 'string'",
+        )
+    ]
+
+
+@pytest.mark.parametrize(
+    "schema, document",
+    [
+        ({"type": "object"}, "[" * 100_000 + "]" * 100_000),
+        (
+            {"$ref": "#/definitions/a", "definitions": {"a": {"items": {"$ref": "#/definitions/a"}}}},
+            "[" * 3000 + "1" + "]" * 3000,
+        ),
+    ],
+)
+def test_lint_too_deeply_nested(schema: dict, document: str):
+    [error] = lint(schema, document)
+
+    assert error.message == "Too deeply nested to validate"
+    assert error.location.start == Position(line=1, column=1, index=0)
+
+
+def test_lint_memory_mapped_json(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    schema = {"type": "array", "items": {"type": "number"}}
+    path = tmp_path / "instance.json"
+    path.write_text('[\n  "é",\n  2, "spam"\n]\n', encoding="utf-8")
+    expected = lint(schema, path.read_text(encoding="utf-8"))
+
+    monkeypatch.setattr(main, "MMAP_THRESHOLD", 0)
+    with main.open_document(path) as document:
+        assert isinstance(document, mmap.mmap)
+        errors = lint(schema, document)
+
+    assert errors == expected
+    assert [error.location.start for error in errors] == [
+        Position(line=2, column=3, index=4),
+        Position(line=3, column=6, index=14),
+    ]
+
+
+def test_lint_ndjson():
+    schema = {"type": "object", "properties": {"id": {"type": "integer"}}}
+    document = '{"id": 1}\n{"id": "x"}\n\n{"id": \n{"id": 4}\n[]\n'
+    errors: List[Error] = lint(schema, document, mode="ndjson")
+
+    assert errors == [
+        Error(
+            location=Location(start=Position(line=2, column=8, index=17), end=Position(line=2, column=11, index=20)),
+            message="'x' is not of type 'integer'",
+        ),
+        Error(
+            location=Location(start=Position(line=4, column=2, index=24), end=Position(line=4, column=7, index=29)),
+            message="Incomplete property at line 4, column 2",
+        ),
+        Error(
+            location=Location(start=Position(line=6, column=1, index=41), end=Position(line=6, column=3, index=43)),
+            message="[] is not of type 'object'",
+        ),
+    ]
+
+
+def test_lint_ndjson_in_parallel(monkeypatch: pytest.MonkeyPatch):
+    schema = {"type": "object", "required": ["id"]}
+    document = "".join('{"id": %d}\n' % i if i % 7 else "{}\n" for i in range(100))
+    monkeypatch.setattr("jsonschema_lint.linter.RECORDS_PER_BATCH", 3)
+
+    assert lint(schema, document, mode="ndjson", jobs=2) == lint(schema, document, mode="ndjson")
@@ -0,0 +1,143 @@
+import io
+import json
+import subprocess
+from pathlib import Path
+from typing import BinaryIO, List, cast
+
+from jsonschema_lint._cli.lsp import LanguageServer, TextDocument, read_message, write_message
+from jsonschema_lint._cli.rule_loader import RuleStack
+from jsonschema_lint.json_ast.location import Position
+
+
+def _server(tmp_path: Path) -> LanguageServer:
+    (tmp_path / ".jsonschema-lint").write_text("*.json schema.json\n")
+    (tmp_path / "schema.json").write_text(json.dumps({"type": "array", "items": {"type": "number"}}))
+    return LanguageServer(RuleStack(), io.BytesIO())
+
+
+def _open(server: LanguageServer, uri: str, text: str) -> None:
+    server.handle({"method": "textDocument/didOpen", "params": {"textDocument": {"uri": uri, "text": text}}})
+
+
+def _messages(server: LanguageServer) -> List[dict]:
+    output = io.BytesIO(cast(io.BytesIO, server.output).getvalue())
+    messages: List[dict] = []
+    while True:
+        message = read_message(output)
+        if message is None:
+            return messages
+        messages.append(message)
+
+
+def test_text_document_applies_incremental_changes():
+    document = TextDocument("file:///a.json", '[\n  "😀", 1\n]')
+    document.apply({"range": {"start": {"line": 1, "character": 8}, "end": {"line": 1, "character": 9}}, "text": "2"})
+    assert document.text == '[\n  "😀", 2\n]'
+    document.apply({"text": "[]"})
+    assert document.text == "[]"
+
+
+def test_text_document_positions_count_utf16():
+    document = TextDocument("file:///a.json", '["😀", x]')
+    assert document.position(Position(line=1, column=7, index=6)) == {"line": 0, "character": 7}
+    assert document.offset({"line": 0, "character": 7}) == 6
+
+
+def test_language_server_publishes_diagnostics(tmp_path: Path):
+    server = _server(tmp_path)
+    uri = (tmp_path / "instance.json").as_uri()
+    server.handle({"id": 1, "method": "initialize", "params": {}})
+    server.handle({"method": "textDocument/didOpen", "params": {"textDocument": {"uri": uri, "text": '[1, "a"]'}}})
+    server.handle(
+        {
+            "method": "textDocument/didChange",
+            "params": {
+                "textDocument": {"uri": uri, "version": 2},
+                "contentChanges": [
+                    {"range": {"start": {"line": 0, "character": 1}, "end": {"line": 0, "character": 2}}, "text": '"b"'}
+                ],
+            },
+        }
+    )
+    server.publish()
+    server.publish()
+    server.handle({"id": 2, "method": "unknown"})
+
+    initialize, diagnostics, unknown = _messages(server)
+    assert initialize["result"]["capabilities"]["textDocumentSync"]["change"] == 2
+    assert diagnostics["params"]["uri"] == uri
+    assert [
+        (diagnostic["range"], diagnostic["message"]) for diagnostic in diagnostics["params"]["diagnostics"]
+    ] == [
+        ({"start": {"line": 0, "character": 1}, "end": {"line": 0, "character": 4}}, "'b' is not of type 'number'"),
+        ({"start": {"line": 0, "character": 6}, "end": {"line": 0, "character": 9}}, "'a' is not of type 'number'"),
+    ]
+    assert unknown["error"]["code"] == -32601
+
+
+def test_language_server_parses_only_edited_values(tmp_path: Path):
+    server = _server(tmp_path)
+    uri = (tmp_path / "instance.json").as_uri()
+    _open(server, uri, '[1,\n"a"]')
+    server.publish()
+    parsed = server.documents[uri].parsed
+    assert parsed
+    ast = parsed.ast
+    change = {"range": {"start": {"line": 1, "character": 1}, "end": {"line": 1, "character": 2}}, "text": "b"}
+    server.handle(
+        {"method": "textDocument/didChange", "params": {"textDocument": {"uri": uri}, "contentChanges": [change]}}
+    )
+    server.publish()
+    assert server.documents[uri].parsed is parsed and parsed.ast is ast
+    assert [diagnostic["range"]["start"] for diagnostic in _messages(server)[-1]["params"]["diagnostics"]] == [
+        {"line": 1, "character": 0}
+    ]
+
+
+def test_language_server_reports_invalid_schemas(tmp_path: Path):
+    server = _server(tmp_path)
+    (tmp_path / "schema.json").write_text("{")
+    _open(server, (tmp_path / "instance.json").as_uri(), "[]")
+    server.publish()
+    (diagnostics,) = _messages(server)
+    (diagnostic,) = diagnostics["params"]["diagnostics"]
+    assert diagnostic["range"]["start"] == {"line": 0, "character": 0}
+    assert diagnostic["message"].startswith(f"Could not lint with {(tmp_path / 'schema.json').as_uri()}: ")
+
+
+def test_language_server_keeps_running_after_errors_handling_notifications(tmp_path: Path):
+    server = _server(tmp_path)
+    uri = (tmp_path / "instance.json").as_uri()
+    server.handle(
+        {"method": "textDocument/didChange", "params": {"textDocument": {"uri": uri}, "contentChanges": [{"text": ""}]}}
+    )
+    server.handle({"method": "textDocument/didOpen", "params": {}})
+    server.publish()
+    assert _messages(server) == [
+        {
+            "jsonrpc": "2.0",
+            "method": "window/logMessage",
+            "params": {"type": 1, "message": "textDocument/didOpen: 'textDocument'"},
+        }
+    ]
+
+
+def test_language_server_over_stdio(tmp_path: Path):
+    _server(tmp_path)
+    uri = (tmp_path / "instance.json").as_uri()
+    process = subprocess.Popen(
+        ["jsonschema-lint", "--lsp", "--no-results-cache"], cwd=tmp_path, stdin=subprocess.PIPE, stdout=subprocess.PIPE
+    )
+    stdin, stdout = cast(BinaryIO, process.stdin), cast(BinaryIO, process.stdout)
+    write_message(stdin, {"id": 1, "method": "initialize", "params": {}})
+    write_message(stdin, {"method": "textDocument/didOpen", "params": {"textDocument": {"uri": uri, "text": '["a"]'}}})
+    initialize = read_message(stdout)
+    assert initialize and initialize["id"] == 1
+    diagnostics = read_message(stdout)
+    assert diagnostics and [diagnostic["message"] for diagnostic in diagnostics["params"]["diagnostics"]] == [
+        "'a' is not of type 'number'"
+    ]
+    write_message(stdin, {"id": 2, "method": "shutdown"})
+    write_message(stdin, {"method": "exit"})
+    assert read_message(stdout) == {"jsonrpc": "2.0", "id": 2, "result": None}
+    assert process.wait(timeout=10) == 0
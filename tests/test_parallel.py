@@ -0,0 +1,41 @@
+from pathlib import Path
+
+from jsonschema_lint._cli.parallel import lint_parallel, schedule
+from jsonschema_lint._cli.rule_loader import Rule
+
+
+def _targets(tmp_path: Path, sizes_by_schema: dict):
+    targets = []
+    for schema_uri, sizes in sizes_by_schema.items():
+        for index, size in enumerate(sizes):
+            path = tmp_path / f"{schema_uri.rsplit('/', 1)[-1]}-{index}.json"
+            path.write_text(" " * size)
+            targets.append((Rule(owner=tmp_path, glob="*", schema_uri=schema_uri), path))
+    return targets
+
+
+def _positions(batches):
+    return [position for batch in batches for position, _, _ in batch]
+
+
+def test_schedule_pins_schemas_to_workers(tmp_path: Path):
+    targets = _targets(
+        tmp_path, {"https://example.com/a": [60, 60], "https://example.com/b": [90], "https://example.com/c": [80]}
+    )
+    assert [_positions(batches) for batches in schedule(targets, jobs=2)] == [[0, 1], [2, 3]]
+
+
+def test_schedule_splits_large_groups(tmp_path: Path):
+    targets = _targets(tmp_path, {"https://example.com/a": [100] * 16})
+    workers = schedule(targets, jobs=2)
+    assert [_positions(batches) for batches in workers] == [list(range(8)), list(range(8, 16))]
+    assert [len(batches) for batches in workers] == [4, 4]
+
+
+def _lint_name(rule: Rule, path: Path):
+    return [path.name]
+
+
+def test_lint_parallel_preserves_order(tmp_path: Path):
+    targets = _targets(tmp_path, {"https://example.com/a": [1, 50, 3], "https://example.com/b": [40, 2]})
+    assert list(lint_parallel(targets, 2, _lint_name)) == [[path.name] for _, path in targets]
@@ -0,0 +1,56 @@
+import json
+from pathlib import Path
+
+from jsonschema_lint._cli import schema_loader
+from jsonschema_lint._cli.prefetch import iter_references, prefetch, prefetch_each
+
+
+def test_iter_references_resolves_against_scope():
+    schema = {
+        "$id": "https://example.com/schemas/root.json",
+        "properties": {
+            "local": {"$ref": "#/definitions/local"},
+            "relative": {"$ref": "common.json#/definitions/name"},
+            "scoped": {"$id": "https://other.com/", "items": [{"$ref": "item.json"}]},
+            "$ref": {"type": "string"},
+        },
+    }
+    assert sorted(iter_references(schema, "file:///root.json")) == [
+        "https://example.com/schemas/common.json",
+        "https://other.com/item.json",
+    ]
+
+
+def test_prefetch_loads_referenced_documents(tmp_path: Path, monkeypatch):
+    (tmp_path / "a.json").write_text(json.dumps({"$ref": "b.json#/definitions/b"}))
+    (tmp_path / "b.json").write_text(json.dumps({"definitions": {"b": {"$ref": "c.json"}}}))
+    (tmp_path / "c.json").write_text(json.dumps({"$ref": "a.json"}))
+    loaded = []
+    load_schema = schema_loader.load_schema
+
+    def recording_load_schema(uri: str):
+        loaded.append(uri)
+        return load_schema(uri)
+
+    monkeypatch.setattr("jsonschema_lint._cli.prefetch.load_schema", recording_load_schema)
+    prefetch([(tmp_path / "a.json").as_uri(), (tmp_path / "missing.json").as_uri()])
+    names = ["a.json", "b.json", "c.json", "missing.json"]
+    assert sorted(loaded) == sorted((tmp_path / name).as_uri() for name in names)
+
+
+def test_prefetch_each_loads_schemas_as_items_are_used(tmp_path: Path, monkeypatch):
+    (tmp_path / "a.json").write_text(json.dumps({"$ref": "b.json"}))
+    (tmp_path / "b.json").write_text("{}")
+    (tmp_path / "c.json").write_text("{}")
+    loaded = []
+
+    def recording_load_schema(uri: str):
+        loaded.append(uri)
+        return schema_loader.load_schema(uri)
+
+    monkeypatch.setattr("jsonschema_lint._cli.prefetch.load_schema", recording_load_schema)
+    items = prefetch_each(iter(["a.json", "a.json", "c.json"]), uri=lambda name: (tmp_path / name).as_uri())
+    assert next(items) == "a.json"
+    assert sorted(loaded) == [(tmp_path / name).as_uri() for name in ("a.json", "b.json")]
+    assert list(items) == ["a.json", "c.json"]
+    assert sorted(loaded) == [(tmp_path / name).as_uri() for name in ("a.json", "b.json", "c.json")]
@@ -0,0 +1,51 @@
+from pathlib import Path
+
+from jsonschema_lint.linter import lint
+from jsonschema_lint.ref_registry import RefRegistry
+from jsonschema_lint.validator_cache import ValidatorCache
+
+DEFINITIONS = {"definitions": {"name": {"type": "string"}, "count": {"type": "integer"}}}
+
+
+def _registry(calls: list) -> RefRegistry:
+    def loader(uri: str):
+        calls.append(uri)
+        return DEFINITIONS
+
+    return RefRegistry(loader=loader)
+
+
+def test_ref_registry_loads_each_document_once():
+    calls: list = []
+    cache = ValidatorCache(registry=_registry(calls))
+    names = {"type": "array", "items": {"$ref": "https://example.com/defs.json#/definitions/name"}}
+    counts = {"type": "array", "items": {"$ref": "https://example.com/defs.json#/definitions/count"}}
+    assert [error.message for error in lint(names, '["a", 1]', cache=cache)] == ["1 is not of type 'string'"]
+    assert [error.message for error in lint(counts, '["a", 1]', cache=cache)] == ["'a' is not of type 'integer'"]
+    assert calls == ["https://example.com/defs.json"]
+
+
+def test_ref_registry_shares_resolved_refs():
+    registry = _registry([])
+    cache = ValidatorCache(registry=registry)
+    schema = {"$ref": "https://example.com/defs.json#/definitions/name"}
+    lint(schema, '"a"', cache=cache)
+    lint(dict(schema, title="copy"), '"b"', cache=cache)
+    assert registry.resolved == {"https://example.com/defs.json#/definitions/name": {"type": "string"}}
+
+
+def test_ref_registry_resolves_relative_to_key(tmp_path: Path):
+    calls: list = []
+    cache = ValidatorCache(registry=_registry(calls))
+    schema = {"$ref": "defs.json#/definitions/count"}
+    errors = lint(schema, '"a"', schema_key=(tmp_path / "schema.json").as_uri(), cache=cache)
+    assert [error.message for error in errors] == ["'a' is not of type 'integer'"]
+    assert calls == [(tmp_path / "defs.json").as_uri()]
+
+
+def test_ref_registry_does_not_share_anonymous_refs():
+    registry = _registry([])
+    cache = ValidatorCache(registry=registry)
+    assert not lint({"definitions": {"a": {"type": "string"}}, "$ref": "#/definitions/a"}, '"a"', cache=cache)
+    assert lint({"definitions": {"a": {"type": "number"}}, "$ref": "#/definitions/a"}, '"a"', cache=cache)
+    assert registry.resolved == {}
@@ -0,0 +1,80 @@
+import json
+import os
+from pathlib import Path
+
+from jsonschema_lint._cli import schema_loader
+from jsonschema_lint._cli.result_cache import ResultCache, content_digest, schema_fingerprint
+from jsonschema_lint.linter import lint
+
+
+def _write_schemas(tmp_path: Path, item_type: str) -> str:
+    (tmp_path / "schema.json").write_text(json.dumps({"type": "array", "items": {"$ref": "items.json"}}))
+    (tmp_path / "items.json").write_text(json.dumps({"type": item_type}))
+    schema_loader.configure(None)
+    schema_fingerprint.cache_clear()
+    return (tmp_path / "schema.json").as_uri()
+
+
+def test_result_cache_round_trips_errors(tmp_path: Path):
+    instance = tmp_path / "instance.json"
+    instance.write_text('[1, "a"]')
+    schema_uri = _write_schemas(tmp_path, "number")
+    errors = lint(schema_loader.load_schema(schema_uri), instance.read_text(), schema_key=schema_uri)
+
+    cache = ResultCache(tmp_path / "cache")
+    key = cache.key(instance, schema_uri, "json")
+    assert key and cache.get(key) is None
+    cache.set(key, errors)
+    assert ResultCache(tmp_path / "cache").get(key) == errors
+
+
+def test_result_cache_key_covers_content_schema_refs_and_mode(tmp_path: Path):
+    instance = tmp_path / "instance.json"
+    copy = tmp_path / "copy.json"
+    instance.write_text("[1]")
+    copy.write_text("[1]")
+    cache = ResultCache(tmp_path / "cache")
+    schema_uri = _write_schemas(tmp_path, "number")
+    key = cache.key(instance, schema_uri, "json")
+
+    assert cache.key(copy, schema_uri, "json") == key
+    assert cache.key(instance, schema_uri, None) != key
+    instance.write_text("[2]")
+    assert cache.key(instance, schema_uri, "json") != key
+    instance.write_text("[1]")
+    assert cache.key(instance, schema_uri, "json") == key
+    schema_uri = _write_schemas(tmp_path, "string")
+    assert cache.key(instance, schema_uri, "json") != key
+
+
+def test_result_cache_prunes_least_recently_used(tmp_path: Path):
+    cache = ResultCache(tmp_path / "cache")
+    cache.set("a" * 64, [])
+    cache.set("b" * 64, [])
+    results = sorted((tmp_path / "cache" / "results").glob("*/*.json"))
+    for path in results:
+        os.utime(path, (0, 0))
+
+    reloaded = ResultCache(tmp_path / "cache", max_size=results[0].stat().st_size)
+    assert reloaded.get("a" * 64) == []
+    reloaded.prune()
+    assert [path.name for path in (tmp_path / "cache" / "results").glob("*/*.json")] == [f"{'a' * 64}.json"]
+
+
+def test_result_cache_does_not_cache_unloadable_schemas(tmp_path: Path):
+    instance = tmp_path / "instance.json"
+    instance.write_text("[1]")
+    assert ResultCache(tmp_path / "cache").key(instance, (tmp_path / "missing.json").as_uri(), "json") is None
+
+
+def test_content_digest_trusts_unchanged_stat(tmp_path: Path):
+    path = tmp_path / "instance.json"
+    path.write_text("[1]")
+    os.utime(path, (0, 0))
+    digest = content_digest(path, tmp_path / "cache")
+    path.write_text("[2]")
+    os.utime(path, (0, 0))
+    assert content_digest(path, tmp_path / "cache") == digest
+
+    os.utime(path, (1, 1))
+    assert content_digest(path, tmp_path / "cache") != digest
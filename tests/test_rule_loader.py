@@ -0,0 +1,116 @@
+import json
+from pathlib import Path
+
+from jsonschema_lint._cli.rule_loader import Rule, RuleStack, SchemaStoreIndex
+
+
+def test_rule_stack_inherits_rules(tmp_path: Path):
+    (tmp_path / ".jsonschema-lint").write_text("*.json root.json\n*.yaml root.json\n")
+    nested = tmp_path / "a" / "b"
+    nested.mkdir(parents=True)
+    (tmp_path / "a" / ".jsonschema-lint").write_text("*.json a.json\n")
+
+    rule_stack = RuleStack()
+
+    assert rule_stack.rule_for(tmp_path / "file.json") == Rule(owner=tmp_path, glob="*.json", schema_uri="root.json")
+    assert rule_stack.rule_for(nested / "file.json") == Rule(owner=tmp_path / "a", glob="*.json", schema_uri="a.json")
+    assert rule_stack.rule_for(nested / "file.yaml") == Rule(owner=tmp_path, glob="*.yaml", schema_uri="root.json")
+    assert rule_stack.rule_for(nested / "file.txt") is None
+
+
+def test_rule_stack_reads_each_file_once(tmp_path: Path, monkeypatch):
+    (tmp_path / ".jsonschema-lint").write_text("*.json root.json\n")
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+
+    calls = []
+    from_file = Rule.from_file.__func__  # type: ignore[attr-defined]
+
+    def counting_from_file(cls, owner: Path):
+        calls.append(owner)
+        return from_file(cls, owner)
+
+    monkeypatch.setattr(Rule, "from_file", classmethod(counting_from_file))
+    rule_stack = RuleStack()
+    for name in ("a", "b", "a"):
+        for index in range(3):
+            assert rule_stack.rule_for(tmp_path / name / f"{index}.json")
+
+    assert calls == [tmp_path / ".jsonschema-lint"]
+
+
+def test_rule_stack_override(tmp_path: Path):
+    rule_stack = RuleStack(schema_override=tmp_path / "schema.json")
+    rule = rule_stack.rule_for(tmp_path / "file.json")
+    assert rule is rule_stack.rule_for(tmp_path / "other.yaml")
+    assert rule and rule.schema_uri == str(tmp_path / "schema.json")
+
+
+
+def test_rule_stack_may_match_in(tmp_path: Path):
+    data = tmp_path / "data"
+    (tmp_path / ".jsonschema-lint").write_text(f"{data}/config-*.json schema.json\n")
+    (tmp_path / "nested" / "deeper").mkdir(parents=True)
+    (tmp_path / "nested" / ".jsonschema-lint").write_text("*.json schema.json\n")
+
+    rule_stack = RuleStack()
+    assert not rule_stack.may_match_in(tmp_path)
+    assert rule_stack.may_match_in(data)
+    assert rule_stack.may_match_in(data / "sub")
+    assert not rule_stack.may_match_in(tmp_path / "other")
+    assert rule_stack.may_match_in(tmp_path / "nested" / "deeper")
+    assert RuleStack(schema_store=True).may_match_in(tmp_path / "other")
+
+
+CATALOG = {
+    "schemas": [
+        {"name": "package.json", "url": "https://example.com/package.json", "fileMatch": ["package.json"]},
+        {"name": "no globs", "url": "https://example.com/none.json"},
+        {"name": "circleci", "url": "https://example.com/circleci.json", "fileMatch": ["**/.circleci/config.yml"]},
+    ]
+}
+
+
+def test_schema_store_index_snapshots(tmp_path: Path, monkeypatch):
+    content = json.dumps(CATALOG).encode()
+    index = SchemaStoreIndex.load(content, tmp_path)
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+    def from_catalog(catalog):
+        raise AssertionError("Catalog should not be indexed again")
+
+    monkeypatch.setattr(SchemaStoreIndex, "from_catalog", from_catalog)
+    snapshot = SchemaStoreIndex.load(content, tmp_path)
+    assert snapshot is not index
+    assert snapshot.rules() == index.rules()
+    assert snapshot.rule_for(tmp_path / ".circleci" / "config.yml") == Rule(
+        owner=Path("/"), glob="**/.circleci/config.yml", schema_uri="https://example.com/circleci.json"
+    )
+    assert snapshot.rule_for(tmp_path / "config.yml") is None
+
+
+def test_schema_store_index_replaces_stale_snapshots(tmp_path: Path):
+    SchemaStoreIndex.load(json.dumps(CATALOG).encode(), tmp_path)
+    SchemaStoreIndex.load(json.dumps({"schemas": []}).encode(), tmp_path)
+    assert len(list(tmp_path.glob("*.json"))) == 1
+
+
+def test_schema_store_index_rebuilds_invalid_snapshots(tmp_path: Path):
+    content = json.dumps(CATALOG).encode()
+    SchemaStoreIndex.load(content, tmp_path)
+    (snapshot,) = tmp_path.glob("*.json")
+    for invalid in ('{"not": "entries"}', '[["glob"]]', "not json"):
+        snapshot.write_text(invalid)
+        assert [rule.glob for rule in SchemaStoreIndex.load(content, tmp_path).rules()] == [
+            "package.json",
+            "**/.circleci/config.yml",
+        ]
+
+
+def test_rule_stack_uses_pinned_catalog(tmp_path: Path):
+    catalog_path = tmp_path / "catalog.json"
+    catalog_path.write_text(json.dumps(CATALOG))
+    rule_stack = RuleStack(schema_store=True, schema_store_catalog=catalog_path)
+    rule = rule_stack.rule_for(tmp_path / "package.json")
+    assert rule and rule.schema_uri == "https://example.com/package.json"
+    assert rule is rule_stack.rule_for(tmp_path / "sub" / "package.json")
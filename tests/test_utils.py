@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pytest
 
-from jsonschema_lint.utils import path_match, path_pattern
+from jsonschema_lint.utils import PathMatcher, literal_directory, path_match, path_pattern
 
 
 @pytest.mark.parametrize(
@@ -53,3 +53,42 @@ Pattern: {pattern}
 Path: {path}
 Compiled Pattern: {compiled_pattern}
 """
+
+
+def test_path_matcher():
+    matcher = PathMatcher(["**/dir/*.json", "*.yaml", "file.json", "/dir/**", "*.json"])
+    assert matcher.match(Path("/dir/file.json")) == 0
+    assert matcher.match(Path("/home/file.json")) == 2
+    assert matcher.match(Path("/home/other.json")) == 4
+    assert matcher.match(Path("/dir/file.yaml")) == 1
+    assert matcher.match(Path("/dir/file.txt")) == 3
+    assert matcher.match(Path("/home/file.txt")) is None
+
+
+@pytest.mark.parametrize(
+    "glob",
+    ["file.json", "*.json", "**/*.json", "/**/*.json", "**/dir/*.json", "/dir/**/*.json", "dir/**", "*/file.json"],
+)
+@pytest.mark.parametrize(
+    "path",
+    ["file.json", "/file.json", "dir/file.json", "/dir/file.json", "/home/dir/subdir/file.json", "/dirfile.json"],
+)
+def test_path_matcher_is_consistent_with_path_match(glob: str, path: str):
+    expected = 0 if path_match(Path(path), glob) else None
+    assert PathMatcher([glob]).match(Path(path)) == expected
+
+
+@pytest.mark.parametrize(
+    "glob",
+    ["*.json", "/dir/file.json", "/dir/*.json", "/dir/**", "/dir/**/*.json", "/dir/sub*/file.json", "/**/file.json"],
+)
+@pytest.mark.parametrize(
+    "path",
+    ["/file.json", "/dir/file.json", "/dirfile.json", "/dir/sub/file.json", "/dir/subdir/x/file.json", "/dir"],
+)
+def test_literal_directory_contains_every_match(glob: str, path: str):
+    directory = literal_directory(glob)
+    if directory is None:
+        assert not glob.startswith("/")
+    elif path_match(Path(path), glob):
+        assert Path(path).parent == Path(directory) or Path(directory) in Path(path).parents
@@ -0,0 +1,53 @@
+import pytest
+from jsonschema.exceptions import SchemaError
+
+from jsonschema_lint.linter import lint
+from jsonschema_lint.validator_cache import CacheInfo, ValidatorCache, fingerprint
+
+SCHEMA = {"type": "array", "items": {"type": "number"}}
+
+
+def test_validator_cache_reuses_validators():
+    cache = ValidatorCache()
+    validator = cache.get(SCHEMA)
+    assert cache.get(dict(SCHEMA)) is validator
+    assert cache.cache_info() == CacheInfo(hits=1, misses=1, maxsize=None, currsize=1)
+
+
+def test_validator_cache_uses_key():
+    cache = ValidatorCache()
+    validator = cache.get(SCHEMA, key="file:///schema.json")
+    assert cache.get({}, key="file:///schema.json") is validator
+    assert cache.get(SCHEMA) is not validator
+    assert cache.cache_info() == CacheInfo(hits=1, misses=2, maxsize=None, currsize=2)
+
+
+def test_validator_cache_evicts_least_recently_used():
+    cache = ValidatorCache(maxsize=2)
+    first = cache.get(SCHEMA, key="first")
+    cache.get(SCHEMA, key="second")
+    cache.get(SCHEMA, key="first")
+    cache.get(SCHEMA, key="third")
+    assert cache.cache_info().currsize == 2
+    assert cache.get(SCHEMA, key="first") is first
+    cache.get(SCHEMA, key="second")
+    assert cache.cache_info() == CacheInfo(hits=2, misses=4, maxsize=2, currsize=2)
+
+
+def test_validator_cache_checks_schema():
+    cache = ValidatorCache()
+    with pytest.raises(SchemaError):
+        cache.get({"type": 1})
+    assert cache.cache_info().currsize == 0
+
+
+def test_fingerprint_ignores_key_order():
+    assert fingerprint({"a": 1, "b": 2}) == fingerprint({"b": 2, "a": 1})
+    assert fingerprint({"a": 1}) != fingerprint({"a": 2})
+
+
+def test_lint_uses_cache():
+    cache = ValidatorCache()
+    for document in ["[1]", '["spam"]', "- 1\n- 2\n"]:
+        lint(SCHEMA, document, cache=cache)
+    assert cache.cache_info() == CacheInfo(hits=2, misses=1, maxsize=None, currsize=1)
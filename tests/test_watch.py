@@ -0,0 +1,110 @@
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from jsonschema_lint._cli.rule_loader import Rule, RuleStack
+from jsonschema_lint._cli.watch import WatchSession
+
+
+def _touch(path: Path, content: str) -> None:
+    """Write a file, making sure its modification time changes."""
+    mtime = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(content)
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+@pytest.fixture()
+def session(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".jsonschema-lint").write_text("instances/*.json schema.json\n")
+    (tmp_path / "schema.json").write_text(json.dumps({"$ref": "defs.json"}))
+    (tmp_path / "defs.json").write_text(json.dumps({"type": "number"}))
+    for directory in [tmp_path / "instances", tmp_path / "nested" / "instances"]:
+        directory.mkdir(parents=True)
+        (directory / "a.json").write_text("1")
+        (directory / "b.json").write_text("2")
+
+    linted = []
+
+    def lint_func(rule: Rule, path: Path):
+        linted.append(path.relative_to(tmp_path).as_posix())
+        return []
+
+    session = WatchSession((), RuleStack(), lint_func)
+    session.start()
+    assert len(linted) == 4
+    return session
+
+
+def _relint(session: WatchSession):
+    return sorted(path.relative_to(Path.cwd()).as_posix() for path in session.update())
+
+
+def test_watch_relints_edited_instance(session):
+    _touch(Path("instances/a.json"), "3")
+    assert _relint(session) == ["instances/a.json"]
+    assert _relint(session) == []
+
+
+def test_watch_lints_new_instances(session):
+    Path("instances/c.json").write_text("3")
+    os.utime("instances", ns=(0, 0))
+    assert _relint(session) == ["instances/c.json"]
+
+
+def test_watch_relints_subtree_of_rule_file(session):
+    _touch(Path("nested/.jsonschema-lint"), "instances/a.json ../defs.json\n")
+    assert _relint(session) == ["nested/instances/a.json", "nested/instances/b.json"]
+    assert session.rules[Path("nested/instances/a.json").absolute()].schema_uri == "../defs.json"
+
+
+def test_watch_relints_instances_of_referenced_schema(session):
+    _touch(Path("nested/.jsonschema-lint"), "instances/a.json ../defs.json\n")
+    session.update()
+    _touch(Path("defs.json"), json.dumps({"type": "string"}))
+    assert _relint(session) == [
+        "instances/a.json",
+        "instances/b.json",
+        "nested/instances/a.json",
+        "nested/instances/b.json",
+    ]
+    _touch(Path("schema.json"), json.dumps({"type": "string"}))
+    assert _relint(session) == ["instances/a.json", "instances/b.json", "nested/instances/b.json"]
+
+
+def test_watch_follows_gitignore(session):
+    _touch(Path(".gitignore"), "nested/\n")
+    assert _relint(session) == []
+    assert sorted(path.relative_to(Path.cwd()).as_posix() for path in session.instances) == [
+        "defs.json",
+        "instances/a.json",
+        "instances/b.json",
+        "schema.json",
+    ]
+    _touch(Path(".gitignore"), "")
+    assert _relint(session) == ["nested/instances/a.json", "nested/instances/b.json"]
+
+
+def test_watch_reports_invalid_schemas_and_keeps_watching(tmp_path: Path, monkeypatch):
+    from jsonschema_lint._cli.main import lint_file_output
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".jsonschema-lint").write_text("*.json schema.json\n")
+    (tmp_path / "schema.json").write_text('{"type": "number"}')
+    (tmp_path / "instance.json").write_text('"a"')
+    session = WatchSession((Path("instance.json"),), RuleStack(), lint_file_output)
+    session.start()
+    (output,) = session.outputs[Path("instance.json").absolute()]
+    assert output.startswith("instance.json:1:1:1:4: ") and "'a' is not of type 'number'" in output
+
+    for invalid in ('{"type": "strin', '{"type": 5}'):
+        _touch(tmp_path / "schema.json", invalid)
+        session.update()
+        (output,) = session.outputs[Path("instance.json").absolute()]
+        assert output.startswith(f"instance.json:1:1:1:1: Could not lint with {(tmp_path / 'schema.json').as_uri()}: ")
+
+    _touch(tmp_path / "schema.json", '{"type": "string"}')
+    session.update()
+    assert session.outputs[Path("instance.json").absolute()] == []
@@ -1,9 +1,13 @@
 from fnmatch import fnmatch
 
 import pytest
+import yaml
 
+from jsonschema_lint.yaml_ast import utils
 from jsonschema_lint.yaml_ast.errors import YAMLASTError
-from jsonschema_lint.yaml_ast.parser import parse, parse_all
+from jsonschema_lint.json_ast import nodes
+from jsonschema_lint.json_ast.location import Position
+from jsonschema_lint.yaml_ast.parser import parse, parse_all, parse_all_with_instance
 
 
 def test_parse_simple():
@@ -57,3 +61,117 @@ qux: mux
     trees = parse_all(document)
     result = [tree.resolve() for tree in trees]
     assert result == [{"foo": "bar"}, {"qux": "mux"}]
+
+
+LOADER_DOCUMENTS = [
+    "foo: bar",
+    "a: 😀\nb: [1, 2, {c: d}]",
+    "key: |\n  block\n  text\n\nnext: >-\n  folded\n",
+    "a:\n  - b\n  -\n  - c: d\n    e: f",
+    "\u2028a: b\x85c: d\r\ne: 'f'",
+    "---\na: 1\n---\nb: 2\n...\n",
+    "a: !!str 1\nb: 0x1F\nc: ~",
+    "{,:}",
+    "a: b: c",
+    "a:\n\t- b",
+    "- [",
+]
+
+
+@pytest.mark.skipif(utils.CSafeLoader is None, reason="PyYAML is built without libyaml")
+@pytest.mark.parametrize("document", LOADER_DOCUMENTS)
+def test_libyaml_matches_pure_python(document: str, monkeypatch):
+    def spans(node):
+        children = getattr(node, "children", None) or [
+            child for child in (getattr(node, "identifier", None), getattr(node, "value", None)) if child is not None
+        ]
+        return [type(node).__name__, node.start, node.end, [spans(child) for child in children if hasattr(child, "start")]]
+
+    def parse_to_result():
+        try:
+            return [(tree.resolve(), spans(tree)) for tree in parse_all(document)]
+        except YAMLASTError as exc:
+            return exc.message, exc.location
+
+    expected = parse_to_result()
+    monkeypatch.setattr(utils, "CSafeLoader", None)
+    assert parse_to_result() == expected
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        "foo: [1, 'a', 0x1F, 1e3, ~, yes]",
+        "a: !!str 1\nb: !!float 2",
+        "- &a {k: v}\n- *a",
+        "---\na: 1\n---\n- b\n",
+    ],
+)
+def test_parse_all_with_instance_matches_safe_load(document: str):
+    results = parse_all_with_instance(document)
+    assert [instance for _, instance in results] == list(yaml.safe_load_all(document))
+    assert [ast.resolve() for ast, _ in results] == list(yaml.safe_load_all(document))
+
+
+def test_parse_all_with_instance_merges_keys():
+    [(ast, instance)] = parse_all_with_instance("base: &base {x: 1}\nderived:\n  <<: *base\n  y: 2")
+    assert instance == {"base": {"x": 1}, "derived": {"x": 1, "y": 2}}
+    assert ast.resolve() == instance
+    assert ast.get("derived", "x") is ast.get("base", "x")
+
+
+@pytest.mark.parametrize(
+    "document",
+    [
+        "a: &a {x: 1, y: 1}\nb: &b {x: 2, z: 2}\nc: {<<: [*a, *b], y: 3}",
+        "a: &a {x: 1}\nb: &b {<<: *a, y: 2}\nc: {<<: *b, z: 3, x: 4}",
+    ],
+)
+def test_parse_all_with_instance_merges_keys_as_safe_load(document: str):
+    [(ast, instance)] = parse_all_with_instance(document)
+    assert ast.resolve() == instance == yaml.safe_load(document)
+
+
+def test_parse_locates_properties_with_aliased_values():
+    tree = parse("base: &base {x: 1}\ncopy: *base")
+    assert isinstance(tree, nodes.Object)
+    copy = tree.children[1]
+    assert (copy.start, copy.end) == (19, 23)
+
+
+def test_parse_all_with_instance_reports_unknown_tags():
+    with pytest.raises(YAMLASTError) as exc_info:
+        parse_all_with_instance("a: !custom x")
+    assert str(exc_info.value).startswith("Could not determine a constructor for the tag '!custom'")
+    assert exc_info.value.location.start == Position(line=1, column=4, index=3)
+
+
+def _laughs(levels: int) -> str:
+    lines = ['a0: &a0 "lol"']
+    for level in range(1, levels + 1):
+        aliases = ", ".join([f"*a{level - 1}"] * 9)
+        lines.append(f"a{level}: &a{level} [{aliases}]")
+    return "\n".join(lines)
+
+
+def test_parse_shares_aliased_nodes():
+    tree = parse("base: &base {x: [1, 2]}\ncopy: *base")
+    assert tree.child("copy") is tree.child("base")
+    assert tree.resolve() == {"base": {"x": [1, 2]}, "copy": {"x": [1, 2]}}
+
+
+def test_parse_limits_alias_expansion():
+    document = _laughs(9)
+    with pytest.raises(YAMLASTError) as exc_info:
+        parse_all_with_instance(document)
+    assert str(exc_info.value) == "Aliases expand the document by more than 1000000 nodes"
+    assert parse(_laughs(3), max_alias_nodes=1000).child("a3").child(0).child(0).child(0).value == "lol"
+    with pytest.raises(YAMLASTError):
+        parse(_laughs(3), max_alias_nodes=100)
+
+
+def test_parse_rejects_recursive_aliases():
+    with pytest.raises(YAMLASTError) as exc_info:
+        parse("a: &a [1, *a]")
+    assert str(exc_info.value) == "Recursive aliases are not supported"
+    assert exc_info.value.location.start == Position(line=1, column=4, index=3)